@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiler import check_admin_token, profiler_registry
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def require_admin(x_admin_token: str = Header(default="")) -> None:
+    # Disabled (403) unless CATCHDASH_ADMIN_TOKEN is set.
+    if not check_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="admin token required")
+
+
+@router.post("/profiling", dependencies=[Depends(require_admin)])
+def arm_profiling(
+    count: int = 5, path_prefix: str = "/api/", min_ms: float = 500.0, ttl_seconds: float = 600.0
+) -> dict:
+    # Profile the next matching requests, keeping only those at least `min_ms` long.
+    return {"armed": profiler_registry.arm(count, path_prefix, min_ms, ttl_seconds)}
+
+
+@router.delete("/profiling", dependencies=[Depends(require_admin)])
+def disarm_profiling() -> dict:
+    profiler_registry.disarm()
+    return {"armed": None}
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+def list_profiles() -> dict:
+    return {
+        "armed": profiler_registry.armed(),
+        "profiles": [row.summary() for row in profiler_registry.profiles()],
+    }
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str) -> PlainTextResponse:
+    # Folded stacks: feed to flamegraph.pl or drop into speedscope.app.
+    row = profiler_registry.get(profile_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="profile not found")
+    return PlainTextResponse(row.folded())
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from fastapi import APIRouter
+
+from app.api.jobs import list_job_rows
+from app.api.topics import fetch_topic_entries, topic_summaries
+from app.core.settings import settings
+from app.services.live_social import live_social_service
+from app.topics.registry import topic_registry
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+
+@router.get("")
+async def get_dashboard(ids: str | None = None) -> dict:
+    wanted = {row.strip() for row in (ids or "").split(",") if row.strip()}
+    topics = [row for row in topic_registry.list_topics() if not wanted or row.topic_id in wanted]
+
+    # Topics and live sources share one latency budget; whatever is late is served from cache.
+    budget = settings.dashboard_budget_seconds
+    live_task = asyncio.ensure_future(asyncio.to_thread(live_social_service.fetch_all))
+    entries, (done, _) = await asyncio.gather(
+        fetch_topic_entries(topics, budget),
+        asyncio.wait({live_task}, timeout=budget),
+    )
+    if live_task in done and live_task.exception() is None:
+        live = {**live_task.result(), "status": "fresh"}
+    else:
+        live = {**live_social_service.fetch_all(cached_only=True), "status": "stale"}
+
+    return {
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "topics": topic_summaries(),
+        "items": entries,
+        "live": live,
+        "jobs": [row.model_dump(mode="json") for row in list_job_rows()],
+    }
@@ -1,23 +1,79 @@
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Callable
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Literal
 from uuid import uuid4
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Request, Response, UploadFile
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from app.api.topics import service as topic_service
+from app.core.response_cache import response_cache
 from app.core.settings import settings
+from app.core.state import state_store
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 
+JobPriority = Literal["interactive", "background"]
+# Lower rank is claimed first.
+_PRIORITY_RANK = {"interactive": 0, "background": 1}
+_TERMINAL_STATUSES = {"ready", "failed", "cancelled"}
+# Output format names negotiated with the worker, and the MIME type each is stored and served as.
+_AUDIO_FORMAT_TYPES = {
+    "mp3": "audio/mpeg",
+    "opus": "audio/ogg",
+    "webm": "audio/webm",
+    "aac": "audio/aac",
+    "flac": "audio/flac",
+    "wav": "audio/wav",
+}
+_AUDIO_EXTENSIONS = {
+    "mp3": "audio/mpeg",
+    "ogg": "audio/ogg",
+    "webm": "audio/webm",
+    "aac": "audio/aac",
+    "flac": "audio/flac",
+    "wav": "audio/wav",
+}
+# Uploaded content types (including common aliases) -> stored file extension.
+_AUDIO_UPLOAD_TYPES = {
+    **{mime: ext for ext, mime in _AUDIO_EXTENSIONS.items()},
+    "audio/mp3": "mp3",
+    "audio/opus": "ogg",
+    "audio/x-wav": "wav",
+}
+
+
 class CreateJobRequest(BaseModel):
-    type: Literal["tts_full_page", "tts_summary"]
+    type: Literal["tts_full_page", "tts_summary", "tts_digest"]
     topic_id: str
+    item_id: str = ""
+    # tts_digest only: the items to cover, in order; empty means the topic's newest items.
+    item_ids: list[str] = Field(default_factory=list)
+    priority: JobPriority = "interactive"
+    # Formats the client can play (_AUDIO_FORMAT_TYPES keys), most preferred first; empty accepts any.
+    audio_formats: list[str] = Field(default_factory=list)
+
+
+# One step of a worker run (load_item, extract, summarize, synthesize, encode, upload) with
+# its wall time and whatever the worker measured: bytes, tokens, ttft_ms, real_time_factor...
+class JobStage(BaseModel):
+    name: str
+    started_at: datetime
+    duration_ms: float
+    metrics: dict[str, float | int | str | None] = Field(default_factory=dict)
+
+
+# Where an item's segment starts in a digest episode.
+class JobChapter(BaseModel):
     item_id: str
+    title: str
+    start_seconds: float
 
 
 class JobStatus(BaseModel):
@@ -25,10 +81,22 @@ class JobStatus(BaseModel):
     type: str
     topic_id: str
     item_id: str
+    item_ids: list[str] = Field(default_factory=list)
     status: str
     progress: int
     message: str | None = None
     output_ref: str | None = None
+    chapters: list[JobChapter] = Field(default_factory=list)
+    audio_bytes: int = 0
+    audio_mime: str | None = None
+    audio_seconds: float | None = None
+    audio_formats: list[str] = Field(default_factory=list)
+    priority: JobPriority = "interactive"
+    # Enqueued speculatively by the prefetch planner rather than by a tap.
+    prefetched: bool = False
+    claimed_by: str | None = None
+    claim_id: str | None = None
+    trace: list[JobStage] = Field(default_factory=list)
     created_at: datetime
     updated_at: datetime
 
@@ -38,39 +106,260 @@ class UpdateJobRequest(BaseModel):
     progress: int | None = None
     message: str | None = None
     output_ref: str | None = None
+    # Workers send the claim they were given; a stale claim (cancelled or preempted job) gets a 409.
+    claim_id: str | None = None
+    # Full stage timeline of the current run so far; replaces the stored one.
+    trace: list[JobStage] | None = None
+    chapters: list[JobChapter] | None = None
+
+
+class ClaimJobRequest(BaseModel):
+    worker_id: str
+
 
+# Jobs live in the shared state store so every API process sees the same queue; each
+# mutation is published on the "jobs" channel, whose sequence doubles as the list version.
+_JOBS_NAMESPACE = "jobs"
 
-# Placeholder in-memory store so queue backend can be swapped later.
-JOBS: dict[str, JobStatus] = {}
+
+def get_job_row(job_id: str) -> JobStatus | None:
+    return state_store.get(_JOBS_NAMESPACE, job_id, decode=JobStatus.model_validate)
+
+
+def list_job_rows() -> list[JobStatus]:
+    return state_store.values(_JOBS_NAMESPACE, decode=JobStatus.model_validate)
+
+
+def _save_job(row: JobStatus) -> None:
+    state_store.set(_JOBS_NAMESPACE, row.id, row)
+    state_store.publish(_JOBS_NAMESPACE, {"job_id": row.id, "status": row.status})
+
+
+def _update_job(job_id: str, apply: Callable[[JobStatus], None]) -> JobStatus:
+    def mutate(row: JobStatus | None) -> JobStatus | None:
+        if row is None:
+            return None
+        apply(row)
+        row.updated_at = datetime.now(timezone.utc)
+        return row
+
+    row = state_store.update(_JOBS_NAMESPACE, job_id, mutate, decode=JobStatus.model_validate)
+    if not row:
+        raise HTTPException(status_code=404, detail="job not found")
+    state_store.publish(_JOBS_NAMESPACE, {"job_id": row.id, "status": row.status})
+    return row
 
 
 @router.post("")
 def create_job(payload: CreateJobRequest) -> dict:
-    job_id = str(uuid4())
+    if payload.type == "tts_digest":
+        payload.item_ids = payload.item_ids or _newest_item_ids(payload.topic_id)
+        if not payload.item_ids:
+            raise HTTPException(status_code=409, detail="topic has no items yet")
+        payload.item_ids = list(dict.fromkeys(payload.item_ids))[: settings.digest_max_items]
+        payload.item_id = _digest_id(payload.item_ids)
+    elif not payload.item_id:
+        raise HTTPException(status_code=422, detail="item_id is required")
+    existing = find_job(payload.type, payload.topic_id, payload.item_id, payload.audio_formats)
+    if existing and existing.status == "ready":
+        # Already generated (usually by the prefetch planner): the tap gets the audio right away.
+        return existing.model_dump(mode="json")
+    if payload.priority == "interactive":
+        _demote_interactive(keep=existing.id if existing else None)
+    if existing:
+        # Same item still in flight in the background: promote it instead of starting over.
+        def promote(job: JobStatus) -> None:
+            if payload.priority == "interactive":
+                job.priority = "interactive"
+            if payload.audio_formats and job.status == "queued":
+                job.audio_formats = payload.audio_formats
+
+        return _update_job(existing.id, promote).model_dump(mode="json")
+    row = enqueue_job(
+        payload.type,
+        payload.topic_id,
+        payload.item_id,
+        payload.priority,
+        audio_formats=payload.audio_formats,
+        item_ids=payload.item_ids if payload.type == "tts_digest" else None,
+    )
+    return row.model_dump(mode="json")
+
+
+def enqueue_job(
+    job_type: str,
+    topic_id: str,
+    item_id: str,
+    priority: JobPriority,
+    prefetched: bool = False,
+    audio_formats: list[str] | None = None,
+    item_ids: list[str] | None = None,
+) -> JobStatus:
     row = JobStatus(
-        id=job_id,
-        type=payload.type,
-        topic_id=payload.topic_id,
-        item_id=payload.item_id,
+        id=str(uuid4()),
+        type=job_type,
+        topic_id=topic_id,
+        item_id=item_id,
+        item_ids=item_ids or [],
         status="queued",
         progress=0,
         message="queued",
         output_ref=None,
+        priority=priority,
+        prefetched=prefetched,
+        audio_formats=audio_formats or [],
         created_at=datetime.now(timezone.utc),
         updated_at=datetime.now(timezone.utc),
     )
-    JOBS[job_id] = row
-    return row.model_dump(mode="json")
+    _save_job(row)
+    return row
+
+
+def find_job(
+    job_type: str, topic_id: str, item_id: str, audio_formats: list[str] | None = None
+) -> JobStatus | None:
+    # Newest usable job for the item: ready with playable audio still on disk, or still pending.
+    playable = {_AUDIO_FORMAT_TYPES[name] for name in audio_formats or [] if name in _AUDIO_FORMAT_TYPES}
+
+    def usable(row: JobStatus) -> bool:
+        if row.status not in _TERMINAL_STATUSES:
+            return True
+        return row.status == "ready" and _audio_exists(row) and (not playable or _audio_mime(row) in playable)
+
+    matches = [
+        row
+        for row in list_job_rows()
+        if row.type == job_type and row.topic_id == topic_id and row.item_id == item_id and usable(row)
+    ]
+    # Finished audio wins over a duplicate still in flight.
+    return max(matches, key=lambda row: (row.status == "ready", row.created_at), default=None)
+
+
+def _newest_item_ids(topic_id: str) -> list[str]:
+    snapshot = topic_service.peek(topic_id)
+    if snapshot is None:
+        return []
+    return [item.item_id for item in snapshot.items[: settings.digest_max_items]]
+
+
+def _digest_id(item_ids: list[str]) -> str:
+    # Stable per item set, so asking for the same digest again finds the existing job.
+    return "digest-" + hashlib.sha256("|".join(item_ids).encode("utf-8")).hexdigest()[:16]
+
+
+def _demote_interactive(keep: str | None = None) -> None:
+    # A new tap is what the user is waiting for now, so earlier taps still queued drop to background.
+    # Ones already processing keep their priority: demoting them would let the heartbeat preempt
+    # them and throw their progress away.
+    def demote(job: JobStatus) -> None:
+        if job.status == "queued":
+            job.priority = "background"
+
+    for other in list_job_rows():
+        if other.id != keep and other.priority == "interactive" and other.status == "queued":
+            _update_job(other.id, demote)
+
+
+def _audio_exists(row: JobStatus) -> bool:
+    return bool(row.output_ref) and (Path(settings.audio_dir) / Path(row.output_ref).name).exists()
+
+
+def _audio_mime(row: JobStatus) -> str:
+    return row.audio_mime or "audio/mpeg"
+
+
+@router.post("/claim")
+def claim_job(payload: ClaimJobRequest) -> Response:
+    # Highest priority first, then oldest. The claim is an atomic compare-and-set on "queued",
+    # so concurrent workers (or API processes) never start the same job twice.
+    queued = sorted(
+        (row for row in list_job_rows() if row.status == "queued"),
+        key=lambda row: (_PRIORITY_RANK.get(row.priority, 1), row.created_at),
+    )
+    for candidate in queued:
+        claim_id = str(uuid4())
+
+        def claim(row: JobStatus) -> None:
+            if row.status != "queued":
+                raise _AlreadyClaimed()
+            row.status = "processing"
+            row.message = "claimed"
+            row.claimed_by = payload.worker_id
+            row.claim_id = claim_id
+
+        try:
+            row = _update_job(candidate.id, claim)
+        except (_AlreadyClaimed, HTTPException):
+            continue
+        return Response(content=row.model_dump_json(), media_type="application/json")
+    return Response(status_code=204)
 
 
 @router.get("")
-def list_jobs() -> dict:
-    return {"jobs": [row.model_dump(mode="json") for row in JOBS.values()]}
+def list_jobs(request: Request) -> Response:
+    version = state_store.sequence(_JOBS_NAMESPACE)
+    prepared = response_cache.get("jobs", version, lambda: {"jobs": list_job_rows()})
+    return prepared.response(request)
+
+
+@router.get("/events")
+def list_job_events(after: int = 0, limit: int = 100) -> dict:
+    # Cheap change feed for pollers: ids of jobs touched since sequence `after`.
+    rows = state_store.messages(_JOBS_NAMESPACE, after=after, limit=max(1, min(limit, 500)))
+    return {
+        "sequence": rows[-1][0] if rows else max(after, 0),
+        "events": [{"sequence": seq, **(message or {})} for seq, message in rows],
+    }
+
+
+@router.get("/stats")
+def get_job_stats(type: str | None = None, since_hours: float = 24.0) -> dict:
+    # Percentiles per job type and stage over finished jobs, from the traces workers attach.
+    cutoff = datetime.now(timezone.utc).timestamp() - since_hours * 3600
+    rows = [
+        row
+        for row in list_job_rows()
+        if row.status == "ready"
+        and row.trace
+        and row.created_at.timestamp() >= cutoff
+        and (type is None or row.type == type)
+    ]
+    by_type: dict[str, list[JobStatus]] = {}
+    for row in rows:
+        by_type.setdefault(row.type, []).append(row)
+
+    out: dict[str, dict] = {}
+    for job_type, jobs in sorted(by_type.items()):
+        durations: dict[str, list[float]] = {}
+        metrics: dict[str, dict[str, list[float]]] = {}
+        for job in jobs:
+            for stage in job.trace:
+                durations.setdefault(stage.name, []).append(stage.duration_ms)
+                for key, value in stage.metrics.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        metrics.setdefault(stage.name, {}).setdefault(key, []).append(float(value))
+        out[job_type] = {
+            "jobs": len(jobs),
+            "queue_wait_ms": _percentiles(
+                # Clamped: worker and backend clocks can disagree by a little.
+                [max(0.0, (job.trace[0].started_at - job.created_at).total_seconds() * 1000) for job in jobs]
+            ),
+            "total_ms": _percentiles([(job.updated_at - job.created_at).total_seconds() * 1000 for job in jobs]),
+            "stages": {
+                name: {
+                    "count": len(values),
+                    "duration_ms": _percentiles(values),
+                    "metrics": {key: _percentiles(series) for key, series in sorted(metrics.get(name, {}).items())},
+                }
+                for name, values in durations.items()
+            },
+        }
+    return {"since_hours": since_hours, "jobs": len(rows), "types": out}
 
 
 @router.get("/{job_id}")
 def get_job(job_id: str) -> dict:
-    row = JOBS.get(job_id)
+    row = get_job_row(job_id)
     if not row:
         raise HTTPException(status_code=404, detail="job not found")
     return row.model_dump(mode="json")
@@ -78,36 +367,130 @@ def get_job(job_id: str) -> dict:
 
 @router.put("/{job_id}")
 def update_job(job_id: str, payload: UpdateJobRequest) -> dict:
-    row = JOBS.get(job_id)
+    def apply(row: JobStatus) -> None:
+        if row.status == "cancelled" or (payload.claim_id and payload.claim_id != row.claim_id):
+            raise HTTPException(status_code=409, detail=f"job is {row.status}")
+        if payload.status is not None:
+            row.status = payload.status
+        if payload.progress is not None:
+            row.progress = max(0, min(100, payload.progress))
+        if payload.message is not None:
+            row.message = payload.message
+        if payload.output_ref is not None:
+            row.output_ref = payload.output_ref
+        if payload.trace is not None:
+            row.trace = payload.trace
+        if payload.chapters is not None:
+            row.chapters = payload.chapters
+
+    return _update_job(job_id, apply).model_dump(mode="json")
+
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str) -> dict:
+    row = get_job_row(job_id)
     if not row:
         raise HTTPException(status_code=404, detail="job not found")
-    if payload.status is not None:
-        row.status = payload.status
-    if payload.progress is not None:
-        row.progress = max(0, min(100, payload.progress))
-    if payload.message is not None:
-        row.message = payload.message
-    if payload.output_ref is not None:
-        row.output_ref = payload.output_ref
-    row.updated_at = datetime.now(timezone.utc)
-    JOBS[job_id] = row
-    return row.model_dump(mode="json")
+    if row.status in _TERMINAL_STATUSES:
+        return row.model_dump(mode="json")
+
+    def apply(row: JobStatus) -> None:
+        if row.status in _TERMINAL_STATUSES:
+            return
+        # The worker notices at its next checkpoint (heartbeat or progress update) and aborts.
+        row.status = "cancelled"
+        row.message = "cancelled"
+        row.claim_id = None
+
+    return _update_job(job_id, apply).model_dump(mode="json")
+
+
+@router.post("/{job_id}/heartbeat")
+def heartbeat_job(job_id: str, claim_id: str) -> dict:
+    row = get_job_row(job_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="job not found")
+    if row.status == "cancelled" or row.claim_id != claim_id:
+        return {"action": "cancel"}
+    if row.priority == "background" and _interactive_waiting():
+        # Nobody picked up an interactive job within the grace period: hand this worker over to it.
+        def requeue(job: JobStatus) -> None:
+            if job.claim_id != claim_id:
+                raise HTTPException(status_code=409, detail="claim changed")
+            job.status = "queued"
+            job.progress = 0
+            job.message = "preempted"
+            job.claimed_by = None
+            job.claim_id = None
+            job.trace = []
+            job.chapters = []
+
+        try:
+            _update_job(job_id, requeue)
+        except HTTPException:
+            pass
+        return {"action": "preempt"}
+    return {"action": "continue"}
 
 
 @router.post("/{job_id}/audio")
-async def upload_job_audio(job_id: str, file: UploadFile = File(...)) -> dict:
-    row = JOBS.get(job_id)
+async def upload_job_audio(
+    job_id: str,
+    file: UploadFile = File(...),
+    claim_id: str = Form(...),
+    duration_seconds: float | None = Form(None),
+) -> dict:
+    row = get_job_row(job_id)
     if not row:
         raise HTTPException(status_code=404, detail="job not found")
+    # A worker that lost its claim (cancelled, or preempted and re-claimed) must not overwrite the audio.
+    if row.status == "cancelled" or row.claim_id != claim_id:
+        raise HTTPException(status_code=409, detail=f"job is {row.status}")
+    mime = (file.content_type or "audio/mpeg").split(";")[0].strip().lower()
+    extension = _AUDIO_UPLOAD_TYPES.get(mime)
+    if extension is None:
+        raise HTTPException(status_code=415, detail=f"unsupported audio type: {mime}")
     payload = await file.read()
     audio_dir = Path(settings.audio_dir)
     audio_dir.mkdir(parents=True, exist_ok=True)
-    target = audio_dir / f"{job_id}.mp3"
+    target = audio_dir / f"{job_id}.{extension}"
     target.write_bytes(payload)
-    row.output_ref = f"/api/jobs/audio/{target.name}"
-    row.updated_at = datetime.now(timezone.utc)
-    JOBS[job_id] = row
-    return {"job_id": job_id, "output_ref": row.output_ref}
+    output_ref = f"/api/jobs/audio/{target.name}"
+
+    def apply(row: JobStatus) -> None:
+        if row.status == "cancelled" or row.claim_id != claim_id:
+            raise HTTPException(status_code=409, detail=f"job is {row.status}")
+        row.output_ref = output_ref
+        row.audio_bytes = len(payload)
+        row.audio_mime = _AUDIO_EXTENSIONS[extension]
+        row.audio_seconds = duration_seconds
+
+    _update_job(job_id, apply)
+    return {"job_id": job_id, "output_ref": output_ref}
+
+
+def _interactive_waiting() -> bool:
+    cutoff = datetime.now(timezone.utc).timestamp() - settings.job_preempt_after_seconds
+    return any(
+        row.status == "queued" and row.priority == "interactive" and row.created_at.timestamp() <= cutoff
+        for row in list_job_rows()
+    )
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        # Nearest-rank percentile: fine for the small samples a single deployment produces.
+        return round(ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))], 2)
+
+    return {"p50": rank(0.5), "p90": rank(0.9), "p99": rank(0.99), "max": round(ordered[-1], 2)}
+
+
+class _AlreadyClaimed(Exception):
+    pass
 
 
 @router.get("/audio/{filename}")
@@ -115,4 +498,5 @@ def get_audio(filename: str):
     target = Path(settings.audio_dir) / filename
     if not target.exists():
         raise HTTPException(status_code=404, detail="audio not found")
-    return FileResponse(target, media_type="audio/mpeg")
+    media_type = _AUDIO_EXTENSIONS.get(target.suffix.lstrip(".").lower(), "application/octet-stream")
+    return FileResponse(target, media_type=media_type)
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from typing import Any
 
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.core.response_cache import response_cache
 from app.services.live_social import live_social_service
 
 router = APIRouter(prefix="/api/live", tags=["live"])
 
 
 @router.get("/social")
-def get_live_social() -> dict:
-    return live_social_service.fetch_all(force=False)
+def get_live_social(request: Request) -> Response:
+    payload = live_social_service.fetch_all(force=False)
+    prepared = response_cache.get("live:social", _snapshot_version(payload), lambda: payload)
+    return prepared.response(request)
+
+
+@router.get("/social/page")
+def get_live_social_page(cursor: str, limit: int | None = None) -> dict:
+    try:
+        return live_social_service.page(cursor, max(1, min(limit, 100)) if limit else None)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.post("/social/refresh")
@@ -22,3 +35,10 @@ def refresh_live_source(source: str) -> dict:
     if source not in live_social_service.supported_sources():
         raise HTTPException(status_code=400, detail="unsupported source")
     return live_social_service.fetch_source(source, force=True)
+
+
+def _snapshot_version(payload: dict[str, Any]) -> tuple:
+    # Source payloads only change when a source is re-fetched, so their timestamps identify the snapshot.
+    return tuple(
+        (row.get("source_id"), row.get("updated_at"), row.get("error")) for row in payload.get("sources", [])
+    )
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import httpx
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.services.media_proxy import MediaProxyError, media_proxy, sniff_image_type
+from app.services.rate_limit import RateLimited
+
+router = APIRouter(prefix="/api/media", tags=["media"])
+
+
+@router.get("")
+async def get_media(u: str, w: int = 640, s: str = "") -> FileResponse:
+    if not media_proxy.verify(u, w, s):
+        raise HTTPException(status_code=403, detail="invalid media signature")
+    try:
+        path = await media_proxy.get(u, w)
+    except (MediaProxyError, RateLimited, httpx.HTTPError) as exc:
+        raise HTTPException(status_code=502, detail=str(exc) or "media fetch failed") from exc
+    with path.open("rb") as fh:
+        media_type = sniff_image_type(fh.read(16))
+    # URLs are content-addressed by (source url, width), so clients can cache them forever.
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": "public, max-age=31536000, immutable"})
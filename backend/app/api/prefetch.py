@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from fastapi import APIRouter
+
+from app.api.jobs import JobStatus, enqueue_job, list_job_rows
+from app.api.topics import service as topic_service
+from app.core.settings import settings
+from app.core.state import state_store
+from app.topics.registry import topic_registry
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/prefetch", tags=["prefetch"])
+
+_JOB_TYPES = {"summary": "tts_summary", "full_page": "tts_full_page"}
+_ACTIVE_STATUSES = {"queued", "processing"}
+
+
+# Speculatively renders audio for the newest items of topics with `prefetch_items` set,
+# one background job at a time and only while the queue is empty, so a later tap on the
+# same item is answered from the finished job. Spend is capped per UTC day by job count
+# (compute) and stored audio bytes (disk).
+class PrefetchPlanner:
+    def __init__(self, interval_seconds: float, daily_jobs: int, daily_audio_mb: float) -> None:
+        self.interval_seconds = max(1.0, interval_seconds)
+        self.daily_jobs = daily_jobs
+        self.daily_audio_bytes = int(daily_audio_mb * 1024 * 1024)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                if self._take_tick():
+                    await asyncio.to_thread(self.plan_once)
+            except Exception:
+                logger.exception("prefetch planner tick failed")
+
+    def plan_once(self) -> JobStatus | None:
+        rows = list_job_rows()
+        if any(row.status in _ACTIVE_STATUSES for row in rows):
+            return None
+        usage = self.usage(rows)
+        if usage["jobs"] >= self.daily_jobs or usage["audio_bytes"] >= self.daily_audio_bytes:
+            return None
+
+        known = {(row.type, row.topic_id, row.item_id) for row in rows}
+        for job_type, topic_id, item_id in self._candidates():
+            if (job_type, topic_id, item_id) in known:
+                continue
+            row = enqueue_job(job_type, topic_id, item_id, "background", prefetched=True)
+            logger.info("prefetch queued job=%s topic=%s item=%s", row.id, topic_id, item_id)
+            return row
+        return None
+
+    def usage(self, rows: list[JobStatus] | None = None) -> dict[str, int]:
+        today = datetime.now(timezone.utc).date()
+        spent = [
+            row
+            for row in (list_job_rows() if rows is None else rows)
+            if row.prefetched and row.created_at.astimezone(timezone.utc).date() == today
+        ]
+        return {"jobs": len(spent), "audio_bytes": sum(row.audio_bytes for row in spent)}
+
+    def _candidates(self) -> list[tuple[str, str, str]]:
+        # Interleave topics by recency rank so one busy topic can't use up the whole budget.
+        ranked: list[list[tuple[str, str, str]]] = []
+        for topic in topic_registry.list_topics():
+            payload = topic_service.peek(topic.topic_id)
+            if topic.prefetch_items <= 0 or not payload:
+                continue
+            job_type = _JOB_TYPES[topic.default_tts_mode]
+            newest = sorted(
+                (item for item in payload.items if topic.default_tts_mode in item.tts_modes),
+                key=lambda item: item.published_at.timestamp() if item.published_at else 0.0,
+                reverse=True,
+            )[: topic.prefetch_items]
+            ranked.append([(job_type, topic.topic_id, item.item_id) for item in newest])
+        width = max((len(row) for row in ranked), default=0)
+        return [row[rank] for rank in range(width) for row in ranked if rank < len(row)]
+
+    def _take_tick(self) -> bool:
+        # With several API processes on a shared store only one of them plans per interval.
+        now = time.time()
+        taken = False
+
+        def claim(last: float | None) -> float | None:
+            nonlocal taken
+            if last is not None and now - last < self.interval_seconds * 0.9:
+                return last
+            taken = True
+            return now
+
+        state_store.update("prefetch", "tick", claim)
+        return taken
+
+
+prefetch_planner = PrefetchPlanner(
+    interval_seconds=settings.prefetch_interval_seconds,
+    daily_jobs=settings.prefetch_daily_jobs,
+    daily_audio_mb=settings.prefetch_daily_audio_mb,
+)
+
+
+@router.get("")
+def get_prefetch_status() -> dict:
+    return {
+        "enabled": settings.prefetch_enabled,
+        "topics": {row.topic_id: row.prefetch_items for row in topic_registry.list_topics() if row.prefetch_items > 0},
+        "usage": prefetch_planner.usage(),
+        "budget": {"jobs": prefetch_planner.daily_jobs, "audio_bytes": prefetch_planner.daily_audio_bytes},
+    }
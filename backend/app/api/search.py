@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from app.api.topics import service as topic_service
+from app.core.timing import span
+from app.services.live_social import live_social_service
+from app.services.search_index import SearchQuery, search_index
+from app.topics.registry import topic_registry
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+@router.get("")
+def search_items(
+    q: str = Query(min_length=1, max_length=200),
+    kind: Literal["topic", "live"] | None = None,
+    topic: str | None = None,
+    source: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sort: Literal["relevance", "recent"] = "relevance",
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+) -> dict:
+    # Served from the in-memory index only: no upstream calls, whatever the sources are doing.
+    started = time.perf_counter()
+    with span("search_sync"):
+        topic_service.sync_search_index(topic_registry.list_topics())
+        live_social_service.sync_search_index()
+    query = SearchQuery(
+        text=q,
+        kinds={kind} if kind else set(),
+        topics=_split(topic),
+        sources=_split(source),
+        since=_timestamp(since),
+        until=_timestamp(until),
+        sort=sort,
+        limit=limit,
+        offset=offset,
+        # A trailing space means the last word is complete.
+        prefix=not q.endswith(" "),
+    )
+    with span("search"):
+        total, rows = search_index.search(query)
+    return {
+        "query": q,
+        "total": total,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        "results": [
+            {"kind": doc.kind, "topic": doc.topic, "score": round(score, 4), "item": doc.payload}
+            for score, doc in rows
+        ],
+    }
+
+
+def _split(value: str | None) -> set[str]:
+    return {row.strip() for row in (value or "").split(",") if row.strip()}
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
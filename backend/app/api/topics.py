@@ -1,47 +1,46 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from typing import Any
 
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.core.response_cache import response_cache
+from app.core.settings import settings
+from app.domain.models import TopicConfig
 from app.topics.registry import topic_registry
 from app.topics.topic_live import TopicLiveService
 
 router = APIRouter(prefix="/api/topics", tags=["topics"])
-service = TopicLiveService()
+service = TopicLiveService(
+    cache_ttl_seconds=settings.topic_cache_ttl_seconds, deadline_seconds=settings.topic_deadline_seconds
+)
 
 
 @router.get("")
 def list_topics() -> dict:
-    rows = topic_registry.list_topics()
-    return {
-        "topics": [
-            {
-                "topic_id": row.topic_id,
-                "name": row.name,
-                "icon": row.icon,
-                "default_tts_mode": row.default_tts_mode,
-                "sources": [
-                    {
-                        "source_id": src.source_id,
-                        "name": src.name,
-                        "adapter": src.adapter,
-                        "url": src.url,
-                    }
-                    for src in row.sources
-                    if src.enabled
-                ],
-            }
-            for row in rows
-        ]
-    }
+    return {"topics": topic_summaries()}
+
+
+@router.get("/items")
+async def get_topics_items(request: Request, ids: str | None = None) -> Response:
+    wanted = [row.strip() for row in (ids or "").split(",") if row.strip()]
+    topics = [topic_registry.get_topic(topic_id) for topic_id in wanted] if wanted else topic_registry.list_topics()
+    if any(topic is None for topic in topics):
+        raise HTTPException(status_code=404, detail="topic not found")
+    entries = await fetch_topic_entries(topics, settings.dashboard_budget_seconds)
+    version = tuple((row["topic_id"], row["status"], row["updated_at"]) for row in entries)
+    prepared = response_cache.get(f"topics:{','.join(wanted)}", version, lambda: {"topics": entries})
+    return prepared.response(request)
 
 
 @router.get("/{topic_id}/items")
-async def get_topic_items(topic_id: str, force: bool = False) -> dict:
+async def get_topic_items(topic_id: str, request: Request, force: bool = False) -> Response:
     topic = topic_registry.get_topic(topic_id)
     if not topic:
         raise HTTPException(status_code=404, detail="topic not found")
     payload = await service.fetch_topic(topic, force=force)
-    return payload.model_dump(mode="json")
+    prepared = response_cache.get(f"topic:{topic_id}", payload.updated_at, lambda: payload)
+    return prepared.response(request)
 
 
 @router.get("/{topic_id}/items/{item_id}")
@@ -54,3 +53,42 @@ async def get_topic_item(topic_id: str, item_id: str) -> dict:
     if not item:
         raise HTTPException(status_code=404, detail="item not found")
     return item.model_dump(mode="json")
+
+
+def topic_summaries() -> list[dict[str, Any]]:
+    rows = topic_registry.list_topics()
+    return [
+        {
+            "topic_id": row.topic_id,
+            "name": row.name,
+            "icon": row.icon,
+            "default_tts_mode": row.default_tts_mode,
+            "sources": [
+                {
+                    "source_id": src.source_id,
+                    "name": src.name,
+                    "adapter": src.adapter,
+                    "url": src.url,
+                }
+                for src in row.sources
+                if src.enabled
+            ],
+        }
+        for row in rows
+    ]
+
+
+async def fetch_topic_entries(topics: list[TopicConfig], budget_seconds: float) -> list[dict[str, Any]]:
+    # All topics resolve concurrently; anything slower than the budget is served from its
+    # last snapshot (or marked pending) while its refresh finishes in the background.
+    out: list[dict[str, Any]] = []
+    for topic, payload, status in await service.fetch_topics(topics, budget_seconds):
+        out.append(
+            {
+                "topic_id": topic.topic_id,
+                "status": status,
+                "updated_at": payload.updated_at.isoformat() if payload else None,
+                "payload": payload,
+            }
+        )
+    return out
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+from uuid import uuid4
+
+from app.core.settings import settings
+
+# Leaf frames of threads that are just parked (event loop select, idle pool workers).
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+_MAX_SAMPLES = 20000
+
+
+# Samples the stacks of every thread in the process (the event loop plus the threadpool
+# doing the request's blocking work) with sys._current_frames until stopped, and keeps
+# them as folded stacks ready for flamegraph.pl or speedscope.
+class StackSampler:
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = max(0.001, interval_seconds)
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="catchdash-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._done.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._done.wait(self.interval_seconds) and self.samples < _MAX_SAMPLES:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                    continue
+                labels = []
+                while frame is not None:
+                    code = frame.f_code
+                    labels.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+
+@dataclass
+class Capture:
+    sampler: StackSampler
+    forced: bool
+
+
+@dataclass
+class Profile:
+    profile_id: str
+    path: str
+    duration_ms: float
+    samples: int
+    created_at: datetime
+    stacks: Counter[str] = field(default_factory=Counter)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "path": self.path,
+            "duration_ms": round(self.duration_ms, 1),
+            "samples": self.samples,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# Decides which requests get profiled: any request carrying the admin token in
+# `X-Catchdash-Profile`, or, once armed through the admin API, the next few requests
+# under a path prefix that turn out slower than a threshold. Kept per process, in memory.
+class ProfilerRegistry:
+    def __init__(self, keep: int = 20, max_concurrent: int = 2) -> None:
+        self._profiles: deque[Profile] = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._max_concurrent = max_concurrent
+        self._running = 0
+        self._armed: dict[str, Any] | None = None
+
+    def arm(self, count: int, path_prefix: str, min_ms: float, ttl_seconds: float) -> dict[str, Any]:
+        with self._lock:
+            self._armed = {
+                "remaining": max(1, count),
+                "path_prefix": path_prefix,
+                "min_ms": max(0.0, min_ms),
+                "expires_at": time.time() + ttl_seconds,
+            }
+            return dict(self._armed)
+
+    def disarm(self) -> None:
+        with self._lock:
+            self._armed = None
+
+    def armed(self) -> dict[str, Any] | None:
+        with self._lock:
+            if self._armed and (self._armed["remaining"] <= 0 or time.time() > self._armed["expires_at"]):
+                self._armed = None
+            return dict(self._armed) if self._armed else None
+
+    def begin(self, path: str, token: str) -> Capture | None:
+        forced = bool(token) and check_admin_token(token)
+        armed = self.armed()
+        if not forced and not (armed and path.startswith(armed["path_prefix"])):
+            return None
+        with self._lock:
+            if self._running >= self._max_concurrent:
+                return None
+            self._running += 1
+        sampler = StackSampler(settings.profile_interval_ms / 1000)
+        sampler.start()
+        return Capture(sampler=sampler, forced=forced)
+
+    def finish(self, capture: Capture, path: str, duration_ms: float) -> None:
+        capture.sampler.stop()
+        with self._lock:
+            self._running -= 1
+            if not capture.forced:
+                armed = self._armed
+                if not armed or duration_ms < armed["min_ms"] or armed["remaining"] <= 0:
+                    return
+                armed["remaining"] -= 1
+            self._profiles.append(
+                Profile(
+                    profile_id=uuid4().hex[:12],
+                    path=path,
+                    duration_ms=duration_ms,
+                    samples=capture.sampler.samples,
+                    created_at=datetime.now(timezone.utc),
+                    stacks=capture.sampler.stacks,
+                )
+            )
+
+    def profiles(self) -> list[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id: str) -> Profile | None:
+        with self._lock:
+            return next((row for row in self._profiles if row.profile_id == profile_id), None)
+
+
+def check_admin_token(token: str) -> bool:
+    return bool(settings.admin_token) and hmac.compare_digest(token.encode(), settings.admin_token.encode())
+
+
+def _short_path(path: str) -> str:
+    marker = f"{os.sep}app{os.sep}"
+    if marker in path:
+        return "app/" + path.rsplit(marker, 1)[1].replace(os.sep, "/")
+    return os.path.basename(path)
+
+
+profiler_registry = ProfilerRegistry()
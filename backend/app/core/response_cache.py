@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.timing import span
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+_COMPRESS_MIN_BYTES = 1024
+
+
+class PreparedPayload:
+    __slots__ = ("body", "etag", "gzip", "br")
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        compress = len(body) >= _COMPRESS_MIN_BYTES
+        self.gzip = gzip.compress(body, compresslevel=6) if compress else None
+        self.br = brotli.compress(body, quality=5) if compress and brotli is not None else None
+
+    def response(self, request: Request) -> Response:
+        # no-cache lets browsers keep the body but revalidate it with If-None-Match every time.
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+        if self.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        body = self.body
+        if self.br is not None and "br" in accepted:
+            body = self.br
+            headers["Content-Encoding"] = "br"
+        elif self.gzip is not None and "gzip" in accepted:
+            body = self.gzip
+            headers["Content-Encoding"] = "gzip"
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Holds the encoded (and compressed) bytes of the latest snapshot per endpoint key.
+# Callers pass a cheap version token; the payload is only rebuilt and re-encoded
+# when the version changes, so cache hits skip serialization entirely.
+class ResponseCache:
+    def __init__(self, max_entries: int = 256) -> None:
+        self._entries: OrderedDict[str, tuple[Hashable, PreparedPayload]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+
+    def get(self, key: str, version: Hashable, build: Callable[[], Any]) -> PreparedPayload:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        with span("serialize"):
+            prepared = PreparedPayload(encode_json(build()))
+        with self._lock:
+            self._entries[key] = (version, prepared)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return prepared
+
+
+def encode_json(value: Any) -> bytes:
+    if isinstance(value, BaseModel):
+        return value.model_dump_json().encode("utf-8")
+    return orjson.dumps(value, default=_default)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"cannot encode {type(value).__name__}")
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    out: set[str] = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        if params.strip().replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        out.add(name.strip().lower())
+    return out
+
+
+response_cache = ResponseCache()
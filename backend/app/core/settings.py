@@ -9,7 +9,36 @@ class Settings(BaseSettings):
     topics_config_path: str = "config/topics.yaml"
     http_timeout_seconds: float = 12.0
     topic_cache_ttl_seconds: int = 30
+    topic_deadline_seconds: float = 2.5
+    state_backend: str = "memory"
+    state_sqlite_path: str = "/tmp/catchdash-state.db"
+    dashboard_budget_seconds: float = 3.0
+    feed_parse_workers: int = 2
+    media_proxy_enabled: bool = True
+    media_proxy_secret: str = ""
+    media_cache_dir: str = "/tmp/catchdash-media"
+    media_cache_max_mb: int = 256
+    media_max_source_mb: int = 15
     audio_dir: str = "/tmp/catchdash-audio"
+    job_preempt_after_seconds: float = 3.0
+    server_timing_enabled: bool = True
+    slow_request_ms: float = 1500.0
+    admin_token: str = ""
+    profile_interval_ms: float = 5.0
+    prefetch_enabled: bool = False
+    prefetch_interval_seconds: float = 20.0
+    prefetch_daily_jobs: int = 30
+    prefetch_daily_audio_mb: float = 200.0
+    digest_max_items: int = 20
+    source_failure_threshold: int = 3
+    source_backoff_base_seconds: float = 30.0
+    source_backoff_max_seconds: float = 900.0
+    source_min_refresh_seconds: float = 30.0
+    source_max_refresh_seconds: float = 3600.0
+    outbound_rate_per_minute: float = 60.0
+    outbound_rate_burst: int = 10
+    outbound_max_wait_seconds: float = 5.0
+    outbound_sync_max_wait_seconds: float = 1.0
 
     model_config = SettingsConfigDict(env_file=".env", env_prefix="CATCHDASH_")
 
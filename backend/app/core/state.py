@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import copy
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from app.core.response_cache import encode_json
+from app.core.settings import settings
+
+Decoder = Callable[[Any], Any]
+
+_EVENTS_KEPT_PER_CHANNEL = 1000
+
+
+# Key/value namespaces (with optional TTL) plus sequenced pub/sub channels. Caches,
+# the job queue and change notifications all go through one store so the API can run
+# as several processes. `shared` tells callers whether values round-trip through JSON;
+# the in-process store hands back the very objects it was given. `decode` rebuilds a
+# value from its stored JSON, so only shared stores call it; the in-process store never
+# encoded the value and returns it as stored. Calls may block (SQLite), so async code
+# runs them in a thread.
+class StateStore(ABC):
+    shared = False
+
+    @abstractmethod
+    def get(self, namespace: str, key: str, decode: Decoder | None = None) -> Any | None:
+        ...
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def values(self, namespace: str, decode: Decoder | None = None) -> list[Any]:
+        ...
+
+    @abstractmethod
+    def update(
+        self, namespace: str, key: str, fn: Callable[[Any | None], Any | None], decode: Decoder | None = None
+    ) -> Any | None:
+        # Atomic read-modify-write; `fn` returning None leaves the entry untouched.
+        ...
+
+    @abstractmethod
+    def publish(self, channel: str, message: Any = None) -> int:
+        ...
+
+    @abstractmethod
+    def sequence(self, channel: str) -> int:
+        ...
+
+    @abstractmethod
+    def messages(self, channel: str, after: int = 0, limit: int = 100) -> list[tuple[int, Any]]:
+        ...
+
+
+class MemoryStateStore(StateStore):
+    def __init__(self) -> None:
+        self._data: dict[str, dict[str, tuple[float | None, Any]]] = {}
+        self._events: dict[str, deque[tuple[int, Any]]] = {}
+        self._sequences: dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def get(self, namespace: str, key: str, decode: Decoder | None = None) -> Any | None:
+        with self._lock:
+            entry = self._data.get(namespace, {}).get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= time.time():
+                del self._data[namespace][key]
+                return None
+            return entry[1]
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._data.setdefault(namespace, {})[key] = (expires_at, value)
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._data.get(namespace, {}).pop(key, None)
+
+    def values(self, namespace: str, decode: Decoder | None = None) -> list[Any]:
+        now = time.time()
+        with self._lock:
+            rows = self._data.get(namespace, {}).values()
+            return [value for expires_at, value in rows if not expires_at or expires_at > now]
+
+    def update(
+        self, namespace: str, key: str, fn: Callable[[Any | None], Any | None], decode: Decoder | None = None
+    ) -> Any | None:
+        with self._lock:
+            # `fn` gets a copy, like the SQLite store's freshly decoded value: a callback that
+            # mutates and then fails (or returns None) leaves the stored entry as it was.
+            value = fn(copy.deepcopy(self.get(namespace, key)))
+            if value is not None:
+                self.set(namespace, key, value)
+            return value
+
+    def publish(self, channel: str, message: Any = None) -> int:
+        with self._lock:
+            seq = self._sequences.get(channel, 0) + 1
+            self._sequences[channel] = seq
+            self._events.setdefault(channel, deque(maxlen=_EVENTS_KEPT_PER_CHANNEL)).append((seq, message))
+            return seq
+
+    def sequence(self, channel: str) -> int:
+        with self._lock:
+            return self._sequences.get(channel, 0)
+
+    def messages(self, channel: str, after: int = 0, limit: int = 100) -> list[tuple[int, Any]]:
+        with self._lock:
+            rows = [row for row in self._events.get(channel, ()) if row[0] > after]
+        return rows[:limit]
+
+
+# One SQLite file (WAL mode) shared by every worker process on a host, or by replicas
+# on a shared volume. Values are stored as JSON; pydantic models go through `encode_json`
+# and come back via the caller's `decode`.
+class SQLiteStateStore(StateStore):
+    shared = True
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._local = threading.local()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS kv (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                message BLOB
+            );
+            CREATE INDEX IF NOT EXISTS events_channel_seq ON events (channel, seq);
+            """
+        )
+
+    def get(self, namespace: str, key: str, decode: Decoder | None = None) -> Any | None:
+        row = self._conn().execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return _decode(row[0], decode) if row else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        self._write(self._conn(), namespace, key, value, ttl_seconds)
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._conn().execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def values(self, namespace: str, decode: Decoder | None = None) -> list[Any]:
+        rows = self._conn().execute(
+            "SELECT value FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?) ORDER BY rowid",
+            (namespace, time.time()),
+        ).fetchall()
+        return [_decode(row[0], decode) for row in rows]
+
+    def update(
+        self, namespace: str, key: str, fn: Callable[[Any | None], Any | None], decode: Decoder | None = None
+    ) -> Any | None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time()),
+            ).fetchone()
+            value = fn(_decode(row[0], decode) if row else None)
+            if value is not None:
+                self._write(conn, namespace, key, value, None)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return value
+
+    def publish(self, channel: str, message: Any = None) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = self._sequence(conn, channel) + 1
+            conn.execute(
+                "INSERT INTO events (channel, seq, message) VALUES (?, ?, ?)",
+                (channel, seq, encode_json(message)),
+            )
+            if seq % 100 == 0:
+                conn.execute(
+                    "DELETE FROM events WHERE channel = ? AND seq <= ?",
+                    (channel, seq - _EVENTS_KEPT_PER_CHANNEL),
+                )
+                conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return seq
+
+    def sequence(self, channel: str) -> int:
+        return self._sequence(self._conn(), channel)
+
+    def messages(self, channel: str, after: int = 0, limit: int = 100) -> list[tuple[int, Any]]:
+        rows = self._conn().execute(
+            "SELECT seq, message FROM events WHERE channel = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (channel, after, limit),
+        ).fetchall()
+        return [(seq, _decode(message, None)) for seq, message in rows]
+
+    def _sequence(self, conn: sqlite3.Connection, channel: str) -> int:
+        row = conn.execute("SELECT MAX(seq) FROM events WHERE channel = ?", (channel,)).fetchone()
+        return int(row[0] or 0)
+
+    def _write(
+        self, conn: sqlite3.Connection, namespace: str, key: str, value: Any, ttl_seconds: float | None
+    ) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        # Upsert rather than REPLACE so rowid (and therefore insertion order) is kept.
+        conn.execute(
+            """
+            INSERT INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at
+            """,
+            (namespace, key, encode_json(value), expires_at),
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=10.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+def _decode(raw: bytes | None, decode: Decoder | None) -> Any:
+    value = orjson.loads(raw) if raw is not None else None
+    return decode(value) if decode is not None and value is not None else value
+
+
+def create_state_store(backend: str, sqlite_path: str) -> StateStore:
+    if backend == "memory":
+        return MemoryStateStore()
+    if backend == "sqlite":
+        return SQLiteStateStore(sqlite_path)
+    raise ValueError(f"unsupported state backend: {backend}")
+
+
+state_store = create_state_store(settings.state_backend, settings.state_sqlite_path)
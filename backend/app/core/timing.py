@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from app.core.profiler import profiler_registry
+from app.core.settings import settings
+
+logger = logging.getLogger("app.timing")
+
+_current: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+_NAME_UNSAFE = re.compile(r"[^A-Za-z0-9_.\-]")
+
+
+# Named spans recorded while one request is served. The object travels in a contextvar,
+# so spans opened in tasks and threads spawned for the request (asyncio.to_thread, FastAPI's
+# threadpool) land on the same request. Repeated spans (one per source) are summed.
+class RequestTiming:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._spans: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            row = self._spans.setdefault(name, [0.0, 0])
+            row[0] += seconds
+            row[1] += 1
+
+    def spans(self) -> list[tuple[str, float, int]]:
+        with self._lock:
+            return [(name, total * 1000, int(count)) for name, (total, count) in self._spans.items()]
+
+    def header(self, total_ms: float) -> str:
+        parts = []
+        for name, ms, count in self.spans():
+            part = f"{_NAME_UNSAFE.sub('_', name)};dur={ms:.1f}"
+            parts.append(f'{part};desc="x{count}"' if count > 1 else part)
+        parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+
+
+# Pure ASGI (not BaseHTTPMiddleware) so streamed and file responses pass through untouched.
+# Adds `Server-Timing` to every HTTP response, logs requests slower than
+# `slow_request_ms`, and runs the sampling profiler when a request asked for it.
+class TimingMiddleware:
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        path = scope.get("path", "")
+        headers = dict(scope.get("headers") or [])
+        capture = profiler_registry.begin(path, headers.get(b"x-catchdash-profile", b"").decode("latin-1"))
+        status = 0
+
+        async def send_with_timing(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.server_timing_enabled:
+                    total_ms = (time.perf_counter() - timing.started) * 1000
+                    message.setdefault("headers", [])
+                    message["headers"] = [
+                        *message["headers"],
+                        (b"server-timing", timing.header(total_ms).encode("latin-1")),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            total_ms = (time.perf_counter() - timing.started) * 1000
+            if capture is not None:
+                profiler_registry.finish(capture, path, total_ms)
+            if settings.slow_request_ms > 0 and total_ms >= settings.slow_request_ms:
+                ranked = sorted(timing.spans(), key=lambda row: -row[1])
+                spans = " ".join(f"{name}={ms:.0f}ms" for name, ms, _ in ranked)
+                logger.warning(
+                    "slow request method=%s path=%s status=%s total=%.0fms %s",
+                    scope.get("method"),
+                    path,
+                    status,
+                    total_ms,
+                    spans,
+                )
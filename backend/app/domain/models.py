@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 
 
 FetchMode = Literal["full_page", "summary"]
+CircuitState = Literal["closed", "open", "half_open"]
 
 
 class SourceConfig(BaseModel):
@@ -15,6 +16,10 @@ class SourceConfig(BaseModel):
     adapter: str
     url: str
     enabled: bool = True
+    min_refresh_seconds: float | None = None
+    max_refresh_seconds: float | None = None
+    rate_limit_per_minute: float | None = None
+    rate_limit_burst: int | None = None
     metadata: dict[str, str] = Field(default_factory=dict)
 
 
@@ -25,9 +30,17 @@ class TopicConfig(BaseModel):
     enabled: bool = True
     default_tts_mode: FetchMode = "full_page"
     max_items: int = 40
+    # Newest items to pre-render audio for while the worker is idle (0 disables).
+    prefetch_items: int = 0
     sources: list[SourceConfig] = Field(default_factory=list)
 
 
+class ItemSource(BaseModel):
+    source_id: str
+    source_name: str
+    url: str
+
+
 class ContentItem(BaseModel):
     item_id: str
     topic_id: str
@@ -39,6 +52,25 @@ class ContentItem(BaseModel):
     summary: str | None = None
     image_url: str | None = None
     tts_modes: list[FetchMode] = Field(default_factory=lambda: ["full_page", "summary"])
+    # Every source that carried this item (or a near-duplicate of it); empty when only one did.
+    sources: list[ItemSource] = Field(default_factory=list)
+
+
+class SourceStatus(BaseModel):
+    source_id: str
+    name: str
+    state: CircuitState = "closed"
+    consecutive_failures: int = 0
+    last_success_at: datetime | None = None
+    last_failure_at: datetime | None = None
+    last_error: str | None = None
+    latency_ms: float | None = None
+    retry_at: datetime | None = None
+    refresh_interval_seconds: float | None = None
+    next_refresh_at: datetime | None = None
+    observed_gap_seconds: float | None = None
+    # Late or failing this round: the items shown are the last good fetch.
+    stale: bool = False
 
 
 class TopicItemsResponse(BaseModel):
@@ -46,3 +78,4 @@ class TopicItemsResponse(BaseModel):
     topic_name: str
     updated_at: datetime
     items: list[ContentItem]
+    sources: list[SourceStatus] = Field(default_factory=list)
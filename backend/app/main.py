@@ -1,12 +1,34 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.admin import router as admin_router
+from app.api.dashboard import router as dashboard_router
 from app.api.live import router as live_router
+from app.api.media import router as media_router
 from app.api.jobs import router as jobs_router
+from app.api.prefetch import prefetch_planner
+from app.api.prefetch import router as prefetch_router
+from app.api.search import router as search_router
 from app.api.topics import router as topics_router
 from app.core.settings import settings
+from app.core.timing import TimingMiddleware
+from app.topics.parse_pool import shutdown_parse_pool, warm_parse_pool
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await asyncio.to_thread(warm_parse_pool)
+    planner = asyncio.create_task(prefetch_planner.run()) if settings.prefetch_enabled else None
+    yield
+    if planner:
+        planner.cancel()
+    shutdown_parse_pool()
+
 
-app = FastAPI(title=settings.app_name, version="0.1.0")
+app = FastAPI(title=settings.app_name, version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,7 +36,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Outermost, so the total covers CORS and everything below it.
+app.add_middleware(TimingMiddleware)
 
 
 @app.get("/healthz")
@@ -25,3 +50,8 @@ def healthz() -> dict:
 app.include_router(topics_router)
 app.include_router(jobs_router)
 app.include_router(live_router)
+app.include_router(dashboard_router)
+app.include_router(media_router)
+app.include_router(prefetch_router)
+app.include_router(search_router)
+app.include_router(admin_router)
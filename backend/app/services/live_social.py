@@ -5,16 +5,40 @@ import html
 import logging
 import re
 import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
 
 from app.core.settings import settings
+from app.core.state import StateStore, state_store
+from app.core.timing import span
+from app.services.live_timeline import LiveEntry, SourceTimeline, merge_timelines
+from app.services.media_proxy import media_proxy
+from app.services.rate_limit import RateLimited, RateLimitedTransport, rate_limiter
+from app.services.refresh_schedule import RefreshScheduler, refresh_scheduler
+from app.services.search_index import SearchDocument, SearchIndex, search_index
+from app.services.source_health import SourceHealthRegistry, source_health
+from app.services.target_rotation import RotationRound, TargetRotation, target_rotation
 from app.topics.config_loader import load_live_social_config
 
 logger = logging.getLogger(__name__)
 
+_LIVE_NAMESPACE = "live_sources"
+_TIMELINE_NAMESPACE = "live_timelines"
+_WATERMARK_NAMESPACE = "live_watermarks"
+_BLUESKY_DID_NAMESPACE = "bluesky_dids"
+_BLUESKY_DID_TTL_SECONDS = 24 * 3600
+_BLUESKY_INCREMENTAL_PAGE = 5
+# Largest page each API serves, which bounds how many targets one consolidated request can carry.
+_MASTODON_MAX_LIMIT = 40
+_REDDIT_MAX_LIMIT = 100
+_ALGOLIA_MAX_HITS = 1000
+_BLUESKY_PROFILES_BATCH = 25
+
 
 @dataclass
 class LiveItem:
@@ -38,42 +62,105 @@ class LiveItem:
             "text": self.text,
             "author": self.author,
             "url": self.url,
-            "media": [{"type": "image", "url": u} for u in self.media_urls],
+            "media": [{"type": "image", "url": media_proxy.thumbnail_url(u)} for u in self.media_urls],
         }
 
 
+# Per-target high-water marks (newest id, fullname or timestamp seen) for one live source.
+# Adapters read them to ask upstream only for newer posts; advances are staged and only
+# written once the fetch as a whole has succeeded.
+class _Watermarks:
+    def __init__(self, state: StateStore, source: str) -> None:
+        self._state = state
+        self._source = source
+        self._pending: dict[str, Any] = {}
+
+    def get(self, target: str) -> Any | None:
+        return self._state.get(_WATERMARK_NAMESPACE, f"{self._source}:{target}")
+
+    def advance(self, target: str, value: Any) -> None:
+        self._pending[target] = value
+
+    def commit(self) -> None:
+        for target, value in self._pending.items():
+            self._state.set(_WATERMARK_NAMESPACE, f"{self._source}:{target}", value)
+        self._pending.clear()
+
+
 class LiveSocialService:
-    def __init__(self) -> None:
-        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
-        self._lock = threading.Lock()
-        self._ttl_seconds = 15.0
+    def __init__(
+        self,
+        health: SourceHealthRegistry | None = None,
+        scheduler: RefreshScheduler | None = None,
+        state: StateStore | None = None,
+        index: SearchIndex | None = None,
+        rotation: TargetRotation | None = None,
+    ) -> None:
+        self._state = state or state_store
+        self._rotation = rotation or target_rotation
+        self._index = index or search_index
+        self._timelines: dict[str, tuple[int, SourceTimeline]] = {}
+        self._timeline_lock = threading.Lock()
+        self._health = health or source_health
+        self._scheduler = scheduler or refresh_scheduler
 
     def supported_sources(self) -> set[str]:
         return {str(src.get("source_id") or "") for src in self._sources_cfg() if src.get("enabled", True)}
 
-    def fetch_all(self, force: bool = False) -> dict[str, Any]:
+    def fetch_all(self, force: bool = False, cached_only: bool = False) -> dict[str, Any]:
         now = dt.datetime.now(dt.UTC)
         refresh_interval = int(self._live_cfg().get("refresh_interval_seconds", 30))
         max_all = int(self._live_cfg().get("interleaved_limit", 24))
         source_rows = []
-        merged_items: list[dict[str, Any]] = []
+        timelines: list[SourceTimeline] = []
 
         for src in self._sources_cfg():
             if not src.get("enabled", True):
                 continue
             source_id = str(src.get("source_id") or "")
-            payload = self.fetch_source(source_id, force=force)
+            if cached_only:
+                payload = self.peek_source(source_id) or self._empty_payload(source_id, src, now)
+            else:
+                payload = self.fetch_source(source_id, force=force)
             source_rows.append(payload)
-            merged_items.extend(payload.get("items", []))
+            timelines.append(self._timeline(source_id, src))
 
-        merged_items.sort(key=lambda x: _sort_key(x.get("timestamp")), reverse=True)
+        with span("timeline_merge"):
+            items, next_cursor = merge_timelines(timelines, max_all)
         return {
             "updated_at": now.isoformat(),
             "refresh_interval_seconds": refresh_interval,
-            "items": merged_items[:max_all],
+            "items": items,
+            "next_cursor": next_cursor,
             "sources": source_rows,
         }
 
+    def page(self, cursor: str | None, limit: int | None = None) -> dict[str, Any]:
+        # "Load more" pages come straight from the in-memory timelines; nothing is refetched.
+        limit = limit or int(self._live_cfg().get("interleaved_limit", 24))
+        timelines = [
+            self._timeline(str(src.get("source_id") or ""), src)
+            for src in self._sources_cfg()
+            if src.get("enabled", True)
+        ]
+        with span("timeline_merge"):
+            items, next_cursor = merge_timelines(timelines, limit, cursor)
+        return {"items": items, "next_cursor": next_cursor}
+
+    def sync_search_index(self) -> None:
+        # Timelines written by other processes are reloaded and reindexed only when their version moved.
+        for src in self._sources_cfg():
+            if not src.get("enabled", True):
+                continue
+            source = str(src.get("source_id") or "")
+            version = self._state.sequence(f"{_TIMELINE_NAMESPACE}:{source}")
+            if version and self._index.version(f"live:{source}") != version:
+                with self._timeline_lock:
+                    self._index_timeline(source, self._timeline(source, src), version)
+
+    def peek_source(self, source: str) -> dict[str, Any] | None:
+        return self._state.get(_LIVE_NAMESPACE, source)
+
     def fetch_source(self, source: str, force: bool = False) -> dict[str, Any]:
         source_cfg = self._source_cfg(source)
         if not source_cfg or not source_cfg.get("enabled", True):
@@ -81,54 +168,157 @@ class LiveSocialService:
 
         now = dt.datetime.now(dt.UTC)
         now_ts = now.timestamp()
-        cache_key = f"source:{source}"
-
-        with self._lock:
-            cached = self._cache.get(cache_key)
-            if not force and cached and now_ts - cached[0] <= self._ttl_seconds:
-                return cached[1]
-
+        health_key = f"live:{source}"
+
+        cached = self.peek_source(source)
+        if not force and cached and not self._scheduler.is_due(health_key, now_ts):
+            return cached
+
+        if not self._health.allow(health_key):
+            # Circuit is open: keep serving the last good payload instead of waiting on a dead upstream.
+            stale = cached or self._empty_payload(source, source_cfg, now)
+            health = self._health.snapshot(health_key)
+            return {**stale, "error": health.get("last_error") or "source unavailable", "health": health}
+
+        transport = RateLimitedTransport(
+            rate_limiter,
+            per_minute=_float_or_none(source_cfg.get("rate_limit_per_minute")),
+            burst=_int_or_none(source_cfg.get("rate_limit_burst")),
+            owner=health_key,
+        )
+        marks = _Watermarks(self._state, source)
+        rotation = self._rotation.start_round(source)
+        started = time.perf_counter()
         try:
-            with httpx.Client(timeout=8.0, follow_redirects=True) as client:
-                items = self._fetch_source_items(client, source_cfg)
+            with span(f"live.{source}"), httpx.Client(timeout=8.0, follow_redirects=True, transport=transport) as client:
+                items = self._fetch_source_items(client, source_cfg, marks, rotation)
             error = None
+            self._health.record_success(health_key, time.perf_counter() - started)
+        except RateLimited as exc:
+            # Deferred, not failed: keep the cached items and try again on a later poll.
+            logger.info("live source deferred source=%s err=%s", source, exc)
+            items = []
+            error = str(exc)
         except Exception as exc:  # pragma: no cover - defensive
             logger.warning("live source fetch failed source=%s err=%s", source, exc)
+            self._health.record_failure(health_key, exc, time.perf_counter() - started)
             items = []
             error = str(exc)
 
         deduped: dict[str, LiveItem] = {}
         for item in items:
             deduped[f"{item.source}:{item.raw_id}"] = item
-        merged = sorted(deduped.values(), key=lambda x: x.timestamp, reverse=True)[: int(source_cfg.get("max_items", 6))]
+        timeline = self._timeline(source, source_cfg)
+        if deduped:
+            with span("timeline_store"):
+                timeline = self._store_timeline(
+                    source,
+                    source_cfg,
+                    (LiveEntry(int(row.timestamp.timestamp()), key, row.as_dict()) for key, row in deduped.items()),
+                )
 
-        payload = {
+        if error is None:
+            # Only move the high-water marks once the new posts are safely in the timeline.
+            marks.commit()
+            rotation.commit()
+            live_cfg = self._live_cfg()
+            self._scheduler.observe(
+                health_key,
+                ((f"{row.source}:{row.raw_id}", row.timestamp.timestamp()) for row in deduped.values()),
+                min_seconds=_float_or_none(source_cfg.get("min_refresh_seconds", live_cfg.get("min_refresh_seconds", 15))),
+                max_seconds=_float_or_none(source_cfg.get("max_refresh_seconds", live_cfg.get("max_refresh_seconds", 900))),
+                now=now_ts,
+            )
+
+        newest = timeline.newest(int(source_cfg.get("max_items", 6)))
+        payload = {**self._empty_payload(source, source_cfg, now), "items": [entry.item for entry in newest]}
+        if error and cached:
+            # Keep the last good items (and their timestamp) rather than blanking the source.
+            payload.update(items=cached.get("items", []), updated_at=cached.get("updated_at"))
+        payload.update(
+            error=error,
+            health=self._health.snapshot(health_key),
+            schedule=self._scheduler.snapshot(health_key),
+        )
+        self._state.set(_LIVE_NAMESPACE, source, payload)
+        return payload
+
+    def _timeline(self, source: str, source_cfg: dict[str, Any]) -> SourceTimeline:
+        # The shared rows are only decoded when another fetch (possibly in another process) changed them.
+        version = self._state.sequence(f"{_TIMELINE_NAMESPACE}:{source}")
+        local = self._timelines.get(source)
+        if local and local[0] == version:
+            return local[1]
+        rows = self._state.get(_TIMELINE_NAMESPACE, source) or []
+        timeline = SourceTimeline.from_rows(rows, self._timeline_capacity(source_cfg))
+        self._timelines[source] = (version, timeline)
+        return timeline
+
+    def _store_timeline(
+        self, source: str, source_cfg: dict[str, Any], entries: Iterable[LiveEntry]
+    ) -> SourceTimeline:
+        with self._timeline_lock:
+            timeline = self._timeline(source, source_cfg)
+            timeline.extend(entries)
+            self._state.set(_TIMELINE_NAMESPACE, source, timeline.rows())
+            version = self._state.publish(f"{_TIMELINE_NAMESPACE}:{source}")
+            self._timelines[source] = (version, timeline)
+            self._index_timeline(source, timeline, version)
+        return timeline
+
+    def _index_timeline(self, source: str, timeline: SourceTimeline, version: int) -> None:
+        self._index.replace_group(
+            f"live:{source}",
+            version,
+            (
+                SearchDocument(
+                    key=f"live:{entry.key}",
+                    kind="live",
+                    topic=str(entry.item.get("topic") or ""),
+                    sources=frozenset([source]),
+                    timestamp=float(entry.ts),
+                    title=str(entry.item.get("title") or ""),
+                    text=f"{entry.item.get('text') or ''} {entry.item.get('author') or ''}",
+                    payload=entry.item,
+                )
+                for entry in timeline.iter_before()
+            ),
+        )
+
+    def _timeline_capacity(self, source_cfg: dict[str, Any]) -> int:
+        return int(source_cfg.get("timeline_items", self._live_cfg().get("timeline_items", 200)))
+
+    def _empty_payload(self, source: str, source_cfg: dict[str, Any], now: dt.datetime) -> dict[str, Any]:
+        return {
             "source_id": source,
             "name": str(source_cfg.get("name") or source.title()),
             "icon": str(source_cfg.get("icon") or "•"),
             "updated_at": now.isoformat(),
-            "items": [row.as_dict() for row in merged],
-            "error": error,
+            "items": [],
+            "error": None,
         }
-        with self._lock:
-            self._cache[cache_key] = (now_ts, payload)
-        return payload
 
-    def _fetch_source_items(self, client: httpx.Client, source_cfg: dict[str, Any]) -> list[LiveItem]:
+    def _fetch_source_items(
+        self, client: httpx.Client, source_cfg: dict[str, Any], marks: _Watermarks, rotation: RotationRound
+    ) -> list[LiveItem]:
+        # `max_tags` / `max_subreddits` / `max_queries` / `max_handles` are request budgets per
+        # refresh; the rotation picks which of the configured targets fill them this time.
         source_type = str(source_cfg.get("type") or "").lower()
         if source_type == "mastodon":
-            return self._fetch_mastodon(client, source_cfg)
+            return self._fetch_mastodon(client, source_cfg, marks, rotation)
         if source_type == "reddit":
-            return self._fetch_reddit(client, source_cfg)
+            return self._fetch_reddit(client, source_cfg, marks, rotation)
         if source_type == "hackernews":
-            return self._fetch_hackernews(client, source_cfg)
+            return self._fetch_hackernews(client, source_cfg, marks, rotation)
         if source_type == "bluesky_api":
-            return self._fetch_bluesky_api(client, source_cfg)
+            return self._fetch_bluesky_api(client, source_cfg, marks, rotation)
         if source_type == "bluesky_links":
             return self._fetch_bluesky_links(source_cfg)
         return []
 
-    def _fetch_mastodon(self, client: httpx.Client, source_cfg: dict[str, Any]) -> list[LiveItem]:
+    def _fetch_mastodon(
+        self, client: httpx.Client, source_cfg: dict[str, Any], marks: _Watermarks, rotation: RotationRound
+    ) -> list[LiveItem]:
         out: list[LiveItem] = []
         base_url = str(source_cfg.get("instance_base_url", "https://mastodon.social")).rstrip("/")
         tags = [str(tag).strip().lstrip("#") for tag in source_cfg.get("tags", []) if str(tag).strip()]
@@ -136,17 +326,46 @@ class LiveSocialService:
         limit_per_tag = int(source_cfg.get("limit_per_tag", 8))
         max_tags = int(source_cfg.get("max_tags", 3))
 
-        for hashtag in tags[:max_tags]:
-            res = client.get(f"{base_url}/api/v1/timelines/tag/{hashtag}", params={"limit": limit_per_tag})
+        # Consolidated: one tag timeline with the other tags as `any[]` returns posts carrying any of them.
+        size = _group_size(limit_per_tag, _MASTODON_MAX_LIMIT, self._consolidate(source_cfg))
+        for group in _chunks(_rotate(rotation, "tag:", tags, max_tags * size), size):
+            params: dict[str, Any] = {"limit": min(limit_per_tag * len(group), _MASTODON_MAX_LIMIT)}
+            if len(group) > 1:
+                params["any[]"] = group[1:]
+            # Status ids are time-ordered snowflakes: a group asks from its least advanced tag.
+            since_ids = [marks.get(f"tag:{tag}") for tag in group]
+            if all(since_ids):
+                params["since_id"] = min(since_ids, key=_snowflake_order)
+            res = client.get(f"{base_url}/api/v1/timelines/tag/{group[0]}", params=params)
             res.raise_for_status()
-            for row in res.json():
+            rows = res.json()
+            rotation.polled(f"tag:{tag}" for tag in group)
+
+            def tags_of(row: dict[str, Any]) -> list[str]:
+                return [str(tag.get("name") or "") for tag in row.get("tags") or []]
+
+            # Filtered-out posts still move the marks so they aren't fetched again.
+            _advance_marks(
+                marks,
+                "tag:",
+                group,
+                since_ids,
+                rows,
+                tags_of,
+                lambda row: str(row.get("id") or ""),
+                _snowflake_order,
+                full=len(rows) >= params["limit"],
+            )
+            pairs = _split_targets(rows, group, tags_of, limit_per_tag)
+            for tag, row in pairs:
+                created_at = _parse_datetime(row.get("created_at"))
+                rotation.seen(f"tag:{tag}", created_at.timestamp() if created_at else None)
                 content_text = _strip_html(row.get("content", ""))
                 language = str(row.get("language") or "").lower()
                 if language and language != "en":
                     continue
                 if not language and not _looks_english(content_text):
                     continue
-                created_at = _parse_datetime(row.get("created_at"))
                 if not created_at:
                     continue
                 account = row.get("account") or {}
@@ -166,24 +385,58 @@ class LiveSocialService:
                 )
         return out
 
-    def _fetch_reddit(self, client: httpx.Client, source_cfg: dict[str, Any]) -> list[LiveItem]:
+    def _fetch_reddit(
+        self, client: httpx.Client, source_cfg: dict[str, Any], marks: _Watermarks, rotation: RotationRound
+    ) -> list[LiveItem]:
         out: list[LiveItem] = []
         subreddits = [str(x).strip() for x in source_cfg.get("subreddits", []) if str(x).strip()]
         sort = str(source_cfg.get("sort", "new"))
         limit = int(source_cfg.get("limit_per_subreddit", 10))
         max_subreddits = int(source_cfg.get("max_subreddits", 3))
         topic = str(source_cfg.get("topic", "ai"))
+        base_url = str(source_cfg.get("base_url", "https://www.reddit.com")).rstrip("/")
         headers = {"User-Agent": "catchdash/0.1 (+https://github.com/catchdash)"}
 
-        for subreddit in subreddits[:max_subreddits]:
-            res = client.get(
-                f"https://www.reddit.com/r/{subreddit}/{sort}.json",
-                params={"limit": limit},
-                headers=headers,
+        full_refresh_seconds = float(source_cfg.get("full_refresh_seconds", 1800))
+        now_ts = time.time()
+
+        # Consolidated: a multireddit (`r/a+b+c`) listing covers several subreddits in one request.
+        size = _group_size(limit, _REDDIT_MAX_LIMIT, self._consolidate(source_cfg))
+        for group in _chunks(_rotate(rotation, "r:", subreddits, max_subreddits * size), size):
+            params: dict[str, Any] = {"limit": min(limit * len(group), _REDDIT_MAX_LIMIT)}
+            name = "+".join(group)
+            url = f"{base_url}/r/{name}/{sort}.json"
+            # Only the "new" listing is time-ordered, so only it can be fetched incrementally. A full
+            # listing is still requested now and then: `before` returns nothing once its anchor post
+            # is deleted or removed. The anchor is a post from the group's combined listing, so it
+            # only holds while the rotation keeps the same group; a regrouped subreddit starts over.
+            group_marks = [marks.get(f"r:{subreddit}") or {} for subreddit in group] if sort == "new" else []
+            incremental = bool(group_marks) and all(
+                mark.get("group") == name
+                and mark.get("before")
+                and now_ts - float(mark.get("full_at") or 0) < full_refresh_seconds
+                for mark in group_marks
             )
-            res.raise_for_status()
-            children = (res.json().get("data") or {}).get("children", [])
-            for child in children:
+            if incremental:
+                params["before"] = min((mark["before"] for mark in group_marks), key=_reddit_order)
+            children = _reddit_listing(client, url, params, headers)
+            if incremental and not children:
+                # Nothing new, or the anchor was removed: only a full listing can tell them apart.
+                del params["before"]
+                incremental = False
+                children = _reddit_listing(client, url, params, headers)
+            rotation.polled(f"r:{subreddit}" for subreddit in group)
+            newest = str((children[0].get("data") or {}).get("name") or "") if children else ""
+            for subreddit, mark in zip(group, group_marks):
+                previous = str(mark.get("before") or "") if incremental else ""
+                before = max(newest, previous, key=_reddit_order)
+                full_at = float(mark.get("full_at") or 0) if incremental else now_ts
+                marks.advance(f"r:{subreddit}", {"before": before or None, "full_at": full_at, "group": name})
+            pairs = _split_targets(
+                children, group, lambda child: [str((child.get("data") or {}).get("subreddit") or "")], limit
+            )
+            for subreddit, child in pairs:
+                rotation.seen(f"r:{subreddit}", _float_or_none((child.get("data") or {}).get("created_utc")))
                 data = child.get("data") or {}
                 created_utc = data.get("created_utc")
                 if created_utc is None:
@@ -194,9 +447,9 @@ class LiveSocialService:
                 preview = (data.get("preview") or {}).get("images") or []
                 media_urls: list[str] = []
                 if preview:
-                    source = preview[0].get("source") or {}
-                    if source.get("url"):
-                        media_urls.append(html.unescape(str(source.get("url"))))
+                    image = _reddit_preview_image(preview[0])
+                    if image:
+                        media_urls.append(html.unescape(image))
                 out.append(
                     LiveItem(
                         source=str(source_cfg.get("source_id") or "reddit"),
@@ -212,20 +465,53 @@ class LiveSocialService:
                 )
         return out
 
-    def _fetch_hackernews(self, client: httpx.Client, source_cfg: dict[str, Any]) -> list[LiveItem]:
+    def _fetch_hackernews(
+        self, client: httpx.Client, source_cfg: dict[str, Any], marks: _Watermarks, rotation: RotationRound
+    ) -> list[LiveItem]:
         out: list[LiveItem] = []
         queries = [str(x).strip() for x in source_cfg.get("queries", []) if str(x).strip()]
         hits_per_query = int(source_cfg.get("hits_per_query", 10))
         max_queries = int(source_cfg.get("max_queries", 4))
         topic = str(source_cfg.get("topic", "ai"))
-
-        for query in queries[:max_queries]:
-            res = client.get(
-                "https://hn.algolia.com/api/v1/search_by_date",
-                params={"query": query, "tags": "story", "hitsPerPage": hits_per_query},
-            )
+        base_url = str(source_cfg.get("base_url", "https://hn.algolia.com")).rstrip("/")
+
+        # Consolidated: all query words in one search with every word optional, i.e. an OR of the
+        # queries; hits are attributed back to the queries whose words they contain.
+        size = _group_size(hits_per_query, _ALGOLIA_MAX_HITS, self._consolidate(source_cfg))
+        for group in _chunks(_rotate(rotation, "q:", queries, max_queries * size), size):
+            query = " ".join(group)
+            params: dict[str, Any] = {
+                "query": query,
+                "tags": "story",
+                "hitsPerPage": min(hits_per_query * len(group), _ALGOLIA_MAX_HITS),
+            }
+            if len(group) > 1:
+                params["optionalWords"] = query
+            since = [marks.get(f"q:{name}") for name in group]
+            if all(since):
+                params["numericFilters"] = f"created_at_i>{int(min(since))}"
+            res = client.get(f"{base_url}/api/v1/search_by_date", params=params)
             res.raise_for_status()
-            for row in res.json().get("hits", []):
+            hits = res.json().get("hits", [])
+            rotation.polled(f"q:{name}" for name in group)
+
+            def queries_of(row: dict[str, Any], group: list[str] = group) -> list[str]:
+                return _algolia_matches(row, group)
+
+            _advance_marks(
+                marks,
+                "q:",
+                group,
+                since,
+                hits,
+                queries_of,
+                lambda row: int(row.get("created_at_i") or 0),
+                int,
+                full=len(hits) >= params["hitsPerPage"],
+            )
+            pairs = _split_targets(hits, group, queries_of, hits_per_query)
+            for target, row in pairs:
+                rotation.seen(f"q:{target}", _float_or_none(row.get("created_at_i")))
                 ts = row.get("created_at_i")
                 if ts is None:
                     continue
@@ -268,7 +554,9 @@ class LiveSocialService:
             )
         return out
 
-    def _fetch_bluesky_api(self, client: httpx.Client, source_cfg: dict[str, Any]) -> list[LiveItem]:
+    def _fetch_bluesky_api(
+        self, client: httpx.Client, source_cfg: dict[str, Any], marks: _Watermarks, rotation: RotationRound
+    ) -> list[LiveItem]:
         out: list[LiveItem] = []
         base_url = str(source_cfg.get("base_url", "https://public.api.bsky.app")).rstrip("/")
         topic = str(source_cfg.get("topic", "ai"))
@@ -279,44 +567,66 @@ class LiveSocialService:
         queries = [str(x).strip() for x in source_cfg.get("queries", []) if str(x).strip()]
         max_queries = int(source_cfg.get("max_queries", 2))
 
+        # Author feeds have no multi-author form, but consolidated mode resolves all the handles
+        # not cached yet with getProfiles, 25 per request, instead of one resolveHandle each.
+        handles = _rotate(rotation, "author:", handles, max_handles)
+        dids = self._resolve_bluesky_handles(client, base_url, handles) if self._consolidate(source_cfg) else {}
+
         # Handle-based author feeds.
-        for handle in handles[:max_handles]:
+        for handle in handles:
             try:
-                did = self._resolve_bluesky_handle(client, base_url, handle)
+                did = dids.get(handle) or self._resolve_bluesky_handle(client, base_url, handle)
                 if not did:
                     continue
-                res = client.get(
-                    f"{base_url}/xrpc/app.bsky.feed.getAuthorFeed",
-                    params={"actor": did, "limit": limit},
-                )
-                res.raise_for_status()
-                for row in res.json().get("feed", []):
+                rows = self._bluesky_author_feed_since(client, base_url, did, limit, marks.get(f"author:{handle}"))
+                rotation.polled([f"author:{handle}"])
+                if rows:
+                    marks.advance(f"author:{handle}", _bluesky_feed_ts(rows[0]))
+                for row in rows:
+                    rotation.seen(f"author:{handle}", _bluesky_feed_ts(row))
                     post = row.get("post") or {}
                     item = self._bluesky_post_to_item(post, source_cfg.get("source_id", "bluesky"), topic)
                     if item:
                         out.append(item)
+            except RateLimited:
+                if out:
+                    break
+                raise
             except Exception as exc:  # pragma: no cover - defensive
                 logger.warning("bluesky handle fetch failed handle=%s err=%s", handle, exc)
 
         # Query-based search feed (optional but useful when handles are sparse).
         if bool(source_cfg.get("enable_search", False)):
-            for query in queries[:max_queries]:
+            for query in _rotate(rotation, "search:", queries, max_queries):
                 try:
-                    res = client.get(
-                        f"{base_url}/xrpc/app.bsky.feed.searchPosts",
-                        params={"q": query, "limit": limit},
-                    )
+                    params: dict[str, Any] = {"q": query, "limit": limit, "sort": "latest"}
+                    since = marks.get(f"search:{query}")
+                    if since:
+                        params["since"] = dt.datetime.fromtimestamp(float(since), tz=dt.UTC).isoformat()
+                    res = client.get(f"{base_url}/xrpc/app.bsky.feed.searchPosts", params=params)
                     res.raise_for_status()
-                    for post in res.json().get("posts", []):
+                    posts = res.json().get("posts", [])
+                    rotation.polled([f"search:{query}"])
+                    newest = max((_bluesky_feed_ts({"post": post}) or 0.0 for post in posts), default=0.0)
+                    if newest:
+                        marks.advance(f"search:{query}", newest)
+                    for post in posts:
+                        rotation.seen(f"search:{query}", _bluesky_feed_ts({"post": post}))
                         item = self._bluesky_post_to_item(post, source_cfg.get("source_id", "bluesky"), topic)
                         if item:
                             out.append(item)
+                except RateLimited:
+                    break
                 except Exception as exc:  # pragma: no cover - defensive
                     logger.warning("bluesky query fetch failed query=%s err=%s", query, exc)
 
         return out
 
     def _resolve_bluesky_handle(self, client: httpx.Client, base_url: str, handle: str) -> str | None:
+        # Handles change rarely, so the DID is cached instead of resolved on every refresh.
+        cached = self._state.get(_BLUESKY_DID_NAMESPACE, handle)
+        if cached:
+            return cached
         res = client.get(
             f"{base_url}/xrpc/com.atproto.identity.resolveHandle",
             params={"handle": handle},
@@ -324,8 +634,63 @@ class LiveSocialService:
         if res.status_code >= 400:
             return None
         did = str((res.json() or {}).get("did") or "").strip()
+        if did:
+            self._state.set(_BLUESKY_DID_NAMESPACE, handle, did, ttl_seconds=_BLUESKY_DID_TTL_SECONDS)
         return did or None
 
+    def _resolve_bluesky_handles(self, client: httpx.Client, base_url: str, handles: list[str]) -> dict[str, str]:
+        out: dict[str, str] = {}
+        missing: list[str] = []
+        for handle in handles:
+            cached = self._state.get(_BLUESKY_DID_NAMESPACE, handle)
+            if cached:
+                out[handle] = cached
+            else:
+                missing.append(handle)
+        if len(missing) < 2:
+            return out
+        wanted = {handle.casefold(): handle for handle in missing}
+        for start in range(0, len(missing), _BLUESKY_PROFILES_BATCH):
+            res = client.get(
+                f"{base_url}/xrpc/app.bsky.actor.getProfiles",
+                params={"actors": missing[start : start + _BLUESKY_PROFILES_BATCH]},
+            )
+            if res.status_code >= 400:
+                # Unresolved handles fall back to resolveHandle one by one.
+                continue
+            for profile in (res.json() or {}).get("profiles") or []:
+                handle = wanted.get(str(profile.get("handle") or "").casefold())
+                did = str(profile.get("did") or "").strip()
+                if handle and did:
+                    self._state.set(_BLUESKY_DID_NAMESPACE, handle, did, ttl_seconds=_BLUESKY_DID_TTL_SECONDS)
+                    out[handle] = did
+        return out
+
+    def _bluesky_author_feed_since(
+        self, client: httpx.Client, base_url: str, did: str, limit: int, since: float | None
+    ) -> list[dict[str, Any]]:
+        # getAuthorFeed can only page backwards, so ask for a small newest page and follow the
+        # cursor until reaching the last post already seen (or `limit` posts in total).
+        page_size = min(limit, _BLUESKY_INCREMENTAL_PAGE) if since else limit
+        out: list[dict[str, Any]] = []
+        cursor: str | None = None
+        while len(out) < limit:
+            params: dict[str, Any] = {"actor": did, "limit": min(page_size, limit - len(out))}
+            if cursor:
+                params["cursor"] = cursor
+            res = client.get(f"{base_url}/xrpc/app.bsky.feed.getAuthorFeed", params=params)
+            res.raise_for_status()
+            body = res.json()
+            rows = body.get("feed", [])
+            for row in rows:
+                if since and (_bluesky_feed_ts(row) or 0.0) <= since:
+                    return out
+                out.append(row)
+            cursor = body.get("cursor")
+            if not since or not cursor or not rows:
+                break
+        return out
+
     def _bluesky_post_to_item(self, post: dict[str, Any], source_id: str, topic: str) -> LiveItem | None:
         if not isinstance(post, dict):
             return None
@@ -380,12 +745,16 @@ class LiveSocialService:
                 continue
             fullsize = str(image.get("fullsize") or "").strip()
             thumb = str(image.get("thumb") or "").strip()
-            if fullsize:
-                out.append(fullsize)
-            elif thumb:
+            # The feed thumbnail is already larger than anything the media proxy serves.
+            if thumb:
                 out.append(thumb)
+            elif fullsize:
+                out.append(fullsize)
         return out
 
+    def _consolidate(self, source_cfg: dict[str, Any]) -> bool:
+        return bool(source_cfg.get("consolidate", self._live_cfg().get("consolidate", True)))
+
     def _live_cfg(self) -> dict[str, Any]:
         return load_live_social_config(settings.topics_config_path)
 
@@ -411,6 +780,107 @@ class LiveSocialService:
         return None
 
 
+def _group_size(per_target: int, max_page: int, consolidate: bool) -> int:
+    # As many targets per request as the API's page can hold at `per_target` rows each.
+    return max(1, max_page // max(1, per_target)) if consolidate else 1
+
+
+def _chunks(targets: list[str], size: int) -> list[list[str]]:
+    return [targets[start : start + size] for start in range(0, len(targets), size)]
+
+
+def _rotate(rotation: RotationRound, prefix: str, targets: list[str], count: int) -> list[str]:
+    # Rotation state is keyed like the watermarks (`tag:ai`, `r:OpenAI`, `author:handle`, ...).
+    picked = set(rotation.pick([f"{prefix}{target}" for target in targets], count))
+    return [target for target in targets if f"{prefix}{target}" in picked]
+
+
+def _split_targets(
+    rows: list[Any], targets: list[str], labels: Callable[[Any], list[str]], per_target: int
+) -> list[tuple[str, Any]]:
+    # Attributes each row of a consolidated response to the least-filled requested target it
+    # carries and keeps at most `per_target` rows per target, which is what separate requests
+    # would have returned. Rows carrying none of the targets (an OR over query words matched
+    # only part of a query, a tag normalised differently) are dropped rather than guessed.
+    if len(targets) < 2:
+        return [(targets[0], row) for row in rows] if targets else []
+    counts: Counter[str] = Counter()
+    out: list[tuple[str, Any]] = []
+    for row in rows:
+        matched = _matched_targets(row, targets, labels)
+        if not matched:
+            continue
+        target = min(matched, key=lambda name: counts[name])
+        if counts[target] < per_target:
+            counts[target] += 1
+            out.append((target, row))
+    return out
+
+
+def _matched_targets(row: Any, targets: list[str], labels: Callable[[Any], list[str]]) -> list[str]:
+    wanted = {target.casefold(): target for target in targets}
+    return list(dict.fromkeys(wanted[label.casefold()] for label in labels(row) if label.casefold() in wanted))
+
+
+def _advance_marks(
+    marks: _Watermarks,
+    prefix: str,
+    group: list[str],
+    since: list[Any],
+    rows: list[Any],
+    labels: Callable[[Any], list[str]],
+    value: Callable[[Any], Any],
+    order: Callable[[Any], Any],
+    full: bool,
+) -> None:
+    # Each target's mark moves to the newest row that carries it. In a consolidated response a full
+    # page may have crowded out older posts of any member, so no mark moves past its oldest row.
+    newest: dict[str, Any] = {}
+    for row in rows:
+        current = value(row)
+        if not current:
+            continue
+        for target in group if len(group) == 1 else _matched_targets(row, group, labels):
+            if target not in newest or order(current) > order(newest[target]):
+                newest[target] = current
+    values = [current for current in map(value, rows) if current]
+    ceiling = min(values, key=order) if full and len(group) > 1 and values else None
+    for target, mark in zip(group, since):
+        candidate = newest.get(target)
+        if candidate is None:
+            continue
+        if ceiling is not None and order(ceiling) < order(candidate):
+            candidate = ceiling
+        if not mark or order(candidate) > order(mark):
+            marks.advance(f"{prefix}{target}", candidate)
+
+
+def _snowflake_order(value: str) -> tuple[int, str]:
+    # Numeric ids compare by length first, then digits.
+    return len(value), value
+
+
+def _reddit_listing(
+    client: httpx.Client, url: str, params: dict[str, Any], headers: dict[str, str]
+) -> list[dict[str, Any]]:
+    res = client.get(url, params=params, headers=headers)
+    res.raise_for_status()
+    return (res.json().get("data") or {}).get("children", [])
+
+
+def _reddit_order(fullname: str) -> int:
+    try:
+        return int(fullname.rsplit("_", 1)[-1], 36) if fullname else -1
+    except ValueError:
+        return -1
+
+
+def _algolia_matches(row: dict[str, Any], queries: list[str]) -> list[str]:
+    text = " ".join(str(row.get(key) or "") for key in ("title", "url", "story_text")).casefold()
+    words = set(re.findall(r"\w+", text))
+    return [query for query in queries if all(word in words for word in re.findall(r"\w+", query.casefold()))]
+
+
 def _strip_html(value: str) -> str:
     text = re.sub(r"<[^>]+>", " ", value or "")
     text = html.unescape(text)
@@ -437,9 +907,36 @@ def _trim(value: str, n: int) -> str:
     return txt[: max(0, n - 1)].rstrip() + "…"
 
 
-def _sort_key(value: Any) -> float:
-    parsed = _parse_datetime(value)
-    return parsed.timestamp() if parsed else 0.0
+def _reddit_preview_image(preview: dict[str, Any], min_width: int = 640) -> str | None:
+    # Prefer the smallest pre-scaled rendition that still covers the thumbnail width.
+    resolutions = [row for row in preview.get("resolutions") or [] if row.get("url")]
+    for row in sorted(resolutions, key=lambda x: int(x.get("width") or 0)):
+        if int(row.get("width") or 0) >= min_width:
+            return str(row["url"])
+    source = preview.get("source") or {}
+    return str(source["url"]) if source.get("url") else None
+
+
+def _bluesky_feed_ts(row: dict[str, Any]) -> float | None:
+    # Author feeds are ordered by when a post (or repost) was indexed.
+    reason = row.get("reason") or {}
+    post = row.get("post") or {}
+    parsed = _parse_datetime(reason.get("indexedAt")) or _parse_datetime(post.get("indexedAt"))
+    return parsed.timestamp() if parsed else None
+
+
+def _float_or_none(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int_or_none(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 
 def _looks_english(value: str) -> bool:
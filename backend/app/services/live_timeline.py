@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+
+class LiveEntry:
+    __slots__ = ("ts", "key", "item")
+
+    def __init__(self, ts: int, key: str, item: dict[str, Any]) -> None:
+        self.ts = ts
+        self.key = key
+        self.item = item
+
+    def sort_key(self) -> tuple[int, str]:
+        return (self.ts, self.key)
+
+
+# Bounded, time-ordered buffer of one source's posts (oldest first). New fetches are
+# merged in by id and the oldest entries fall off once `capacity` is reached, so the
+# feed can page back further than a single upstream response without refetching.
+class SourceTimeline:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        # Entries and their sort keys are swapped together as one tuple.
+        self._buffer: tuple[list[LiveEntry], list[tuple[int, str]]] = ([], [])
+        self._index: dict[str, LiveEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._buffer[0])
+
+    def extend(self, entries: Iterable[LiveEntry]) -> int:
+        # Copy-on-write so readers iterating a page never see a half-updated buffer: entries are
+        # never mutated, only swapped out in the copies. New posts are bisect-inserted and the
+        # oldest dropped as they overflow, so the copy never exceeds `capacity` by more than one.
+        rows, keys = list(self._buffer[0]), list(self._buffer[1])
+        index = dict(self._index)
+        added = 0
+        changed = False
+        for entry in entries:
+            current = index.get(entry.key)
+            if current is not None:
+                position = bisect.bisect_left(keys, current.sort_key())
+                if current.ts == entry.ts:
+                    # Same post at the same position: take the fresh payload (edits, counts).
+                    rows[position] = index[entry.key] = entry
+                    changed = True
+                    continue
+                del rows[position], keys[position]
+            else:
+                added += 1
+            position = bisect.bisect_left(keys, entry.sort_key())
+            rows.insert(position, entry)
+            keys.insert(position, entry.sort_key())
+            index[entry.key] = entry
+            changed = True
+            if len(rows) > self.capacity:
+                del index[rows[0].key], rows[0], keys[0]
+        if not changed:
+            return 0
+        self._buffer = (rows, keys)
+        self._index = index
+        return added
+
+    def newest(self, limit: int) -> list[LiveEntry]:
+        return self._buffer[0][-limit:][::-1] if limit > 0 else []
+
+    def iter_before(self, cursor: tuple[int, str] | None = None) -> Iterator[LiveEntry]:
+        # Newest first, strictly older than `cursor` when given.
+        entries, keys = self._buffer
+        end = len(entries) if cursor is None else bisect.bisect_left(keys, cursor)
+        return (entries[position] for position in range(end - 1, -1, -1))
+
+    def rows(self) -> list[list[Any]]:
+        return [[entry.ts, entry.key, entry.item] for entry in self._buffer[0]]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[list[Any]], capacity: int) -> SourceTimeline:
+        timeline = cls(capacity)
+        timeline.extend(LiveEntry(int(ts), str(key), item) for ts, key, item in rows)
+        return timeline
+
+
+def merge_timelines(
+    timelines: Iterable[SourceTimeline], limit: int, cursor: str | None = None
+) -> tuple[list[dict[str, Any]], str | None]:
+    # k-way merge over already-sorted timelines: O(limit * log k), no re-sorting of the whole feed.
+    after = decode_cursor(cursor)
+    streams = [timeline.iter_before(after) for timeline in timelines]
+    merged = heapq.merge(*streams, key=LiveEntry.sort_key, reverse=True)
+    page: list[LiveEntry] = []
+    for entry in merged:
+        page.append(entry)
+        if len(page) > limit:
+            break
+    has_more = len(page) > limit
+    page = page[:limit]
+    next_cursor = encode_cursor(page[-1]) if has_more and page else None
+    return [entry.item for entry in page], next_cursor
+
+
+def encode_cursor(entry: LiveEntry) -> str:
+    return f"{entry.ts}:{entry.key}"
+
+
+def decode_cursor(cursor: str | None) -> tuple[int, str] | None:
+    if not cursor:
+        return None
+    ts, _, key = cursor.partition(":")
+    try:
+        return (int(ts), key)
+    except ValueError:
+        raise ValueError(f"invalid cursor: {cursor}") from None
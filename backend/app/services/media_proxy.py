@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import io
+import ipaddress
+import logging
+import os
+import secrets
+import socket
+import threading
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+import httpx
+
+from app.core.settings import settings
+from app.services.rate_limit import AsyncRateLimitedTransport, rate_limiter
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+THUMB_WIDTHS = (160, 320, 640, 960)
+USER_AGENT = "catchdash/0.1 (+https://github.com/catchdash)"
+_MAX_REDIRECTS = 5
+
+
+class MediaProxyError(Exception):
+    pass
+
+
+# Fetches remote images once, re-encodes them to a bounded thumbnail width and keeps
+# the result in a size-capped on-disk cache. Files are touched on every hit and the
+# least recently used ones are evicted once the cache exceeds `max_bytes`.
+class MediaProxy:
+    def __init__(self, cache_dir: str, max_bytes: int, secret: str, max_source_bytes: int) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._max_bytes = max_bytes
+        self._secret = secret.encode("utf-8")
+        self._max_source_bytes = max_source_bytes
+        self._total_bytes: int | None = None
+        self._size_lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Future[Path]] = {}
+
+    def thumbnail_url(self, url: str | None, width: int = 640) -> str | None:
+        if not url or not settings.media_proxy_enabled:
+            return url
+        if urlsplit(url).scheme not in {"http", "https"}:
+            return url
+        width = _snap_width(width)
+        query = urlencode({"u": url, "w": width, "s": self._sign(url, width)})
+        return f"/api/media?{query}"
+
+    def verify(self, url: str, width: int, signature: str) -> bool:
+        return hmac.compare_digest(self._sign(url, width), signature or "")
+
+    async def get(self, url: str, width: int) -> Path:
+        width = _snap_width(width)
+        key = hashlib.sha256(f"{url}|{width}".encode("utf-8")).hexdigest()
+        target = self._cache_dir / key[:2] / key
+        if target.exists():
+            os.utime(target)
+            return target
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future: asyncio.Future[Path] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            raw = await self._download(url)
+            body = await asyncio.to_thread(_resize, raw, width)
+            await asyncio.to_thread(self._store, target, body)
+            future.set_result(target)
+            return target
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so concurrent waiters (if none) don't log "never retrieved".
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _download(self, url: str) -> bytes:
+        transport = AsyncRateLimitedTransport(rate_limiter)
+        # Redirects are followed by hand so every hop is checked against internal addresses.
+        async with httpx.AsyncClient(
+            timeout=settings.http_timeout_seconds,
+            follow_redirects=False,
+            transport=transport,
+            headers={"User-Agent": USER_AGENT},
+        ) as client:
+            for _ in range(_MAX_REDIRECTS + 1):
+                await _require_public(url)
+                async with client.stream("GET", url) as res:
+                    if res.next_request is not None:
+                        url = str(res.next_request.url)
+                        continue
+                    res.raise_for_status()
+                    content_type = res.headers.get("content-type", "")
+                    if not content_type.startswith("image/"):
+                        raise MediaProxyError(f"not an image: {content_type or 'unknown type'}")
+                    chunks: list[bytes] = []
+                    size = 0
+                    async for chunk in res.aiter_bytes():
+                        size += len(chunk)
+                        if size > self._max_source_bytes:
+                            raise MediaProxyError("image too large")
+                        chunks.append(chunk)
+                    return b"".join(chunks)
+        raise MediaProxyError("too many redirects")
+
+    def _store(self, target: Path, body: bytes) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(target)
+        with self._size_lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(path.stat().st_size for path in self._cache_files())
+            else:
+                self._total_bytes += len(body)
+            if self._total_bytes > self._max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Evict down to 90% so we don't rescan the directory on every new file.
+        budget = int(self._max_bytes * 0.9)
+        rows = []
+        for path in self._cache_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            rows.append((stat.st_mtime, stat.st_size, path))
+        rows.sort()
+        total = sum(size for _, size, _ in rows)
+        for _, size, path in rows:
+            if total <= budget:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except FileNotFoundError:
+                continue
+        self._total_bytes = total
+
+    def _cache_files(self):
+        if not self._cache_dir.exists():
+            return []
+        return [path for path in self._cache_dir.glob("*/*") if path.suffix != ".tmp"]
+
+    def _sign(self, url: str, width: int) -> str:
+        return hmac.new(self._secret, f"{url}|{width}".encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def sniff_image_type(body: bytes) -> str:
+    if body.startswith(b"RIFF") and body[8:12] == b"WEBP":
+        return "image/webp"
+    if body.startswith(b"\x89PNG"):
+        return "image/png"
+    if body.startswith(b"GIF8"):
+        return "image/gif"
+    if body.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    return "application/octet-stream"
+
+
+async def _require_public(url: str) -> None:
+    # The proxy fetches on behalf of anyone holding a signed URL, so it only talks to public
+    # addresses: loopback, private, link-local (cloud metadata) and reserved ranges are refused.
+    parts = urlsplit(url)
+    host = parts.hostname
+    if parts.scheme not in {"http", "https"} or not host:
+        raise MediaProxyError("unsupported media url")
+    try:
+        addresses = [ipaddress.ip_address(host)]
+    except ValueError:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, parts.port or (443 if parts.scheme == "https" else 80), type=socket.SOCK_STREAM
+            )
+        except OSError as exc:
+            raise MediaProxyError(f"cannot resolve {host}") from exc
+        addresses = [ipaddress.ip_address(str(info[4][0]).split("%", 1)[0]) for info in infos]
+    if not addresses or any(not address.is_global or address.is_multicast for address in addresses):
+        raise MediaProxyError(f"refusing non-public media host {host}")
+
+
+def _resize(raw: bytes, width: int) -> bytes:
+    if Image is None:
+        return raw
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            if getattr(img, "is_animated", False):
+                return raw
+            img.draft("RGB", (width, width * 4))
+            img = img.convert("RGBA" if img.mode in {"RGBA", "LA", "P"} else "RGB")
+            img.thumbnail((width, width * 4))
+            out = io.BytesIO()
+            img.save(out, format="WEBP", quality=72, method=4)
+            return out.getvalue()
+    except Exception as exc:
+        logger.info("media resize failed, serving original err=%s", exc)
+        return raw
+
+
+def _snap_width(width: int) -> int:
+    for candidate in THUMB_WIDTHS:
+        if width <= candidate:
+            return candidate
+    return THUMB_WIDTHS[-1]
+
+
+def _proxy_secret() -> str:
+    if settings.media_proxy_secret:
+        return settings.media_proxy_secret
+    # Without a configured secret, every process on this host (API workers and the spawned
+    # parse pool, which signs RSS thumbnails) shares one generated secret next to the media
+    # cache. Processes on other hosts can't see it, so multi-host deployments must set one.
+    path = Path(settings.media_cache_dir) / ".proxy-secret"
+    logger.warning("CATCHDASH_MEDIA_PROXY_SECRET is unset; signing media URLs with a generated secret in %s", path)
+    try:
+        return _shared_secret(path)
+    except OSError as exc:
+        logger.warning("media proxy secret file unusable, media URLs only verify in this process err=%s", exc)
+        return secrets.token_hex(32)
+
+
+def _shared_secret(path: Path) -> str:
+    # Write a candidate aside and hard-link it into place: the link fails if another process got
+    # there first, and readers never see a half-written file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as handle:
+        handle.write(secrets.token_hex(32))
+    try:
+        os.link(tmp, path)
+    except FileExistsError:
+        pass
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path.read_text().strip()
+
+
+media_proxy = MediaProxy(
+    cache_dir=settings.media_cache_dir,
+    max_bytes=settings.media_cache_max_mb * 1024 * 1024,
+    secret=_proxy_secret(),
+    max_source_bytes=settings.media_max_source_mb * 1024 * 1024,
+)
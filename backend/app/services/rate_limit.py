@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from app.core.settings import settings
+
+
+class RateLimited(Exception):
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(f"rate limited by {host}; retry in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+@dataclass
+class HostBucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+# Token bucket per upstream host, shared by every source that talks to it. Callers
+# reserve a token up front and sleep until their slot comes round, so bursts are
+# queued in order; if the wait would exceed `max_wait_seconds` the request is
+# deferred with RateLimited instead and the caller keeps serving cached data.
+class HostRateLimiter:
+    def __init__(self, per_minute: float = 60.0, burst: int = 10, max_wait_seconds: float = 5.0) -> None:
+        self._buckets: dict[str, HostBucket] = {}
+        self._limits: dict[str, dict[str, tuple[float | None, int | None]]] = {}
+        self._lock = threading.Lock()
+        self._default_rate = per_minute / 60.0
+        self._default_burst = float(max(1, burst))
+        self.max_wait_seconds = max_wait_seconds
+
+    def configure(self, host: str, per_minute: float | None = None, burst: int | None = None, owner: str = "") -> None:
+        # Each owner (a source) registers its limits for the host once; the bucket applies the strictest
+        # of them, so sources sharing a host get the same limit whichever of them ran last.
+        limit = (float(per_minute) if per_minute else None, int(burst) if burst else None)
+        with self._lock:
+            limits = self._limits.setdefault(host, {})
+            if limits.get(owner) == limit:
+                return
+            limits[owner] = limit
+            rates = [row[0] for row in limits.values() if row[0]]
+            bursts = [row[1] for row in limits.values() if row[1]]
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            bucket.refill(now)
+            bucket.rate = min(rates) / 60.0 if rates else self._default_rate
+            bucket.capacity = float(max(1, min(bursts))) if bursts else self._default_burst
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+
+    def reserve(self, host: str, max_wait_seconds: float | None = None) -> float:
+        limit = self.max_wait_seconds if max_wait_seconds is None else min(max_wait_seconds, self.max_wait_seconds)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(host, now)
+            bucket.refill(now)
+            wait = max(0.0, bucket.blocked_until - now)
+            if bucket.tokens < 1.0:
+                wait = max(wait, (1.0 - bucket.tokens) / bucket.rate)
+            if wait > limit:
+                raise RateLimited(host, wait)
+            bucket.tokens -= 1.0
+            return wait
+
+    def acquire(self, host: str, max_wait_seconds: float | None = None) -> None:
+        wait = self.reserve(host, max_wait_seconds)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, host: str) -> None:
+        wait = self.reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, host: str, response: httpx.Response) -> float | None:
+        retry_after = _retry_after_seconds(response)
+        if retry_after is None and response.status_code == 429:
+            retry_after = 60.0
+        if retry_after is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(host, now)
+            bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+        return retry_after
+
+    def _bucket(self, host: str, now: float) -> HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = HostBucket(
+                rate=self._default_rate,
+                capacity=self._default_burst,
+                tokens=self._default_burst,
+                updated_at=now,
+            )
+            self._buckets[host] = bucket
+        return bucket
+
+
+# The sync transport blocks a worker thread while it waits (FastAPI's threadpool, for the
+# live endpoints), so it defers after `max_wait_seconds` (default
+# `outbound_sync_max_wait_seconds`) rather than the limiter's longer async budget.
+class RateLimitedTransport(httpx.BaseTransport):
+    def __init__(
+        self,
+        limiter: HostRateLimiter,
+        per_minute: float | None = None,
+        burst: int | None = None,
+        transport: httpx.BaseTransport | None = None,
+        owner: str = "",
+        max_wait_seconds: float | None = None,
+    ) -> None:
+        self._limiter = limiter
+        self._per_minute = per_minute
+        self._burst = burst
+        self._owner = owner
+        self._configured: set[str] = set()
+        self._max_wait = settings.outbound_sync_max_wait_seconds if max_wait_seconds is None else max_wait_seconds
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host not in self._configured:
+            self._configured.add(host)
+            self._limiter.configure(host, self._per_minute, self._burst, owner=self._owner)
+        self._limiter.acquire(host, self._max_wait)
+        response = self._transport.handle_request(request)
+        retry_after = self._limiter.observe(host, response)
+        if response.status_code == 429:
+            response.close()
+            if retry_after is not None and retry_after > min(self._max_wait, self._limiter.max_wait_seconds):
+                raise RateLimited(host, retry_after)
+            self._limiter.acquire(host, self._max_wait)
+            response = self._transport.handle_request(request)
+            retry_after = self._limiter.observe(host, response)
+            if response.status_code == 429:
+                response.close()
+                raise RateLimited(host, retry_after or 60.0)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        limiter: HostRateLimiter,
+        per_minute: float | None = None,
+        burst: int | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        owner: str = "",
+    ) -> None:
+        self._limiter = limiter
+        self._per_minute = per_minute
+        self._burst = burst
+        self._owner = owner
+        self._configured: set[str] = set()
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host not in self._configured:
+            self._configured.add(host)
+            self._limiter.configure(host, self._per_minute, self._burst, owner=self._owner)
+        await self._limiter.acquire_async(host)
+        response = await self._transport.handle_async_request(request)
+        retry_after = self._limiter.observe(host, response)
+        if response.status_code == 429:
+            await response.aclose()
+            if retry_after is not None and retry_after > self._limiter.max_wait_seconds:
+                raise RateLimited(host, retry_after)
+            await self._limiter.acquire_async(host)
+            response = await self._transport.handle_async_request(request)
+            retry_after = self._limiter.observe(host, response)
+            if response.status_code == 429:
+                await response.aclose()
+                raise RateLimited(host, retry_after or 60.0)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    headers = response.headers
+    raw = headers.get("retry-after")
+    if raw:
+        try:
+            return max(0.0, float(raw))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    remaining = headers.get("x-ratelimit-remaining")
+    reset = headers.get("x-ratelimit-reset")
+    if remaining is None or reset is None:
+        return None
+    try:
+        if float(remaining) >= 1.0:
+            return None
+        reset_value = float(reset)
+    except ValueError:
+        return None
+    # Some APIs send seconds-until-reset (Reddit), others an epoch timestamp (GitHub).
+    if reset_value > 1_000_000_000:
+        reset_value -= time.time()
+    return max(0.0, reset_value)
+
+
+rate_limiter = HostRateLimiter(
+    per_minute=settings.outbound_rate_per_minute,
+    burst=settings.outbound_rate_burst,
+    max_wait_seconds=settings.outbound_max_wait_seconds,
+)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import datetime as dt
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.settings import settings
+
+_SEEN_LIMIT = 1000
+
+
+@dataclass
+class SourceCadence:
+    seen: OrderedDict[str, None] = field(default_factory=OrderedDict)
+    gap_seconds: float | None = None
+    newest_at: float | None = None
+    interval_seconds: float = 0.0
+    next_due_at: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "refresh_interval_seconds": round(self.interval_seconds, 1) if self.interval_seconds else None,
+            "next_refresh_at": _iso(self.next_due_at) if self.next_due_at else None,
+            "observed_gap_seconds": round(self.gap_seconds, 1) if self.gap_seconds else None,
+        }
+
+
+# Learns how often each source publishes and schedules its next fetch at half the
+# observed inter-arrival time, clamped to [min_seconds, max_seconds]. Fetches that
+# return nothing new stretch the interval further so quiet feeds back off to max.
+class RefreshScheduler:
+    def __init__(
+        self,
+        min_seconds: float = 30.0,
+        max_seconds: float = 3600.0,
+        smoothing: float = 0.3,
+        backoff_factor: float = 1.5,
+    ) -> None:
+        self._rows: dict[str, SourceCadence] = {}
+        self._lock = threading.Lock()
+        self._min_seconds = min_seconds
+        self._max_seconds = max_seconds
+        self._smoothing = smoothing
+        self._backoff_factor = backoff_factor
+
+    def is_due(self, key: str, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._rows.get(key)
+            return row is None or now >= row.next_due_at
+
+    def observe(
+        self,
+        key: str,
+        items: Iterable[tuple[str, float | None]],
+        min_seconds: float | None = None,
+        max_seconds: float | None = None,
+        now: float | None = None,
+    ) -> int:
+        now = time.time() if now is None else now
+        lo = float(min_seconds or self._min_seconds)
+        hi = max(lo, float(max_seconds or self._max_seconds))
+        with self._lock:
+            first = key not in self._rows
+            row = self._rows.setdefault(key, SourceCadence())
+            fresh: list[float] = []
+            new_count = 0
+            for item_key, published in items:
+                if item_key in row.seen:
+                    continue
+                row.seen[item_key] = None
+                new_count += 1
+                if published:
+                    fresh.append(published)
+            while len(row.seen) > _SEEN_LIMIT:
+                row.seen.popitem(last=False)
+
+            fresh.sort()
+            if first:
+                # Seed the estimate from the spacing of what the feed already lists.
+                gaps = [b - a for a, b in zip(fresh, fresh[1:]) if b > a]
+                if gaps:
+                    row.gap_seconds = statistics.median(gaps)
+            else:
+                prev = row.newest_at
+                for published in fresh:
+                    if prev is not None and published > prev:
+                        self._update_gap(row, published - prev)
+                    prev = published if prev is None else max(prev, published)
+            if fresh:
+                row.newest_at = max(row.newest_at or fresh[-1], fresh[-1])
+
+            target = row.gap_seconds / 2 if row.gap_seconds else lo
+            if first or new_count:
+                interval = target
+            else:
+                interval = max(target, row.interval_seconds * self._backoff_factor)
+            row.interval_seconds = min(hi, max(lo, interval))
+            row.next_due_at = now + row.interval_seconds
+            return new_count
+
+    def snapshot(self, key: str) -> dict[str, Any]:
+        with self._lock:
+            row = self._rows.get(key)
+            return (row or SourceCadence()).as_dict()
+
+    def _update_gap(self, row: SourceCadence, gap: float) -> None:
+        if row.gap_seconds is None:
+            row.gap_seconds = gap
+            return
+        row.gap_seconds = self._smoothing * gap + (1 - self._smoothing) * row.gap_seconds
+
+
+def _iso(ts: float) -> str:
+    return dt.datetime.fromtimestamp(ts, tz=dt.UTC).isoformat()
+
+
+refresh_scheduler = RefreshScheduler(
+    min_seconds=settings.source_min_refresh_seconds,
+    max_seconds=settings.source_max_refresh_seconds,
+)
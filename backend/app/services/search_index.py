@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+_TOKEN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+_TITLE_WEIGHT = 2
+_PREFIX_EXPANSIONS = 40
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+@dataclass
+class SearchDocument:
+    key: str
+    kind: str
+    topic: str
+    sources: frozenset[str]
+    timestamp: float
+    title: str
+    text: str
+    payload: dict[str, Any]
+
+
+@dataclass
+class _Indexed:
+    doc: SearchDocument
+    terms: Counter[str]
+    length: int
+    fingerprint: int
+
+
+@dataclass
+class SearchQuery:
+    text: str
+    kinds: set[str] = field(default_factory=set)
+    topics: set[str] = field(default_factory=set)
+    sources: set[str] = field(default_factory=set)
+    since: float | None = None
+    until: float | None = None
+    sort: str = "relevance"
+    limit: int = 20
+    offset: int = 0
+    prefix: bool = True
+
+
+# In-memory inverted index over topic and live items, ranked with BM25 (title terms count
+# twice). Documents live in groups, one per topic snapshot or live timeline, and each group is
+# replaced wholesale with a version: only added, removed or edited items touch the postings,
+# and a version already indexed is a no-op, so callers can resync cheaply on every query. All
+# terms must match; the last one also matches as a prefix for search-as-you-type.
+class SearchIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._docs: dict[int, _Indexed] = {}
+        self._ids: dict[str, int] = {}
+        self._groups: dict[str, tuple[Any, set[str]]] = {}
+        self._postings: dict[str, dict[int, int]] = {}
+        self._vocabulary: list[str] = []
+        self._total_length = 0
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def version(self, group: str) -> Any | None:
+        with self._lock:
+            row = self._groups.get(group)
+            return row[0] if row else None
+
+    def replace_group(self, group: str, version: Any, docs: Iterable[SearchDocument]) -> None:
+        with self._lock:
+            current = self._groups.get(group)
+            if current and current[0] == version:
+                return
+            keys: set[str] = set()
+            for doc in docs:
+                keys.add(doc.key)
+                self._upsert(doc)
+            for key in (current[1] if current else set()) - keys:
+                self._remove(key)
+            self._groups[group] = (version, keys)
+
+    def search(self, query: SearchQuery) -> tuple[int, list[tuple[float, SearchDocument]]]:
+        tokens = tokenize(query.text)
+        if not tokens:
+            return 0, []
+        with self._lock:
+            # One alternative set per query term; the last is widened to vocabulary prefixes.
+            alternatives = [[term] for term in tokens]
+            if query.prefix:
+                alternatives[-1] = self._expand(tokens[-1])
+            candidates: set[int] | None = None
+            for terms in sorted(alternatives, key=self._posting_size):
+                matched: set[int] = set()
+                for term in terms:
+                    matched.update(self._postings.get(term, ()))
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return 0, []
+            rows = [self._docs[doc_id] for doc_id in candidates or () if self._matches(self._docs[doc_id].doc, query)]
+            idf = self._idf(term for terms in alternatives for term in terms)
+            average = self._total_length / max(1, len(self._docs))
+            scored = [(_bm25(row, alternatives, idf, average), row) for row in rows]
+            if query.sort == "recent":
+                ranked = heapq.nlargest(query.offset + query.limit, scored, key=lambda pair: pair[1].doc.timestamp)
+            else:
+                ranked = heapq.nlargest(
+                    query.offset + query.limit, scored, key=lambda pair: (pair[0], pair[1].doc.timestamp)
+                )
+            return len(rows), [(score, row.doc) for score, row in ranked[query.offset :]]
+
+    def _upsert(self, doc: SearchDocument) -> None:
+        fingerprint = hash((doc.title, doc.text, doc.timestamp, doc.topic, doc.sources))
+        doc_id = self._ids.get(doc.key)
+        if doc_id is not None:
+            indexed = self._docs[doc_id]
+            if indexed.fingerprint == fingerprint:
+                # Unchanged text: just take the new payload (counts, thumbnails, merged sources).
+                indexed.doc = doc
+                return
+            self._remove(doc.key)
+        terms = Counter(tokenize(doc.title) * _TITLE_WEIGHT)
+        terms.update(tokenize(doc.text))
+        doc_id = self._next_id
+        self._next_id += 1
+        self._ids[doc.key] = doc_id
+        length = sum(terms.values())
+        self._docs[doc_id] = _Indexed(doc=doc, terms=terms, length=length, fingerprint=fingerprint)
+        self._total_length += length
+        for term, count in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+            postings[doc_id] = count
+
+    def _remove(self, key: str) -> None:
+        doc_id = self._ids.pop(key, None)
+        if doc_id is None:
+            return
+        indexed = self._docs.pop(doc_id)
+        self._total_length -= indexed.length
+        for term in indexed.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                position = bisect.bisect_left(self._vocabulary, term)
+                if position < len(self._vocabulary) and self._vocabulary[position] == term:
+                    del self._vocabulary[position]
+
+    def _expand(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        out: list[str] = []
+        for term in self._vocabulary[start : start + _PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            out.append(term)
+        return out or [prefix]
+
+    def _posting_size(self, terms: list[str]) -> int:
+        return sum(len(self._postings.get(term, ())) for term in terms)
+
+    def _idf(self, terms: Iterable[str]) -> dict[str, float]:
+        total = len(self._docs)
+        out: dict[str, float] = {}
+        for term in terms:
+            df = len(self._postings.get(term, ()))
+            out[term] = math.log(1 + (total - df + 0.5) / (df + 0.5))
+        return out
+
+    def _matches(self, doc: SearchDocument, query: SearchQuery) -> bool:
+        if query.kinds and doc.kind not in query.kinds:
+            return False
+        if query.topics and doc.topic not in query.topics:
+            return False
+        if query.sources and not (doc.sources & query.sources):
+            return False
+        if query.since is not None and doc.timestamp < query.since:
+            return False
+        if query.until is not None and doc.timestamp > query.until:
+            return False
+        return True
+
+
+def _bm25(row: _Indexed, alternatives: list[list[str]], idf: dict[str, float], average: float) -> float:
+    # Each query term scores its best-matching alternative, so prefix expansions don't stack.
+    norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * row.length / max(1.0, average))
+    score = 0.0
+    for terms in alternatives:
+        best = 0.0
+        for term in terms:
+            tf = row.terms.get(term, 0)
+            if tf:
+                best = max(best, idf[term] * tf * (_BM25_K1 + 1) / (tf + norm))
+        score += best
+    return score
+
+
+def tokenize(text: str) -> list[str]:
+    text = (text or "").casefold()
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return [token for token in _TOKEN.findall(text) if token not in _STOPWORDS and (len(token) > 1 or token.isdigit())]
+
+
+search_index = SearchIndex()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from app.core.settings import settings
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+@dataclass
+class SourceHealth:
+    state: CircuitState = "closed"
+    consecutive_failures: int = 0
+    last_success_at: float | None = None
+    last_failure_at: float | None = None
+    last_error: str | None = None
+    open_until: float = 0.0
+    probe_started_at: float | None = None
+    latencies_ms: deque[float] = field(default_factory=lambda: deque(maxlen=20))
+
+    def as_dict(self) -> dict[str, Any]:
+        latency = sum(self.latencies_ms) / len(self.latencies_ms) if self.latencies_ms else None
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "last_success_at": _iso(self.last_success_at),
+            "last_failure_at": _iso(self.last_failure_at),
+            "last_error": self.last_error,
+            "latency_ms": round(latency, 1) if latency is not None else None,
+            "retry_at": _iso(self.open_until) if self.state == "open" else None,
+        }
+
+
+# Consecutive failures open the circuit; the backoff doubles per further failure.
+# When it expires one half-open probe is let through to decide whether to close.
+class SourceHealthRegistry:
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_backoff_seconds: float = 30.0,
+        max_backoff_seconds: float = 900.0,
+    ) -> None:
+        self._rows: dict[str, SourceHealth] = {}
+        self._lock = threading.Lock()
+        self._failure_threshold = max(1, failure_threshold)
+        self._base_backoff = max(1.0, base_backoff_seconds)
+        self._max_backoff = max(self._base_backoff, max_backoff_seconds)
+
+    def allow(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            row = self._rows.setdefault(key, SourceHealth())
+            if row.state == "closed":
+                return True
+            if row.state == "open":
+                if now < row.open_until:
+                    return False
+                row.state = "half_open"
+                row.probe_started_at = None
+            # Only one probe at a time; a probe that never reported back (e.g. a
+            # cancelled request) is forgotten after one base backoff period.
+            if row.probe_started_at is not None and now - row.probe_started_at < self._base_backoff:
+                return False
+            row.probe_started_at = now
+            return True
+
+    def record_success(self, key: str, latency_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            row = self._rows.setdefault(key, SourceHealth())
+            row.state = "closed"
+            row.consecutive_failures = 0
+            row.last_success_at = now
+            row.probe_started_at = None
+            row.open_until = 0.0
+            row.latencies_ms.append(latency_seconds * 1000.0)
+
+    def record_failure(self, key: str, error: BaseException | str, latency_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            row = self._rows.setdefault(key, SourceHealth())
+            row.consecutive_failures += 1
+            row.last_failure_at = now
+            row.last_error = _describe(error)
+            row.probe_started_at = None
+            row.latencies_ms.append(latency_seconds * 1000.0)
+            if row.state == "half_open" or row.consecutive_failures >= self._failure_threshold:
+                steps = max(0, row.consecutive_failures - self._failure_threshold)
+                backoff = min(self._max_backoff, self._base_backoff * (2**steps))
+                row.state = "open"
+                row.open_until = now + backoff
+
+    def snapshot(self, key: str) -> dict[str, Any]:
+        with self._lock:
+            row = self._rows.get(key)
+            return (row or SourceHealth()).as_dict()
+
+
+def _describe(error: BaseException | str) -> str:
+    if isinstance(error, str):
+        return error
+    return str(error) or type(error).__name__
+
+
+def _iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return dt.datetime.fromtimestamp(ts, tz=dt.UTC).isoformat()
+
+
+source_health = SourceHealthRegistry(
+    failure_threshold=settings.source_failure_threshold,
+    base_backoff_seconds=settings.source_backoff_base_seconds,
+    max_backoff_seconds=settings.source_backoff_max_seconds,
+)
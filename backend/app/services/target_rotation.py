@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from app.core.state import StateStore, state_store
+
+_ROTATION_NAMESPACE = "live_rotation"
+
+
+# Chooses which of a live source's targets (tags, subreddits, queries, handles) a refresh polls
+# when there are more than its budget. A target's priority is the number of posts it is expected
+# to have published since it was last polled: time since its last poll times its observed post
+# rate (an EWMA), plus a floor share of the mean rate so quiet targets still come round. Targets
+# never polled go first. State lives in the state store, so API processes share one rotation.
+class TargetRotation:
+    def __init__(self, state: StateStore | None = None, smoothing: float = 0.3, floor_share: float = 0.25) -> None:
+        self._state = state or state_store
+        self._smoothing = smoothing
+        self._floor_share = floor_share
+
+    def pick(self, source: str, targets: list[str], count: int, now: float | None = None) -> list[str]:
+        if count >= len(targets):
+            return list(targets)
+        now = time.time() if now is None else now
+        rows: dict[str, dict[str, Any]] = self._state.get(_ROTATION_NAMESPACE, source) or {}
+        rates = [row["rate"] for target in targets if (row := rows.get(target)) and row.get("rate") is not None]
+        mean = sum(rates) / len(rates) if rates else 0.0
+        floor = self._floor_share * mean or 1.0 / 3600
+
+        def priority(target: str) -> float:
+            row = rows.get(target)
+            if not row:
+                return math.inf
+            rate = row.get("rate")
+            return (now - float(row.get("polled_at") or 0)) * ((mean if rate is None else rate) + floor)
+
+        ranked = sorted(range(len(targets)), key=lambda index: (-priority(targets[index]), index))
+        # Config order within the round, so consolidated request groups stay stable.
+        return [targets[index] for index in sorted(ranked[: max(0, count)])]
+
+    def start_round(self, source: str) -> RotationRound:
+        return RotationRound(self, source)
+
+    def record(self, source: str, polled: dict[str, list[float]], now: float | None = None) -> None:
+        now = time.time() if now is None else now
+
+        def apply(current: dict[str, Any] | None) -> dict[str, Any]:
+            rows = dict(current or {})
+            for target, timestamps in polled.items():
+                row = dict(rows.get(target) or {})
+                sample = _rate_sample(row.get("polled_at"), timestamps, now)
+                if sample is not None:
+                    rate = row.get("rate")
+                    row["rate"] = sample if rate is None else rate + self._smoothing * (sample - rate)
+                row["polled_at"] = now
+                rows[target] = row
+            return rows
+
+        if polled:
+            self._state.update(_ROTATION_NAMESPACE, source, apply)
+
+
+# One refresh's view of the rotation: targets polled and the post timestamps each returned are
+# staged, and only recorded once the fetch as a whole succeeds (a failed target stays due).
+class RotationRound:
+    def __init__(self, rotation: TargetRotation, source: str) -> None:
+        self._rotation = rotation
+        self._source = source
+        self._polled: dict[str, list[float]] = {}
+
+    def pick(self, targets: list[str], count: int) -> list[str]:
+        return self._rotation.pick(self._source, targets, count)
+
+    def polled(self, targets: Iterable[str]) -> None:
+        for target in targets:
+            self._polled.setdefault(target, [])
+
+    def seen(self, target: str, timestamp: float | None) -> None:
+        if timestamp:
+            self._polled.setdefault(target, []).append(timestamp)
+
+    def commit(self) -> None:
+        self._rotation.record(self._source, self._polled)
+        self._polled = {}
+
+
+def _rate_sample(polled_at: float | None, timestamps: list[float], now: float) -> float | None:
+    # Posts per second: posts published since the last poll over the time since then, or for a
+    # first poll, the spread of the posts it returned.
+    if polled_at:
+        elapsed = now - float(polled_at)
+        return sum(1 for ts in timestamps if ts > float(polled_at)) / elapsed if elapsed > 0 else None
+    if len(timestamps) < 2:
+        return None
+    span = max(timestamps) - min(timestamps)
+    return (len(timestamps) - 1) / span if span > 0 else None
+
+
+target_rotation = TargetRotation()
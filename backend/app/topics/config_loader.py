@@ -1,17 +1,33 @@
 from __future__ import annotations
 
+import copy
+import threading
 from pathlib import Path
 
 import yaml
 
 from app.domain.models import TopicConfig
 
+# Parsed YAML keyed by path and (mtime, size): every request reads the config, but edits
+# still apply without a restart. Callers get a deep copy they are free to mutate.
+_parsed: dict[str, tuple[tuple[int, int], dict]] = {}
+_parsed_lock = threading.Lock()
+
 
 def load_raw_config(path: str) -> dict:
     cfg_path = Path(path)
-    if not cfg_path.exists():
+    try:
+        stat = cfg_path.stat()
+    except OSError:
         return {}
-    return yaml.safe_load(cfg_path.read_text(encoding="utf-8")) or {}
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _parsed_lock:
+        cached = _parsed.get(path)
+    if cached is None or cached[0] != version:
+        cached = (version, yaml.safe_load(cfg_path.read_text(encoding="utf-8")) or {})
+        with _parsed_lock:
+            _parsed[path] = cached
+    return copy.deepcopy(cached[1])
 
 
 def load_topics(path: str) -> list[TopicConfig]:
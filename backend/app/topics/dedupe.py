@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.domain.models import ContentItem, ItemSource
+
+_TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "cmpid",
+    "ncid",
+    "ocid",
+    "smid",
+    "_hsenc",
+    "_hsmi",
+}
+_TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+# Link wrappers that carry the real destination in a query parameter: host -> (path, params).
+_REDIRECTS: dict[str, tuple[str | None, tuple[str, ...]]] = {
+    "google.com": ("/url", ("url", "q")),
+    "www.google.com": ("/url", ("url", "q")),
+    "l.facebook.com": ("/l.php", ("u",)),
+    "lm.facebook.com": ("/l.php", ("u",)),
+    "www.youtube.com": ("/redirect", ("q",)),
+    "out.reddit.com": (None, ("url",)),
+}
+_ARXIV_HOSTS = {"arxiv.org", "export.arxiv.org"}
+_ARXIV_PATH = re.compile(
+    r"^/(?:abs|pdf|html)/(?P<id>[a-z\-]+(?:\.[A-Z]{2})?/\d{7}|\d{4}\.\d{4,5})(?:v\d+)?(?:\.pdf)?/?$"
+)
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were will with".split()
+)
+
+_SIMHASH_BITS = 64
+_MAX_DISTANCE = 6
+# Seven bands (six of 9 bits, one of 10): by pigeonhole, two fingerprints within
+# _MAX_DISTANCE bits of each other are identical in at least one band.
+_BANDS = tuple((shift, 10 if shift == 54 else 9) for shift in range(0, 63, 9))
+_MIN_TOKENS = 6
+_MAX_SUMMARY_TOKENS = 120
+# Per-bit weight sums are accumulated in 16-bit lanes of one big int (see _spread_hash).
+_LANE_BITS = 16
+_BYTE_LANES = [sum(1 << (bit * _LANE_BITS) for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def canonicalize_url(url: str) -> str:
+    raw = (url or "").strip()
+    for _ in range(3):
+        unwrapped = _unwrap_redirect(raw)
+        if unwrapped == raw:
+            break
+        raw = unwrapped
+
+    parts = urlsplit(raw)
+    if parts.scheme not in {"http", "https"}:
+        return raw
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in {80, 443}:
+        host = f"{host}:{parts.port}"
+
+    if host in _ARXIV_HOSTS:
+        match = _ARXIV_PATH.match(parts.path)
+        if match:
+            return f"https://arxiv.org/abs/{match.group('id')}"
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith(_TRACKING_PREFIXES)
+    ]
+    query.sort()
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+        for suffix in ("/index.html", "/index.htm", "/index.php"):
+            if path.endswith(suffix):
+                path = path[: -len(suffix)] or "/"
+    # Scheme is folded to https: feeds frequently mix http and https links to the same page.
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def _unwrap_redirect(url: str) -> str:
+    parts = urlsplit(url)
+    rule = _REDIRECTS.get((parts.hostname or "").lower())
+    if rule is None or (rule[0] is not None and parts.path != rule[0]):
+        return url
+    params = dict(parse_qsl(parts.query))
+    for name in rule[1]:
+        target = params.get(name, "")
+        if target.startswith(("http://", "https://")):
+            return target
+    return url
+
+
+def simhash(text: str, title: str = "") -> int | None:
+    weights: dict[str, int] = {}
+    # Title words count double: syndicated copies keep the headline but trim or rewrite the summary.
+    for token in _tokens(title):
+        weights[token] = weights.get(token, 0) + 2
+    for token in _tokens(text)[:_MAX_SUMMARY_TOKENS]:
+        weights[token] = weights.get(token, 0) + 1
+    if len(weights) < _MIN_TOKENS:
+        return None
+
+    total = 0
+    lanes = 0
+    for token, weight in weights.items():
+        lanes += _spread_hash(token) * weight
+        total += weight
+    # A bit is set when the tokens with that bit outweigh those without it: 2 * sum > total.
+    mask = (1 << _LANE_BITS) - 1
+    out = 0
+    for bit in range(_SIMHASH_BITS):
+        if 2 * (lanes >> (bit * _LANE_BITS) & mask) > total:
+            out |= 1 << bit
+    return out
+
+
+@lru_cache(maxsize=65536)
+def _spread_hash(token: str) -> int:
+    # Spread each bit of the token's 64-bit hash into its own lane, so adding spread
+    # hashes sums every bit position in one big-int addition instead of 64 per token.
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    out = 0
+    for index, value in enumerate(reversed(digest)):
+        out |= _BYTE_LANES[value] << (index * 8 * _LANE_BITS)
+    return out
+
+
+def _tokens(text: str) -> list[str]:
+    return [token for token in _TOKEN.findall((text or "").lower()) if token not in _STOPWORDS]
+
+
+# Incremental near-duplicate index. Each item is looked up by canonical URL and by
+# the seven bands of its SimHash, so an insert only compares against the few
+# fingerprints sharing a band instead of every item already in the topic.
+# A near match only merges items from different sources (syndicated copies): within one
+# source, distinct URLs are distinct items (e.g. consecutive release notes).
+class DuplicateIndex:
+    def __init__(self) -> None:
+        self.items: list[ContentItem] = []
+        self._by_url: dict[str, int] = {}
+        self._bands: dict[tuple[int, int], list[int]] = {}
+        self._fingerprints: list[int | None] = []
+        self._source_ids: list[set[str]] = []
+        self._merged: set[int] = set()
+
+    def add(self, item: ContentItem) -> ContentItem:
+        url_key = canonicalize_url(item.url)
+        fingerprint = simhash(item.summary or "", item.title)
+        match = self._by_url.get(url_key)
+        if match is None and fingerprint is not None:
+            match = self._near(fingerprint, item.source_id)
+
+        if match is None:
+            index = len(self.items)
+            self.items.append(item)
+            self._fingerprints.append(fingerprint)
+            self._source_ids.append({item.source_id})
+            self._index(index, url_key, fingerprint)
+            return item
+
+        primary = self.items[match]
+        if match not in self._merged:
+            # Items may be shared with the per-source cache, so merge into a copy.
+            primary = self.items[match] = primary.model_copy(deep=True)
+            self._merged.add(match)
+        _merge(primary, item)
+        self._source_ids[match].add(item.source_id)
+        self._index(match, url_key, None)
+        return primary
+
+    def _near(self, fingerprint: int, source_id: str) -> int | None:
+        seen: set[int] = set()
+        for band in _BANDS:
+            for index in self._bands.get((band[0], _band(fingerprint, band)), ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                if source_id in self._source_ids[index]:
+                    continue
+                other = self._fingerprints[index]
+                if other is not None and (fingerprint ^ other).bit_count() <= _MAX_DISTANCE:
+                    return index
+        return None
+
+    def _index(self, index: int, url_key: str, fingerprint: int | None) -> None:
+        self._by_url.setdefault(url_key, index)
+        if fingerprint is None:
+            return
+        for band in _BANDS:
+            self._bands.setdefault((band[0], _band(fingerprint, band)), []).append(index)
+
+
+def _band(fingerprint: int, band: tuple[int, int]) -> int:
+    shift, width = band
+    return fingerprint >> shift & ((1 << width) - 1)
+
+
+def _merge(primary: ContentItem, duplicate: ContentItem) -> None:
+    if not primary.sources:
+        primary.sources = [ItemSource(source_id=primary.source_id, source_name=primary.source_name, url=primary.url)]
+    if all(row.source_id != duplicate.source_id for row in primary.sources):
+        primary.sources.append(
+            ItemSource(source_id=duplicate.source_id, source_name=duplicate.source_name, url=duplicate.url)
+        )
+    if not primary.summary and duplicate.summary:
+        primary.summary = duplicate.summary
+    if not primary.image_url and duplicate.image_url:
+        primary.image_url = duplicate.image_url
+    if primary.published_at is None:
+        primary.published_at = duplicate.published_at
+
+
+def collapse_duplicates(items: list[ContentItem]) -> list[ContentItem]:
+    index = DuplicateIndex()
+    for item in items:
+        index.add(item)
+    return index.items
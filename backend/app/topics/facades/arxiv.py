@@ -6,7 +6,9 @@ from datetime import datetime
 
 import httpx
 
+from app.core.timing import span
 from app.domain.models import ContentItem, SourceConfig
+from app.services.rate_limit import AsyncRateLimitedTransport, rate_limiter
 from app.topics.facades.rss import RSSFacade
 
 
@@ -36,12 +38,20 @@ class ArxivFacade(RSSFacade):
             "&sortBy=submittedDate&sortOrder=descending"
         )
 
-        async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
-            res = await client.get(query_url)
+        transport = AsyncRateLimitedTransport(
+            rate_limiter,
+            source.rate_limit_per_minute,
+            source.rate_limit_burst,
+            owner=f"topic:{source.adapter}:{source.url}",
+        )
+        async with httpx.AsyncClient(timeout=20, follow_redirects=True, transport=transport) as client:
+            with span("upstream"):
+                res = await client.get(query_url)
             res.raise_for_status()
             xml_text = res.text
 
-        root = ET.fromstring(xml_text)
+        with span("feed_parse"):
+            root = ET.fromstring(xml_text)
         ns = {"atom": "http://www.w3.org/2005/Atom"}
         out: list[ContentItem] = []
         for entry in root.findall("atom:entry", ns):
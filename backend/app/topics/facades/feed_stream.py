@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from typing import Any
+from urllib.parse import urljoin
+
+_CHUNK_BYTES = 64 * 1024
+_MEDIA_NS = "http://search.yahoo.com/mrss/"
+_CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+_FEEDBURNER_NS = "http://rssnamespace.org/feedburner/ext/1.0"
+_ENTRY_TAGS = {"item", "entry"}
+
+
+# Streams RSS 2.0 / RSS 1.0 / Atom entries and stops after `max_items` usable ones.
+# Returns feedparser-shaped entry dicts, or None when the document is not a
+# well-formed feed so the caller can fall back to feedparser.
+def parse_entries_fast(content: bytes, max_items: int, base_url: str = "") -> list[dict[str, Any]] | None:
+    head = content[:4096]
+    if b"<!ENTITY" in head or max_items <= 0:
+        return None
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    out: list[dict[str, Any]] = []
+    depth = 0
+    root_checked = False
+    try:
+        for offset in range(0, len(content), _CHUNK_BYTES):
+            parser.feed(content[offset : offset + _CHUNK_BYTES])
+            for event, elem in parser.read_events():
+                name = _local(elem.tag)
+                if event == "start":
+                    if not root_checked:
+                        if name not in {"rss", "feed", "RDF"}:
+                            return None
+                        root_checked = True
+                    if name in _ENTRY_TAGS:
+                        depth += 1
+                    continue
+                if name not in _ENTRY_TAGS:
+                    continue
+                depth -= 1
+                if depth:
+                    continue
+                entry = _entry_dict(elem, base_url)
+                elem.clear()
+                if entry.get("title") and entry.get("link"):
+                    out.append(entry)
+                    if len(out) >= max_items:
+                        return out
+        parser.close()
+    except ET.ParseError:
+        return None
+    return out or None
+
+
+def _entry_dict(elem: ET.Element, base_url: str) -> dict[str, Any]:
+    entry: dict[str, Any] = {}
+    media_content: list[dict[str, str]] = []
+    media_thumbnail: list[dict[str, str]] = []
+    for child in elem:
+        tag = child.tag
+        name = _local(tag)
+        ns = _namespace(tag)
+        if ns == _MEDIA_NS:
+            url = child.get("url")
+            if name == "content" and url and (child.get("medium") in (None, "image")):
+                media_content.append({"url": url})
+            elif name == "thumbnail" and url:
+                media_thumbnail.append({"url": url})
+            elif name == "group":
+                for media in child:
+                    if _local(media.tag) == "content" and media.get("url"):
+                        media_content.append({"url": media.get("url", "")})
+            continue
+        if ns == _FEEDBURNER_NS and name == "origLink" and _text(child):
+            entry["feedburner_origlink"] = _text(child)
+        elif name == "title":
+            entry.setdefault("title", _text(child))
+        elif name == "link":
+            href = child.get("href")
+            if href is not None:
+                # Atom: prefer rel=alternate (or no rel) over enclosure/related links.
+                if child.get("rel", "alternate") == "alternate" and "link" not in entry:
+                    entry["link"] = urljoin(base_url, href.strip())
+            elif "link" not in entry and _text(child):
+                entry["link"] = urljoin(base_url, _text(child))
+        elif name == "guid" and child.get("isPermaLink", "true") == "true" and _text(child).startswith("http"):
+            entry.setdefault("guid_link", _text(child))
+        elif name in {"description", "summary"}:
+            entry.setdefault("summary", _text(child))
+        elif name == "content" or (ns == _CONTENT_NS and name == "encoded"):
+            entry.setdefault("content_text", _text(child))
+        elif name in {"pubDate", "published", "issued"} or (name == "date" and ns.endswith("/dc/elements/1.1/")):
+            entry.setdefault("published", _text(child))
+        elif name in {"updated", "modified"}:
+            entry.setdefault("updated", _text(child))
+        elif name == "enclosure" and (child.get("type") or "").startswith("image/") and child.get("url"):
+            media_content.append({"url": child.get("url", "")})
+
+    if "link" not in entry and entry.get("guid_link"):
+        entry["link"] = entry["guid_link"]
+    if "summary" not in entry and entry.get("content_text"):
+        entry["summary"] = entry["content_text"]
+    if media_content:
+        entry["media_content"] = media_content
+    if media_thumbnail:
+        entry["media_thumbnail"] = media_thumbnail
+    return entry
+
+
+def _text(elem: ET.Element) -> str:
+    return "".join(elem.itertext()).strip()
+
+
+def _local(tag: Any) -> str:
+    if not isinstance(tag, str):
+        return ""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _namespace(tag: str) -> str:
+    if tag.startswith("{"):
+        return tag[1:].split("}", 1)[0]
+    return ""
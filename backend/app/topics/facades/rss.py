@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import html
 import hashlib
 import re
@@ -8,39 +7,84 @@ from datetime import datetime
 from email.utils import parsedate_to_datetime
 
 import feedparser
+import httpx
 
+from app.core.timing import span
 from app.domain.models import ContentItem, SourceConfig
+from app.services.media_proxy import media_proxy
+from app.services.rate_limit import AsyncRateLimitedTransport, rate_limiter
 from app.topics.facades.base import SourceFacade
+from app.topics.facades.feed_stream import parse_entries_fast
+from app.topics.parse_pool import run_parse
+
+USER_AGENT = "catchdash/0.1 (+https://github.com/catchdash)"
+_SUMMARY_RAW_CHARS = 20000
 
 
 class RSSFacade(SourceFacade):
     async def fetch_items(self, topic_id: str, source: SourceConfig, max_items: int) -> list[ContentItem]:
-        # feedparser does blocking network I/O; run it in a worker thread.
-        feed = await asyncio.to_thread(feedparser.parse, source.url)
-        out: list[ContentItem] = []
-        for entry in feed.entries[:max_items]:
-            link = entry.get("link")
-            title = _clean_text(entry.get("title") or "")
-            if not link or not title:
-                continue
-            published = _parse_published(entry)
-            image_url = _extract_image(entry)
-            summary_raw = entry.get("summary") or entry.get("description") or ""
-            key = hashlib.sha256(f"{topic_id}|{source.source_id}|{link}".encode("utf-8")).hexdigest()
-            out.append(
-                ContentItem(
-                    item_id=key,
-                    topic_id=topic_id,
-                    source_id=source.source_id,
-                    source_name=source.name,
-                    title=title,
-                    url=str(link),
-                    published_at=published,
-                    summary=_clean_text(summary_raw)[:1000],
-                    image_url=image_url,
-                )
+        transport = AsyncRateLimitedTransport(
+            rate_limiter,
+            source.rate_limit_per_minute,
+            source.rate_limit_burst,
+            owner=f"topic:{source.adapter}:{source.url}",
+        )
+        async with httpx.AsyncClient(
+            timeout=20,
+            follow_redirects=True,
+            transport=transport,
+            headers={"User-Agent": USER_AGENT},
+        ) as client:
+            with span("upstream"):
+                res = await client.get(source.url)
+            res.raise_for_status()
+            content = res.content
+            headers = {
+                "content-type": res.headers.get("content-type", ""),
+                "content-location": str(res.url),
+            }
+        # Parsing is CPU-bound; it runs in the parse process pool, off the event loop and the GIL.
+        with span("feed_parse"):
+            return await run_parse(parse_feed_items, content, headers, topic_id, source, max_items)
+
+
+def parse_feed_items(
+    content: bytes,
+    headers: dict[str, str],
+    topic_id: str,
+    source: SourceConfig,
+    max_items: int,
+) -> list[ContentItem]:
+    # Well-formed feeds take the streaming fast path, which stops reading at max_items.
+    entries = parse_entries_fast(content, max_items, base_url=headers.get("content-location", ""))
+    if entries is None:
+        entries = feedparser.parse(content, response_headers=headers).entries[:max_items]
+    out: list[ContentItem] = []
+    for entry in entries:
+        # FeedBurner feeds link to a click-tracking redirect; origLink is the article itself.
+        link = entry.get("feedburner_origlink") or entry.get("link")
+        title = _clean_text(entry.get("title") or "")
+        if not link or not title:
+            continue
+        published = _parse_published(entry)
+        image_url = media_proxy.thumbnail_url(_extract_image(entry))
+        # Only the first 1000 cleaned chars are kept, so don't regex over full-text bodies.
+        summary_raw = (entry.get("summary") or entry.get("description") or "")[:_SUMMARY_RAW_CHARS]
+        key = hashlib.sha256(f"{topic_id}|{source.source_id}|{link}".encode("utf-8")).hexdigest()
+        out.append(
+            ContentItem(
+                item_id=key,
+                topic_id=topic_id,
+                source_id=source.source_id,
+                source_name=source.name,
+                title=title,
+                url=str(link),
+                published_at=published,
+                summary=_clean_text(summary_raw)[:1000],
+                image_url=image_url,
             )
-        return out
+        )
+    return out
 
 
 def _parse_published(entry: dict) -> datetime | None:
@@ -50,6 +94,11 @@ def _parse_published(entry: dict) -> datetime | None:
             continue
         try:
             return parsedate_to_datetime(val)
+        except Exception:
+            pass
+        # Atom and dc:date use ISO 8601 rather than RFC 822.
+        try:
+            return datetime.fromisoformat(val.strip().replace("Z", "+00:00"))
         except Exception:
             continue
     return None
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from app.core.settings import settings
+
+T = TypeVar("T")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    if settings.feed_parse_workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the API process has an event loop and threads we must not clone.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.feed_parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def warm_parse_pool() -> None:
+    pool = get_parse_pool()
+    if pool is None:
+        return
+    # One task per worker forces every process to start and import the parsers up front.
+    list(pool.map(_warm, range(settings.feed_parse_workers)))
+
+
+def shutdown_parse_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def run_parse(fn: Callable[..., T], *args: Any) -> T:
+    pool = get_parse_pool()
+    if pool is None:
+        return await asyncio.to_thread(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+
+def _warm(_: int) -> bool:
+    import feedparser  # noqa: F401
+
+    import app.topics.facades.rss  # noqa: F401
+
+    return True
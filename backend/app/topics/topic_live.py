@@ -1,69 +1,300 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import logging
+import time
 from datetime import datetime, timedelta, timezone
 
-from app.domain.models import ContentItem, TopicConfig, TopicItemsResponse
+from app.core.state import StateStore, state_store
+from app.core.timing import span
+from app.domain.models import ContentItem, SourceConfig, SourceStatus, TopicConfig, TopicItemsResponse
+from app.services.rate_limit import RateLimited
+from app.services.refresh_schedule import RefreshScheduler, refresh_scheduler
+from app.services.search_index import SearchDocument, SearchIndex, search_index
+from app.services.source_health import SourceHealthRegistry, source_health
+from app.topics.dedupe import collapse_duplicates
 from app.topics.facades import FACADE_REGISTRY
 
+logger = logging.getLogger(__name__)
+
+_TOPICS_NAMESPACE = "topic_items"
+_SOURCE_ITEMS_NAMESPACE = "topic_source_items"
+
 
 class TopicLiveService:
-    def __init__(self, cache_ttl_seconds: int = 30, source_timeout_seconds: float = 20.0) -> None:
-        self._cache: dict[str, tuple[datetime, TopicItemsResponse]] = {}
+    def __init__(
+        self,
+        cache_ttl_seconds: int = 30,
+        source_timeout_seconds: float = 20.0,
+        deadline_seconds: float | None = None,
+        health: SourceHealthRegistry | None = None,
+        scheduler: RefreshScheduler | None = None,
+        state: StateStore | None = None,
+        index: SearchIndex | None = None,
+    ) -> None:
+        # Topic snapshots and per-source items go through the state store so API processes share them.
+        # Source items are keyed by feed (adapter + URL), not by topic, so a feed listed in several
+        # topics is fetched once; each topic re-stamps the shared items with its own ids.
+        self._state = state or state_store
+        self._inflight: dict[str, asyncio.Task[TopicItemsResponse]] = {}
+        self._source_inflight: dict[str, asyncio.Task[list[ContentItem]]] = {}
+        self._background: set[asyncio.Task[None]] = set()
+        self._fetch_limits: dict[str, int] = {}
         self._cache_ttl = timedelta(seconds=cache_ttl_seconds)
         self._source_timeout_seconds = source_timeout_seconds
+        self._deadline_seconds = deadline_seconds
+        self._health = health or source_health
+        self._scheduler = scheduler or refresh_scheduler
+        self._index = index or search_index
 
     async def fetch_topic(self, topic: TopicConfig, force: bool = False) -> TopicItemsResponse:
         now = datetime.now(timezone.utc)
-        cached = self._cache.get(topic.topic_id)
-        if not force and cached and now - cached[0] <= self._cache_ttl:
-            return cached[1]
+        with span("topic_cache"):
+            cached = await asyncio.to_thread(self.peek, topic.topic_id)
+        if not force and cached and now - cached.updated_at <= self._cache_ttl:
+            return cached
+        # Shield so a caller giving up (client disconnect, dashboard budget) doesn't cancel the shared refresh.
+        with span("topic_refresh"):
+            return await asyncio.shield(self._refresh_task(topic, force))
+
+    async def fetch_topics(
+        self, topics: list[TopicConfig], budget_seconds: float
+    ) -> list[tuple[TopicConfig, TopicItemsResponse | None, str]]:
+        tasks: dict[str, asyncio.Future[TopicItemsResponse]] = {
+            topic.topic_id: asyncio.ensure_future(self.fetch_topic(topic)) for topic in topics
+        }
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=max(0.0, budget_seconds))
+
+        out: list[tuple[TopicConfig, TopicItemsResponse | None, str]] = []
+        for topic in topics:
+            task = tasks[topic.topic_id]
+            if task.done() and not task.cancelled() and task.exception() is None:
+                out.append((topic, task.result(), "fresh"))
+                continue
+            if not task.done():
+                # Late topics keep refreshing in the background via the shared in-flight task.
+                task.cancel()
+            snapshot = await asyncio.to_thread(self.peek, topic.topic_id)
+            out.append((topic, snapshot, "stale" if snapshot else "pending"))
+        return out
+
+    def peek(self, topic_id: str) -> TopicItemsResponse | None:
+        return self._state.get(_TOPICS_NAMESPACE, topic_id, decode=TopicItemsResponse.model_validate)
+
+    def sync_search_index(self, topics: list[TopicConfig]) -> None:
+        # Picks up snapshots stored by other processes; a snapshot is only decoded when its version moved.
+        for topic in topics:
+            version = self._state.sequence(f"{_TOPICS_NAMESPACE}:{topic.topic_id}")
+            if version and self._index.version(f"topic:{topic.topic_id}") != version:
+                snapshot = self.peek(topic.topic_id)
+                if snapshot:
+                    self._index_snapshot(snapshot, version)
 
-        tasks: list[asyncio.Task[list[ContentItem]]] = []
+    def _index_snapshot(self, payload: TopicItemsResponse, version: int) -> None:
+        self._index.replace_group(
+            f"topic:{payload.topic_id}",
+            version,
+            (
+                SearchDocument(
+                    key=f"topic:{payload.topic_id}:{item.item_id}",
+                    kind="topic",
+                    topic=payload.topic_id,
+                    sources=frozenset([item.source_id, *(row.source_id for row in item.sources)]),
+                    timestamp=_sort_key(item.published_at),
+                    title=item.title,
+                    text=" ".join(filter(None, [item.summary, item.source_name])),
+                    payload=item.model_dump(mode="json"),
+                )
+                for item in payload.items
+            ),
+        )
+
+    def _refresh_task(self, topic: TopicConfig, force: bool) -> asyncio.Task[TopicItemsResponse]:
+        task = self._inflight.get(topic.topic_id)
+        if task is None:
+            task = asyncio.create_task(self._refresh_topic(topic, force))
+            self._inflight[topic.topic_id] = task
+            task.add_done_callback(lambda done, topic_id=topic.topic_id: self._clear_inflight(topic_id, done))
+        return task
+
+    def _clear_inflight(self, topic_id: str, task: asyncio.Task[TopicItemsResponse]) -> None:
+        if self._inflight.get(topic_id) is task:
+            del self._inflight[topic_id]
+
+    async def _refresh_topic(self, topic: TopicConfig, force: bool) -> TopicItemsResponse:
+        now = datetime.now(timezone.utc)
+        sources: list[SourceConfig] = []
+        fetches: dict[str, asyncio.Task[list[ContentItem]]] = {}
+        stale: set[str] = set()
         for source in topic.sources:
-            if not source.enabled:
+            if not source.enabled or not FACADE_REGISTRY.get(source.adapter):
+                continue
+            sources.append(source)
+            key = _source_key(source)
+            self._fetch_limits[key] = max(self._fetch_limits.get(key, 0), topic.max_items)
+            cached = await asyncio.to_thread(self._state.get, _SOURCE_ITEMS_NAMESPACE, key) is not None
+            # Sources that are not due yet (or whose circuit is open) keep serving their last items.
+            if not force and cached and not self._scheduler.is_due(key):
                 continue
-            facade_type = FACADE_REGISTRY.get(source.adapter)
-            if not facade_type:
+            if not self._health.allow(key):
+                stale.add(source.source_id)
                 continue
-            facade = facade_type()
-            tasks.append(asyncio.create_task(self._fetch_source(facade, topic.topic_id, source, topic.max_items)))
+            fetches[source.source_id] = self._source_task(topic.topic_id, source)
+
+        if fetches:
+            # Answer by the deadline with whatever has landed; late sources serve their last-good
+            # items marked stale and keep fetching in the background.
+            with span("topic_sources"):
+                await asyncio.wait(fetches.values(), timeout=self._deadline_seconds)
+        late: dict[str, asyncio.Task[list[ContentItem]]] = {}
+        by_id = {source.source_id: source for source in sources}
+        for source_id, task in fetches.items():
+            if not task.done():
+                late[source_id] = task
+                stale.add(source_id)
+            elif task.cancelled() or task.exception() is not None:
+                stale.add(source_id)
+                exc = None if task.cancelled() else task.exception()
+                if isinstance(exc, RateLimited):
+                    # A fan-out past the host's burst defers the rest; retry them once the bucket refills.
+                    late[source_id] = asyncio.create_task(
+                        self._retry_deferred(topic.topic_id, by_id[source_id], exc.retry_after)
+                    )
+
+        payload = await asyncio.to_thread(self._assemble, topic, sources, now, stale)
+        if late:
+            finisher = asyncio.create_task(self._finish_late(topic, late, stale))
+            self._background.add(finisher)
+            finisher.add_done_callback(self._background.discard)
+        return payload
+
+    async def _finish_late(
+        self, topic: TopicConfig, late: dict[str, asyncio.Task[list[ContentItem]]], stale: set[str]
+    ) -> None:
+        results = await asyncio.gather(*late.values(), return_exceptions=True)
+        landed = {source_id for source_id, result in zip(late, results) if not isinstance(result, BaseException)}
+        if not landed:
+            return
+        # Republish with the late items so the next poll gets them without waiting out the TTL.
+        sources = [source for source in topic.sources if source.enabled and FACADE_REGISTRY.get(source.adapter)]
+        await asyncio.to_thread(self._assemble, topic, sources, datetime.now(timezone.utc), stale - landed)
 
+    async def _retry_deferred(self, topic_id: str, source: SourceConfig, delay: float) -> list[ContentItem]:
+        # Each round lands at least the requests the bucket can take, so a long fan-out drains in turns.
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                return await self._source_task(topic_id, source)
+            except RateLimited as exc:
+                delay = exc.retry_after
+
+    def _assemble(
+        self, topic: TopicConfig, sources: list[SourceConfig], now: datetime, stale: set[str]
+    ) -> TopicItemsResponse:
+        # Reads and writes the state store (SQLite when shared), so async callers run it in a thread.
         rows: list[ContentItem] = []
-        if tasks:
-            for task in asyncio.as_completed(tasks):
-                try:
-                    rows.extend(await task)
-                except Exception:
-                    continue
+        for source in sources:
+            items = self._stored_items(_source_key(source)) or []
+            rows.extend(_for_topic(item, topic.topic_id, source) for item in items[: topic.max_items])
 
-        deduped = _dedupe_items(rows)
-        deduped.sort(key=lambda x: _sort_key(x.published_at), reverse=True)
+        with span("dedupe"):
+            deduped = collapse_duplicates(rows)
+        with span("sort"):
+            deduped.sort(key=lambda x: _sort_key(x.published_at), reverse=True)
 
         payload = TopicItemsResponse(
             topic_id=topic.topic_id,
             topic_name=topic.name,
             updated_at=now,
             items=deduped[: topic.max_items],
+            sources=[self._source_status(source, source.source_id in stale) for source in sources],
         )
-        self._cache[topic.topic_id] = (now, payload)
+        with span("topic_store"):
+            self._state.set(_TOPICS_NAMESPACE, topic.topic_id, payload)
+            version = self._state.publish(f"{_TOPICS_NAMESPACE}:{topic.topic_id}")
+        with span("search_index"):
+            self._index_snapshot(payload, version)
         return payload
 
-    async def _fetch_source(self, facade, topic_id: str, source, max_items: int) -> list[ContentItem]:
-        async with asyncio.timeout(self._source_timeout_seconds):
-            return await facade.fetch_items(topic_id, source, max_items)
-
-
-def _dedupe_items(items: list[ContentItem]) -> list[ContentItem]:
-    seen: set[str] = set()
-    out: list[ContentItem] = []
-    for item in items:
-        key = f"{item.source_id}:{item.url}"
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(item)
-    return out
+    def _source_task(self, topic_id: str, source: SourceConfig) -> asyncio.Task[list[ContentItem]]:
+        # One fetch per feed at a time, however many topics list it.
+        key = _source_key(source)
+        task = self._source_inflight.get(key)
+        if task is None:
+            facade = FACADE_REGISTRY[source.adapter]()
+            task = asyncio.create_task(self._fetch_source(facade, topic_id, source, self._fetch_limits[key]))
+            self._source_inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._clear_source_inflight(key, done))
+        return task
+
+    def _clear_source_inflight(self, key: str, task: asyncio.Task[list[ContentItem]]) -> None:
+        if self._source_inflight.get(key) is task:
+            del self._source_inflight[key]
+        if not task.cancelled():
+            # Marks the exception retrieved; failures are already logged and recorded in source health.
+            task.exception()
+
+    async def _fetch_source(self, facade, topic_id: str, source: SourceConfig, max_items: int) -> list[ContentItem]:
+        key = _source_key(source)
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self._source_timeout_seconds):
+                with span(f"source.{source.source_id}"):
+                    items = await facade.fetch_items(topic_id, source, max_items)
+        except RateLimited as exc:
+            logger.info("topic source deferred topic=%s source=%s err=%s", topic_id, source.source_id, exc)
+            raise
+        except Exception as exc:
+            self._health.record_failure(key, exc, time.perf_counter() - started)
+            logger.warning("topic source fetch failed topic=%s source=%s err=%r", topic_id, source.source_id, exc)
+            raise
+        self._health.record_success(key, time.perf_counter() - started)
+        self._scheduler.observe(
+            key,
+            ((item.url, _sort_key(item.published_at) or None) for item in items),
+            min_seconds=source.min_refresh_seconds,
+            max_seconds=source.max_refresh_seconds,
+        )
+        await asyncio.to_thread(self._state.set, _SOURCE_ITEMS_NAMESPACE, key, items)
+        return items
+
+    def _stored_items(self, key: str) -> list[ContentItem] | None:
+        return self._state.get(_SOURCE_ITEMS_NAMESPACE, key, decode=_decode_items)
+
+    def _source_status(self, source: SourceConfig, stale: bool = False) -> SourceStatus:
+        key = _source_key(source)
+        return SourceStatus(
+            source_id=source.source_id,
+            name=source.name,
+            stale=stale,
+            **self._health.snapshot(key),
+            **self._scheduler.snapshot(key),
+        )
+
+
+def _decode_items(rows: list[dict]) -> list[ContentItem]:
+    return [ContentItem.model_validate(row) for row in rows]
+
+
+def _source_key(source: SourceConfig) -> str:
+    # Identity of the feed itself, so the cache, health and refresh schedule are shared across topics.
+    return f"topic:{source.adapter}:{source.url}"
+
+
+def _for_topic(item: ContentItem, topic_id: str, source: SourceConfig) -> ContentItem:
+    # Shared source items carry whichever topic fetched them; re-stamp with this topic's ids.
+    if item.topic_id == topic_id and item.source_id == source.source_id:
+        return item
+    return item.model_copy(
+        update={
+            "item_id": hashlib.sha256(f"{topic_id}|{source.source_id}|{item.url}".encode("utf-8")).hexdigest(),
+            "topic_id": topic_id,
+            "source_id": source.source_id,
+            "source_name": source.name,
+        }
+    )
 
 
 def _sort_key(value: datetime | None) -> float:
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from app.domain.models import ContentItem
+from app.topics.dedupe import DuplicateIndex, canonicalize_url, collapse_duplicates, simhash
+
+_NOTES = (
+    "Highlights: this release adds speculative decoding for more model families, improves prefix caching "
+    "throughput on long prompts, fixes a scheduler deadlock under heavy load, updates CUDA kernels for newer GPUs, "
+    "adds tool calling support to the OpenAI compatible server, reduces memory fragmentation with a new block "
+    "allocator, speeds up tokenizer initialization, adds multi-LoRA batching, improves pipeline parallel startup, "
+    "documents quantization recipes and includes many smaller bug fixes from contributors"
+)
+
+
+def _item(item_id: str, source_id: str, title: str, url: str, summary: str = _NOTES) -> ContentItem:
+    return ContentItem(
+        item_id=item_id,
+        topic_id="ai",
+        source_id=source_id,
+        source_name=source_id,
+        title=title,
+        url=url,
+        summary=summary,
+    )
+
+
+def test_canonicalize_url() -> None:
+    assert canonicalize_url("http://www.Example.com/a/?utm_source=x&b=2&a=1#frag") == "https://example.com/a?a=1&b=2"
+    assert canonicalize_url("https://arxiv.org/pdf/2401.01234v2.pdf") == "https://arxiv.org/abs/2401.01234"
+    wrapped = "https://www.google.com/url?q=https://example.com/post%3Futm_medium%3Dx"
+    assert canonicalize_url(wrapped) == "https://example.com/post"
+    assert canonicalize_url("https://example.com/blog/index.html") == "https://example.com/blog"
+    assert canonicalize_url("mailto:someone@example.com") == "mailto:someone@example.com"
+
+
+def test_simhash_needs_enough_tokens() -> None:
+    assert simhash("too short", "") is None
+    # Consecutive releases with shared notes are near-duplicates by fingerprint alone.
+    assert (simhash(_NOTES, "v0.6.2") ^ simhash(_NOTES, "v0.6.3")).bit_count() <= 6
+
+
+def test_same_source_near_duplicates_are_kept() -> None:
+    items = [
+        _item("a", "gh_vllm", "v0.6.2", "https://github.com/vllm-project/vllm/releases/tag/v0.6.2"),
+        _item("b", "gh_vllm", "v0.6.3", "https://github.com/vllm-project/vllm/releases/tag/v0.6.3"),
+    ]
+    assert [item.item_id for item in collapse_duplicates(items)] == ["a", "b"]
+
+
+def test_cross_source_syndication_is_merged() -> None:
+    items = [
+        _item("a", "blog", "vLLM v0.6.2 released", "https://blog.example.com/vllm-062"),
+        _item("b", "aggregator", "vLLM v0.6.2 released", "https://news.example.org/items/991?utm_source=rss"),
+    ]
+    collapsed = collapse_duplicates(items)
+    assert [item.item_id for item in collapsed] == ["a"]
+    assert [row.source_id for row in collapsed[0].sources] == ["blog", "aggregator"]
+    # The input item is left untouched: merges happen on a copy.
+    assert items[0].sources == []
+
+
+def test_cluster_with_source_does_not_absorb_its_other_items() -> None:
+    index = DuplicateIndex()
+    index.add(_item("a", "gh_vllm", "v0.6.2", "https://github.com/vllm-project/vllm/releases/tag/v0.6.2"))
+    index.add(_item("b", "mirror", "v0.6.2", "https://mirror.example.com/vllm/0.6.2"))
+    index.add(_item("c", "gh_vllm", "v0.6.3", "https://github.com/vllm-project/vllm/releases/tag/v0.6.3"))
+    assert [item.item_id for item in index.items] == ["a", "c"]
+
+
+def test_same_source_same_canonical_url_is_merged() -> None:
+    items = [
+        _item("a", "feed", "Post", "https://example.com/post?utm_source=a", summary="first"),
+        _item("b", "feed", "Post again", "http://www.example.com/post/", summary="second"),
+    ]
+    assert [item.item_id for item in collapse_duplicates(items)] == ["a"]
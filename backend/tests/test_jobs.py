@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import jobs
+from app.core.state import MemoryStateStore
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setattr(jobs, "state_store", MemoryStateStore())
+    monkeypatch.setattr(jobs.settings, "job_preempt_after_seconds", 0.0)
+    app = FastAPI()
+    app.include_router(jobs.router)
+    return TestClient(app)
+
+
+def _create(client: TestClient, item_id: str, priority: str = "interactive") -> dict:
+    res = client.post(
+        "/api/jobs", json={"type": "tts_summary", "topic_id": "ai", "item_id": item_id, "priority": priority}
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _claim(client: TestClient, worker_id: str = "w1") -> dict:
+    res = client.post("/api/jobs/claim", json={"worker_id": worker_id})
+    assert res.status_code == 200
+    return res.json()
+
+
+def test_new_tap_demotes_only_queued_interactive_jobs(client: TestClient) -> None:
+    first = _create(client, "a")
+    running = _claim(client)
+    assert running["id"] == first["id"]
+    waiting = _create(client, "b")
+    latest = _create(client, "c")
+
+    assert client.get(f"/api/jobs/{first['id']}").json()["priority"] == "interactive"
+    assert client.get(f"/api/jobs/{waiting['id']}").json()["priority"] == "background"
+    assert client.get(f"/api/jobs/{latest['id']}").json()["priority"] == "interactive"
+
+    # The earlier tap keeps running even though a newer interactive job is waiting.
+    res = client.post(f"/api/jobs/{first['id']}/heartbeat", params={"claim_id": running["claim_id"]})
+    assert res.json() == {"action": "continue"}
+    assert client.get(f"/api/jobs/{first['id']}").json()["status"] == "processing"
+
+
+def test_background_work_is_preempted_for_a_waiting_tap(client: TestClient) -> None:
+    prefetch = _create(client, "a", priority="background")
+    running = _claim(client)
+    assert running["id"] == prefetch["id"]
+    tap = _create(client, "b")
+
+    res = client.post(f"/api/jobs/{prefetch['id']}/heartbeat", params={"claim_id": running["claim_id"]})
+    assert res.json() == {"action": "preempt"}
+    row = client.get(f"/api/jobs/{prefetch['id']}").json()
+    assert (row["status"], row["message"]) == ("queued", "preempted")
+    assert _claim(client, "w2")["id"] == tap["id"]
+
+
+def test_claims_are_exclusive(client: TestClient) -> None:
+    _create(client, "a")
+    _claim(client)
+    assert client.post("/api/jobs/claim", json={"worker_id": "w2"}).status_code == 204
+
+
+def _upload(client: TestClient, job_id: str, claim_id: str):
+    return client.post(
+        f"/api/jobs/{job_id}/audio",
+        files={"file": ("a.mp3", b"ID3-audio", "audio/mpeg")},
+        data={"claim_id": claim_id},
+    )
+
+
+def test_audio_upload_requires_the_current_claim(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setattr(jobs.settings, "audio_dir", str(tmp_path))
+    job = _create(client, "a")
+    running = _claim(client)
+    assert _upload(client, job["id"], "stale-claim").status_code == 409
+    assert client.post(f"/api/jobs/{job['id']}/audio", files={"file": ("a.mp3", b"x", "audio/mpeg")}).status_code == 422
+    assert list(tmp_path.iterdir()) == []
+
+    res = _upload(client, job["id"], running["claim_id"])
+    assert res.status_code == 200
+    assert (tmp_path / f"{job['id']}.mp3").read_bytes() == b"ID3-audio"
+
+
+def test_audio_upload_for_a_cancelled_job_is_rejected(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setattr(jobs.settings, "audio_dir", str(tmp_path))
+    job = _create(client, "a")
+    running = _claim(client)
+    assert client.delete(f"/api/jobs/{job['id']}").status_code == 200
+    assert _upload(client, job["id"], running["claim_id"]).status_code == 409
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import time
+
+import httpx
+
+from app.core.state import MemoryStateStore
+from app.services.live_social import (
+    LiveSocialService,
+    _advance_marks,
+    _algolia_matches,
+    _split_targets,
+    _snowflake_order,
+    _Watermarks,
+)
+from app.services.refresh_schedule import RefreshScheduler
+from app.services.search_index import SearchIndex
+from app.services.source_health import SourceHealthRegistry
+from app.services.target_rotation import TargetRotation
+
+
+def _labels(row: dict) -> list[str]:
+    return row["tags"]
+
+
+def test_split_targets_balances_and_caps() -> None:
+    rows = [{"id": n, "tags": ["AI", "llm"]} for n in range(5)] + [{"id": 9, "tags": ["llm"]}]
+    pairs = _split_targets(rows, ["ai", "llm"], _labels, 2)
+    assert [(target, row["id"]) for target, row in pairs] == [("ai", 0), ("llm", 1), ("ai", 2), ("llm", 3)]
+
+
+def test_split_targets_drops_unmatched_rows_in_groups() -> None:
+    rows = [{"id": 1, "tags": ["ai"]}, {"id": 2, "tags": ["artificialintelligence"]}, {"id": 3, "tags": []}]
+    assert [row["id"] for _, row in _split_targets(rows, ["ai", "llm"], _labels, 10)] == [1]
+    # A single target keeps everything its own request returned.
+    assert [row["id"] for _, row in _split_targets(rows, ["ai"], _labels, 10)] == [1, 2, 3]
+    assert _split_targets(rows, [], _labels, 10) == []
+
+
+def test_algolia_partial_word_matches_are_dropped() -> None:
+    hits = [
+        {"title": "Open source inference server"},
+        {"title": "Local LLM inference on laptops"},
+        {"title": "Open letter on AI"},
+    ]
+    group = ["open source", "llm"]
+    pairs = _split_targets(hits, group, lambda row: _algolia_matches(row, group), 10)
+    assert [(target, row["title"]) for target, row in pairs] == [
+        ("open source", "Open source inference server"),
+        ("llm", "Local LLM inference on laptops"),
+    ]
+
+
+def _marks() -> _Watermarks:
+    return _Watermarks(MemoryStateStore(), "mastodon")
+
+
+def _advance(marks: _Watermarks, group: list[str], since: list, rows: list[dict], full: bool) -> None:
+    _advance_marks(marks, "tag:", group, since, rows, _labels, lambda row: row["id"], _snowflake_order, full=full)
+
+
+def test_marks_only_advance_to_rows_carrying_the_target() -> None:
+    marks = _marks()
+    rows = [{"id": "130", "tags": ["busy"]}, {"id": "120", "tags": ["quiet"]}, {"id": "110", "tags": ["busy"]}]
+    _advance(marks, ["busy", "quiet", "idle"], ["100", "100", "100"], rows, full=False)
+    assert marks._pending == {"tag:busy": "130", "tag:quiet": "120"}
+
+
+def test_full_consolidated_page_caps_marks_at_oldest_row() -> None:
+    marks = _marks()
+    rows = [{"id": "140", "tags": ["busy", "quiet"]}, {"id": "130", "tags": ["busy"]}]
+    _advance(marks, ["busy", "quiet"], ["100", "99"], rows, full=True)
+    assert marks._pending == {"tag:busy": "130", "tag:quiet": "130"}
+
+
+def test_marks_never_move_backwards() -> None:
+    marks = _marks()
+    rows = [{"id": "90", "tags": ["ai"]}]
+    _advance(marks, ["ai"], ["100"], rows, full=True)
+    assert marks._pending == {}
+    _advance(marks, ["ai"], [None], [{"id": "9", "tags": []}], full=True)
+    assert marks._pending == {"tag:ai": "9"}
+
+
+def _status(status_id: int, tag: str) -> dict:
+    return {
+        "id": str(status_id),
+        "created_at": f"2026-10-19T10:{status_id % 60:02d}:00Z",
+        "content": f"<p>Post {status_id} about models and tools in English</p>",
+        "language": "en",
+        "tags": [{"name": tag}],
+        "account": {"acct": "someone"},
+        "url": f"https://mastodon.example/@someone/{status_id}",
+    }
+
+
+def test_mastodon_consolidated_busy_tag_does_not_skip_quiet_tag() -> None:
+    state = MemoryStateStore()
+    service = _service(state)
+    requests: list[httpx.QueryParams] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params)
+        limit = int(request.url.params["limit"])
+        # The busy tag fills the whole page; the quiet tag's only new post is older than all of it.
+        rows = [_status(2000 - n, "busy") for n in range(limit)] + [_status(1500, "quiet")]
+        return httpx.Response(200, json=rows[:limit])
+
+    cfg = {
+        "source_id": "mastodon",
+        "type": "mastodon",
+        "tags": ["busy", "quiet"],
+        "limit_per_tag": 8,
+        "max_tags": 1,
+        "consolidate": True,
+        "instance_base_url": "https://mastodon.example",
+    }
+    marks = _Watermarks(state, "mastodon")
+    marks.advance("tag:busy", "1000")
+    marks.advance("tag:quiet", "1000")
+    marks.commit()
+    rotation = service._rotation.start_round("mastodon")
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        items = service._fetch_mastodon(client, cfg, marks, rotation)
+    marks.commit()
+    assert requests[0]["since_id"] == "1000" and requests[0].get_list("any[]") == ["quiet"]
+    assert len(items) == 8
+    # The page was full, so the quiet tag must not jump past post 1500, which it never received.
+    assert marks.get("tag:busy") == str(2000 - 15)
+    assert marks.get("tag:quiet") == "1000"
+
+
+def _service(state: MemoryStateStore) -> LiveSocialService:
+    return LiveSocialService(
+        health=SourceHealthRegistry(),
+        scheduler=RefreshScheduler(),
+        state=state,
+        index=SearchIndex(),
+        rotation=TargetRotation(state),
+    )
+
+
+def _post(number: int, subreddit: str) -> dict:
+    return {
+        "data": {
+            "id": str(number),
+            "name": f"t3_{number}",
+            "subreddit": subreddit,
+            "created_utc": 1_760_000_000 + number,
+            "title": f"Post {number} in r/{subreddit}",
+            "permalink": f"/r/{subreddit}/comments/{number}/",
+        }
+    }
+
+
+def _reddit_handler(posts: list[dict], requests: list[httpx.URL]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        wanted = request.url.path.split("/")[2].split("+")
+        listing = sorted(
+            (post for post in posts if post["data"]["subreddit"] in wanted),
+            key=lambda post: post["data"]["created_utc"],
+            reverse=True,
+        )
+        before = request.url.params.get("before")
+        if before:
+            # Like Reddit: an anchor missing from this listing yields an empty page.
+            names = [post["data"]["name"] for post in listing]
+            listing = listing[: names.index(before)] if before in names else []
+        return httpx.Response(200, json={"data": {"children": listing}})
+
+    return handler
+
+
+def _fetch_reddit(service: LiveSocialService, cfg: dict, marks: _Watermarks, handler) -> list:
+    rotation = service._rotation.start_round("reddit")
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        items = service._fetch_reddit(client, cfg, marks, rotation)
+    marks.commit()
+    rotation.commit()
+    return items
+
+
+def test_reddit_empty_anchored_page_falls_back_to_full_listing() -> None:
+    state = MemoryStateStore()
+    service = _service(state)
+    posts = [_post(1000 + n, "a") for n in range(3)]
+    requests: list[httpx.URL] = []
+    marks = _Watermarks(state, "reddit")
+    for subreddit in ("a", "b"):
+        # The anchor post was removed upstream, so `before` finds nothing.
+        marks.advance(f"r:{subreddit}", {"before": "t3_999", "full_at": time.time(), "group": "a+b"})
+    marks.commit()
+    cfg = {"source_id": "reddit", "subreddits": ["a", "b"], "limit_per_subreddit": 10, "consolidate": True}
+    items = _fetch_reddit(service, cfg, marks, _reddit_handler(posts, requests))
+    assert [url.params.get("before") for url in requests] == ["t3_999", None]
+    assert len(items) == 3
+    assert marks.get("r:a")["before"] == marks.get("r:b")["before"] == "t3_1002"
+
+
+def test_reddit_items_still_arrive_after_groups_change() -> None:
+    state = MemoryStateStore()
+    service = _service(state)
+    posts = [_post(1000 + 10 * offset + n, subreddit) for offset, subreddit in enumerate("abcd") for n in range(3)]
+    requests: list[httpx.URL] = []
+    marks = _Watermarks(state, "reddit")
+    handler = _reddit_handler(posts, requests)
+    cfg = {
+        "source_id": "reddit",
+        "limit_per_subreddit": 50,
+        "max_subreddits": 2,
+        "consolidate": True,
+        "subreddits": ["a", "b", "c", "d"],
+    }
+    assert len(_fetch_reddit(service, cfg, marks, handler)) == 12
+    assert [url.path for url in requests] == ["/r/a+b/new.json", "/r/c+d/new.json"]
+
+    # New posts land, and a config edit regroups the subreddits: a+c and b+d.
+    posts += [_post(1100, "a"), _post(1101, "c"), _post(1102, "d")]
+    requests.clear()
+    items = _fetch_reddit(service, {**cfg, "subreddits": ["a", "c", "b", "d"]}, marks, handler)
+    assert [url.path for url in requests] == ["/r/a+c/new.json", "/r/b+d/new.json"]
+    assert {"Post 1100 in r/a", "Post 1101 in r/c", "Post 1102 in r/d"} <= {item.title for item in items}
+    assert marks.get("r:a")["group"] == "a+c" and marks.get("r:d")["group"] == "b+d"
+
+    # With the groups stable again, each group asks from its own anchor; the quiet b+d page comes
+    # back empty and is confirmed with a full listing.
+    requests.clear()
+    posts.append(_post(1103, "c"))
+    items = _fetch_reddit(service, {**cfg, "subreddits": ["a", "c", "b", "d"]}, marks, handler)
+    assert [url.params.get("before") for url in requests] == ["t3_1101", "t3_1102", None]
+    assert [item.title for item in items if "r/a" in item.title or "r/c" in item.title] == ["Post 1103 in r/c"]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.live_timeline import LiveEntry, SourceTimeline, decode_cursor, encode_cursor, merge_timelines
+
+
+def _entry(source: str, ts: int, n: int | None = None) -> LiveEntry:
+    key = f"{source}:{ts if n is None else n}"
+    return LiveEntry(ts, key, {"id": key, "ts": ts})
+
+
+def _timeline(source: str, stamps: list[int], capacity: int = 100) -> SourceTimeline:
+    timeline = SourceTimeline(capacity)
+    timeline.extend(_entry(source, ts) for ts in stamps)
+    return timeline
+
+
+def test_extend_dedupes_orders_and_trims() -> None:
+    timeline = SourceTimeline(3)
+    assert timeline.extend([_entry("m", 20), _entry("m", 10)]) == 2
+    assert timeline.extend([_entry("m", 20), _entry("m", 30), _entry("m", 40)]) == 2
+    assert len(timeline) == 3
+    assert [entry.ts for entry in timeline.newest(10)] == [40, 30, 20]
+    assert timeline.newest(0) == []
+    # The oldest entry fell off and is gone from the index too, so it counts as new again.
+    assert timeline.extend([_entry("m", 10)]) == 1
+    assert [entry.ts for entry in timeline.newest(10)] == [40, 30, 20]
+
+
+def test_extend_refreshes_payload_and_moves_edited_timestamp() -> None:
+    timeline = SourceTimeline(10)
+    timeline.extend([_entry("m", 10, n=1), _entry("m", 20, n=2)])
+    assert timeline.extend([LiveEntry(10, "m:1", {"id": "m:1", "likes": 5})]) == 0
+    assert timeline.newest(2)[1].item == {"id": "m:1", "likes": 5}
+    assert timeline.extend([LiveEntry(30, "m:1", {"id": "m:1"})]) == 0
+    assert [entry.key for entry in timeline.newest(10)] == ["m:1", "m:2"]
+    assert len(timeline) == 2
+
+
+def test_readers_keep_their_snapshot_during_extend() -> None:
+    timeline = _timeline("m", [10, 20, 30])
+    reader = timeline.iter_before()
+    assert next(reader).ts == 30
+    timeline.extend([_entry("m", 40), _entry("m", 25)])
+    assert [entry.ts for entry in reader] == [20, 10]
+
+
+def test_iter_before_is_strict() -> None:
+    timeline = _timeline("m", [10, 20, 30])
+    assert [entry.ts for entry in timeline.iter_before((20, "m:20"))] == [10]
+    assert [entry.ts for entry in timeline.iter_before((21, ""))] == [20, 10]
+
+
+def test_merge_pages_through_every_entry_once() -> None:
+    timelines = [_timeline("a", [1, 4, 7, 10]), _timeline("b", [2, 5, 8]), _timeline("c", [3, 6, 9, 10])]
+    seen: list[str] = []
+    cursor = None
+    while True:
+        items, cursor = merge_timelines(timelines, 3, cursor)
+        seen.extend(item["id"] for item in items)
+        if cursor is None:
+            break
+    assert seen == ["c:10", "a:10", "c:9", "b:8", "a:7", "c:6", "b:5", "a:4", "c:3", "b:2", "a:1"]
+
+
+def test_merge_without_more_has_no_cursor() -> None:
+    items, cursor = merge_timelines([_timeline("a", [1, 2])], 2)
+    assert [item["id"] for item in items] == ["a:2", "a:1"]
+    assert cursor is None
+    assert merge_timelines([], 5) == ([], None)
+
+
+def test_cursor_round_trip_and_rows() -> None:
+    entry = _entry("mastodon", 1700000000)
+    assert decode_cursor(encode_cursor(entry)) == (1700000000, "mastodon:1700000000")
+    assert decode_cursor(None) is None
+    with pytest.raises(ValueError):
+        decode_cursor("abc:def")
+    timeline = _timeline("a", [3, 1, 2])
+    restored = SourceTimeline.from_rows(timeline.rows(), 2)
+    assert [entry.ts for entry in restored.newest(5)] == [3, 2]
+
+
+def test_payload_refresh_does_not_touch_entries_readers_hold() -> None:
+    timeline = _timeline("m", [10, 20])
+    held = timeline.newest(1)[0]
+    timeline.extend([LiveEntry(20, "m:20", {"id": "m:20", "likes": 3})])
+    assert held.item == {"id": "m:20", "ts": 20}
+    assert timeline.newest(1)[0].item == {"id": "m:20", "likes": 3}
+
+
+def test_buffer_stays_within_capacity_for_large_batches() -> None:
+    timeline = SourceTimeline(5)
+    assert timeline.extend(_entry("m", ts) for ts in [50, 10, 40, 20, 30, 60, 5, 70]) == 8
+    assert len(timeline) == 5
+    assert [entry.ts for entry in timeline.newest(10)] == [70, 60, 50, 40, 30]
+    assert next(timeline.iter_before((40, "m:40"))).ts == 30
+    assert set(timeline._index) == {f"m:{ts}" for ts in [30, 40, 50, 60, 70]}
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import pytest
+
+from app.services import media_proxy as media_proxy_module
+from app.services.media_proxy import MediaProxy, MediaProxyError, _require_public
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1/a.png",
+        "http://10.1.2.3/a.png",
+        "http://192.168.0.10/a.png",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://[::1]/a.png",
+        "http://[::ffff:127.0.0.1]/a.png",
+        "http://0.0.0.0/a.png",
+        "file:///etc/passwd",
+    ],
+)
+def test_refuses_internal_targets(url: str) -> None:
+    with pytest.raises(MediaProxyError):
+        asyncio.run(_require_public(url))
+
+
+def test_allows_public_literal() -> None:
+    asyncio.run(_require_public("https://93.184.216.34/a.png"))
+
+
+def test_refuses_redirect_to_internal(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    fetched: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetched.append(str(request.url))
+        return httpx.Response(302, headers={"location": "http://169.254.169.254/latest/meta-data/"})
+
+    monkeypatch.setattr(media_proxy_module, "AsyncRateLimitedTransport", lambda limiter: httpx.MockTransport(handler))
+    proxy = MediaProxy(str(tmp_path), 1 << 20, "secret", 1 << 20)
+    with pytest.raises(MediaProxyError):
+        asyncio.run(proxy._download("http://93.184.216.34/a.png"))
+    assert fetched == ["http://93.184.216.34/a.png"]
+
+
+def test_follows_public_redirect(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/a.png":
+            return httpx.Response(301, headers={"location": "/b.png"})
+        return httpx.Response(200, headers={"content-type": "image/png"}, content=b"\x89PNG-body")
+
+    monkeypatch.setattr(media_proxy_module, "AsyncRateLimitedTransport", lambda limiter: httpx.MockTransport(handler))
+    proxy = MediaProxy(str(tmp_path), 1 << 20, "secret", 1 << 20)
+    assert asyncio.run(proxy._download("http://93.184.216.34/a.png")) == b"\x89PNG-body"
+
+
+def test_signatures_depend_on_secret(tmp_path) -> None:
+    first = MediaProxy(str(tmp_path), 1 << 20, "one", 1 << 20)
+    second = MediaProxy(str(tmp_path), 1 << 20, "two", 1 << 20)
+    signature = first._sign("https://example.com/a.png", 640)
+    assert first.verify("https://example.com/a.png", 640, signature)
+    assert not second.verify("https://example.com/a.png", 640, signature)
+    assert not first.verify("https://example.com/b.png", 640, signature)
+
+
+def _sign_in_child(url: str) -> str | None:
+    from app.services.media_proxy import media_proxy
+
+    return media_proxy.thumbnail_url(url)
+
+
+def test_generated_secret_is_shared_with_spawned_workers(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Parse-pool workers are spawned and sign RSS thumbnails; the API process must verify them.
+    monkeypatch.setenv("CATCHDASH_MEDIA_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("CATCHDASH_MEDIA_PROXY_SECRET", "")
+    monkeypatch.setattr(media_proxy_module.settings, "media_cache_dir", str(tmp_path))
+    monkeypatch.setattr(media_proxy_module.settings, "media_proxy_secret", "")
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        minted = pool.submit(_sign_in_child, "https://img.example/a.png").result(timeout=60)
+    query = parse_qs(urlsplit(minted).query)
+    proxy = MediaProxy(str(tmp_path), 1024, media_proxy_module._proxy_secret(), 1024)
+    assert proxy.verify(query["u"][0], int(query["w"][0]), query["s"][0])
+    assert (tmp_path / ".proxy-secret").stat().st_mode & 0o077 == 0
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.services.rate_limit import HostRateLimiter, RateLimited, RateLimitedTransport, _retry_after_seconds
+
+
+def _bucket(limiter: HostRateLimiter, host: str):
+    return limiter._buckets[host]
+
+
+def test_strictest_limit_wins_regardless_of_order() -> None:
+    first = HostRateLimiter(per_minute=60, burst=10)
+    first.configure("api.example", per_minute=30, burst=6, owner="a")
+    first.configure("api.example", per_minute=10, burst=4, owner="b")
+    second = HostRateLimiter(per_minute=60, burst=10)
+    second.configure("api.example", per_minute=10, burst=4, owner="b")
+    second.configure("api.example", per_minute=30, burst=6, owner="a")
+    for limiter in (first, second):
+        assert _bucket(limiter, "api.example").rate == pytest.approx(10 / 60)
+        assert _bucket(limiter, "api.example").capacity == 4
+    # Re-registering the same values (every fetch) leaves the bucket alone.
+    first.configure("api.example", per_minute=30, burst=6, owner="a")
+    assert _bucket(first, "api.example").rate == pytest.approx(10 / 60)
+
+
+def test_owner_update_replaces_its_previous_limit() -> None:
+    limiter = HostRateLimiter(per_minute=60, burst=10)
+    limiter.configure("api.example", per_minute=5, owner="a")
+    limiter.configure("api.example", per_minute=20, owner="a")
+    assert _bucket(limiter, "api.example").rate == pytest.approx(20 / 60)
+    limiter.configure("api.example", owner="a")
+    assert _bucket(limiter, "api.example").rate == pytest.approx(1.0)
+
+
+def test_reserve_defers_past_max_wait() -> None:
+    limiter = HostRateLimiter(per_minute=60, burst=1, max_wait_seconds=5)
+    assert limiter.reserve("api.example") == 0.0
+    assert limiter.reserve("api.example") == pytest.approx(1.0, abs=0.05)
+    with pytest.raises(RateLimited):
+        limiter.reserve("api.example", max_wait_seconds=0.5)
+
+
+def test_sync_transport_caps_wait() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        return httpx.Response(200)
+
+    limiter = HostRateLimiter(per_minute=6, burst=1, max_wait_seconds=30)
+    transport = RateLimitedTransport(limiter, transport=httpx.MockTransport(handler), max_wait_seconds=1.0)
+    with httpx.Client(transport=transport) as client:
+        assert client.get("https://api.example/a").status_code == 200
+        with pytest.raises(RateLimited):
+            client.get("https://api.example/b")
+    assert calls == ["api.example"]
+
+
+def test_retry_after_forms() -> None:
+    assert _retry_after_seconds(httpx.Response(429, headers={"retry-after": "12"})) == 12.0
+    headers = {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "30"}
+    assert _retry_after_seconds(httpx.Response(200, headers=headers)) == 30.0
+    headers = {"x-ratelimit-remaining": "5", "x-ratelimit-reset": "30"}
+    assert _retry_after_seconds(httpx.Response(200, headers=headers)) is None
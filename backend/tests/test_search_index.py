@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from app.services.search_index import SearchDocument, SearchIndex, SearchQuery, tokenize
+
+
+def _doc(
+    key: str, title: str, text: str = "", ts: float = 0.0, kind: str = "topic", topic: str = "ai"
+) -> SearchDocument:
+    return SearchDocument(
+        key=key,
+        kind=kind,
+        topic=topic,
+        sources=frozenset({f"{kind}-source"}),
+        timestamp=ts,
+        title=title,
+        text=text,
+        payload={"key": key},
+    )
+
+
+def _keys(index: SearchIndex, text: str, **options) -> list[str]:
+    return [doc.key for _, doc in index.search(SearchQuery(text=text, **options))[1]]
+
+
+def test_tokenize_folds_case_and_accents_and_drops_stopwords() -> None:
+    assert tokenize("The Café of GPT-4o, a 3 models") == ["cafe", "gpt", "4o", "3", "models"]
+    assert tokenize("") == []
+
+
+def test_all_terms_required_and_last_is_prefix() -> None:
+    index = SearchIndex()
+    index.replace_group(
+        "topic:ai",
+        1,
+        [
+            _doc("a", "Open weights model released", ts=1),
+            _doc("b", "Model distillation guide", ts=2),
+            _doc("c", "Weights and biases", ts=3),
+        ],
+    )
+    assert sorted(_keys(index, "model weig")) == ["a"]
+    assert sorted(_keys(index, "mod")) == ["a", "b"]
+    assert _keys(index, "mod ", prefix=False) == []
+    assert _keys(index, "missing words") == []
+    assert _keys(index, "the of") == []
+
+
+def test_title_matches_outrank_body_matches() -> None:
+    index = SearchIndex()
+    index.replace_group(
+        "g",
+        1,
+        [
+            _doc("body", "Weekly roundup", "notes on inference servers and other things", ts=5),
+            _doc("title", "Inference servers compared", "benchmarks of several stacks", ts=1),
+        ],
+    )
+    assert _keys(index, "inference") == ["title", "body"]
+    assert _keys(index, "inference", sort="recent") == ["body", "title"]
+
+
+def test_filters_and_paging() -> None:
+    index = SearchIndex()
+    index.replace_group("topic:ai", 1, [_doc(f"t{n}", f"llm post {n}", ts=n) for n in range(5)])
+    index.replace_group("live:m", 1, [_doc("l1", "llm toot", ts=10, kind="live", topic="social")])
+    total, rows = index.search(SearchQuery(text="llm", sort="recent", limit=2, offset=1))
+    assert total == 6
+    assert [doc.key for _, doc in rows] == ["t4", "t3"]
+    assert _keys(index, "llm", kinds={"live"}) == ["l1"]
+    assert _keys(index, "llm", sources={"live-source"}) == ["l1"]
+    assert sorted(_keys(index, "llm", topics={"ai"}, since=2, until=3)) == ["t2", "t3"]
+
+
+def test_replace_group_diffs_and_skips_known_versions() -> None:
+    index = SearchIndex()
+    index.replace_group("g", 1, [_doc("a", "alpha release"), _doc("b", "beta release")])
+    assert len(index) == 2
+    index.replace_group("g", 1, [])
+    assert len(index) == 2
+    index.replace_group("g", 2, [_doc("b", "beta release notes"), _doc("c", "gamma release")])
+    assert sorted(_keys(index, "release")) == ["b", "c"]
+    assert _keys(index, "alpha") == []
+    assert _keys(index, "notes") == ["b"]
+    assert index.version("g") == 2 and index.version("other") is None
+    # Removed terms leave the vocabulary, so prefixes no longer expand to them.
+    assert "alpha" not in index._vocabulary
+
+
+def test_unchanged_doc_takes_new_payload() -> None:
+    index = SearchIndex()
+    index.replace_group("g", 1, [_doc("a", "alpha release")])
+    updated = _doc("a", "alpha release")
+    updated.payload = {"key": "a", "likes": 3}
+    index.replace_group("g", 2, [updated])
+    assert index.search(SearchQuery(text="alpha"))[1][0][1].payload == {"key": "a", "likes": 3}
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.core.state import MemoryStateStore, SQLiteStateStore, StateStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path) -> StateStore:
+    if request.param == "memory":
+        return MemoryStateStore()
+    return SQLiteStateStore(str(tmp_path / "state.db"))
+
+
+def test_incomplete_backend_fails_on_construction() -> None:
+    class Partial(StateStore):
+        def get(self, namespace, key, decode=None):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_get_set_delete_and_ttl(store: StateStore) -> None:
+    store.set("ns", "a", {"x": 1})
+    store.set("ns", "b", {"x": 2}, ttl_seconds=0.05)
+    assert store.get("ns", "a") == {"x": 1}
+    assert store.values("ns") == [{"x": 1}, {"x": 2}]
+    time.sleep(0.06)
+    assert store.get("ns", "b") is None
+    assert store.values("ns") == [{"x": 1}]
+    store.delete("ns", "a")
+    assert store.get("ns", "a") is None
+
+
+def test_update_applies_to_a_copy(store: StateStore) -> None:
+    store.set("ns", "a", {"count": 1, "tags": ["x"]})
+
+    def fail(row):
+        row["count"] += 1
+        row["tags"].append("y")
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        store.update("ns", "a", fail)
+    assert store.get("ns", "a") == {"count": 1, "tags": ["x"]}
+
+    def mutate_only(row):
+        row["count"] = 99
+        return None
+
+    assert store.update("ns", "a", mutate_only) is None
+    assert store.get("ns", "a") == {"count": 1, "tags": ["x"]}
+
+    def bump(row):
+        row["count"] += 1
+        return row
+
+    assert store.update("ns", "a", bump) == {"count": 2, "tags": ["x"]}
+    assert store.get("ns", "a") == {"count": 2, "tags": ["x"]}
+    assert store.update("ns", "missing", lambda row: None if row is None else row) is None
+
+
+def test_publish_sequences_and_messages(store: StateStore) -> None:
+    assert store.sequence("jobs") == 0
+    assert [store.publish("jobs", {"n": n}) for n in range(3)] == [1, 2, 3]
+    assert store.sequence("jobs") == 3
+    assert store.messages("jobs", after=1) == [(2, {"n": 1}), (3, {"n": 2})]
+    assert store.messages("jobs", after=0, limit=1) == [(1, {"n": 0})]
+    assert store.messages("other") == []
+
+
+def test_decode_rebuilds_shared_values_and_memory_skips_it(store: StateStore) -> None:
+    stored = {"count": 1}
+    store.set("ns", "a", stored)
+    decoded = store.get("ns", "a", decode=lambda value: ("decoded", value["count"]))
+    if store.shared:
+        assert decoded == ("decoded", 1)
+        assert store.values("ns", decode=lambda value: value["count"]) == [1]
+    else:
+        # Nothing was encoded, so the in-process store returns the object it was given.
+        assert decoded is stored
+        assert store.values("ns", decode=lambda value: value["count"]) == [stored]
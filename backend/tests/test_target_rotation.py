@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.state import MemoryStateStore
+from app.services.live_social import _chunks, _group_size, _rotate
+from app.services.target_rotation import TargetRotation, _rate_sample
+
+TARGETS = ["a", "b", "c", "d", "e"]
+
+
+def test_budget_covering_all_targets_returns_them_all() -> None:
+    rotation = TargetRotation(MemoryStateStore())
+    assert rotation.pick("src", TARGETS, 5) == TARGETS
+    assert rotation.pick("src", TARGETS, 9) == TARGETS
+    assert rotation.pick("src", TARGETS, 0) == []
+
+
+def test_never_polled_targets_go_first_in_config_order() -> None:
+    rotation = TargetRotation(MemoryStateStore())
+    rotation.record("src", {"a": [], "c": []}, now=1000.0)
+    assert rotation.pick("src", TARGETS, 2, now=1010.0) == ["b", "d"]
+
+
+def test_every_target_comes_round() -> None:
+    rotation = TargetRotation(MemoryStateStore())
+    now = 0.0
+    seen: set[str] = set()
+    for _ in range(3):
+        now += 60
+        picked = rotation.pick("src", TARGETS, 2, now=now)
+        rotation.record("src", {target: [] for target in picked}, now=now)
+        seen.update(picked)
+    assert seen == set(TARGETS)
+
+
+def test_busy_targets_are_polled_more_often_but_quiet_ones_still_come_round() -> None:
+    rotation = TargetRotation(MemoryStateStore())
+    # Busy posts every 10 seconds; the others once an hour.
+    now = 10_000.0
+    rotation.record("src", {"busy": [now - 10 * n for n in range(10)]}, now=now)
+    rotation.record("src", {name: [now - 3600, now - 7200] for name in ("q1", "q2", "q3")}, now=now)
+    counts = dict.fromkeys(["busy", "q1", "q2", "q3"], 0)
+    for _ in range(40):
+        now += 60
+        picked = rotation.pick("src", list(counts), 1, now=now)
+        for target in picked:
+            counts[target] += 1
+        posts = {target: [now - 10 * n for n in range(6)] if target == "busy" else [] for target in picked}
+        rotation.record("src", posts, now=now)
+    assert counts["busy"] > max(counts["q1"], counts["q2"], counts["q3"])
+    assert all(counts[name] > 0 for name in ("q1", "q2", "q3"))
+
+
+def test_round_only_records_on_commit() -> None:
+    state = MemoryStateStore()
+    rotation = TargetRotation(state)
+    round_ = rotation.start_round("src")
+    round_.polled(["a", "b"])
+    round_.seen("a", 100.0)
+    round_.seen("a", None)
+    assert state.get("live_rotation", "src") is None
+    round_.commit()
+    rows = state.get("live_rotation", "src")
+    assert set(rows) == {"a", "b"} and rows["a"]["polled_at"] == rows["b"]["polled_at"]
+    # An empty round (a failed fetch) records nothing.
+    rotation.start_round("other").commit()
+    assert state.get("live_rotation", "other") is None
+
+
+def test_rate_sample() -> None:
+    assert _rate_sample(100.0, [90.0, 150.0, 190.0], 200.0) == pytest.approx(2 / 100)
+    assert _rate_sample(200.0, [1.0], 200.0) is None
+    assert _rate_sample(None, [10.0, 20.0, 40.0], 50.0) == pytest.approx(2 / 30)
+    assert _rate_sample(None, [10.0], 50.0) is None
+    assert _rate_sample(None, [10.0, 10.0], 50.0) is None
+
+
+def test_ewma_smooths_rate() -> None:
+    state = MemoryStateStore()
+    rotation = TargetRotation(state, smoothing=0.5)
+    rotation.record("src", {"a": [0.0, 10.0]}, now=10.0)
+    rotation.record("src", {"a": []}, now=20.0)
+    assert state.get("live_rotation", "src")["a"]["rate"] == pytest.approx(0.05)
+
+
+def test_rotate_and_grouping_helpers() -> None:
+    rotation = TargetRotation(MemoryStateStore())
+    rotation.record("src", {"tag:a": [], "tag:b": []}, now=1.0)
+    round_ = rotation.start_round("src")
+    assert _rotate(round_, "tag:", ["a", "b", "c", "d"], 2) == ["c", "d"]
+    assert _group_size(8, 40, True) == 5
+    assert _group_size(80, 40, True) == 1
+    assert _group_size(8, 40, False) == 1
+    assert _chunks(["a", "b", "c"], 2) == [["a", "b"], ["c"]]
+    assert _chunks([], 2) == []
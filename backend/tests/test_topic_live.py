@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.state import MemoryStateStore
+from app.domain.models import ContentItem, SourceConfig, TopicConfig
+from app.services.rate_limit import HostRateLimiter
+from app.services.refresh_schedule import RefreshScheduler
+from app.services.search_index import SearchIndex
+from app.services.source_health import SourceHealthRegistry
+from app.topics import topic_live
+from app.topics.topic_live import TopicLiveService
+
+
+def _item(source: SourceConfig, topic_id: str) -> ContentItem:
+    return ContentItem(
+        item_id=source.source_id,
+        topic_id=topic_id,
+        source_id=source.source_id,
+        source_name=source.name,
+        title=f"Paper from {source.name}",
+        url=f"https://papers.example/{source.source_id}",
+        published_at=datetime(2026, 10, 19, tzinfo=timezone.utc),
+    )
+
+
+def _topic(count: int, adapter: str = "fake") -> TopicConfig:
+    sources = [
+        SourceConfig(source_id=f"s{n}", name=f"Source {n}", adapter=adapter, url=f"https://host.example/{n}")
+        for n in range(count)
+    ]
+    return TopicConfig(topic_id="papers", name="Papers", sources=sources)
+
+
+def _service(**options) -> TopicLiveService:
+    return TopicLiveService(
+        health=SourceHealthRegistry(),
+        scheduler=RefreshScheduler(),
+        state=MemoryStateStore(),
+        index=SearchIndex(),
+        **options,
+    )
+
+
+def _stale(payload) -> set[str]:
+    return {row.source_id for row in payload.sources if row.stale}
+
+
+def test_sources_deferred_past_the_burst_are_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    # One token, refilled every 0.1s; anything queued past 0.25s is deferred.
+    limiter = HostRateLimiter(per_minute=600, burst=1, max_wait_seconds=0.25)
+    fetched: list[str] = []
+
+    class HostFacade:
+        async def fetch_items(self, topic_id: str, source: SourceConfig, max_items: int) -> list[ContentItem]:
+            await limiter.acquire_async("host.example")
+            fetched.append(source.source_id)
+            return [_item(source, topic_id)]
+
+    monkeypatch.setitem(topic_live.FACADE_REGISTRY, "fake", HostFacade)
+    service = _service()
+    topic = _topic(5)
+
+    async def run():
+        first = await service.fetch_topic(topic)
+        await asyncio.gather(*service._background)
+        return first, service.peek(topic.topic_id)
+
+    first, republished = asyncio.run(run())
+    assert _stale(first) == {"s3", "s4"}
+    assert len(first.items) == 3
+    assert sorted(fetched) == ["s0", "s1", "s2", "s3", "s4"]
+    assert _stale(republished) == set()
+    assert len(republished.items) == 5
+
+
+def test_deadline_serves_stale_items_and_republishes_late_source(monkeypatch: pytest.MonkeyPatch) -> None:
+    release = asyncio.Event()
+
+    class SlowFacade:
+        async def fetch_items(self, topic_id: str, source: SourceConfig, max_items: int) -> list[ContentItem]:
+            if source.source_id == "s2":
+                await release.wait()
+                return [_item(source, topic_id).model_copy(update={"title": "Fresh paper"})]
+            return [_item(source, topic_id)]
+
+    monkeypatch.setitem(topic_live.FACADE_REGISTRY, "fake", SlowFacade)
+    service = _service(deadline_seconds=0.05)
+    topic = _topic(3)
+    slow = topic.sources[2]
+    last_good = _item(slow, topic.topic_id).model_copy(update={"title": "Last good paper"})
+    service._state.set(topic_live._SOURCE_ITEMS_NAMESPACE, topic_live._source_key(slow), [last_good])
+
+    async def run():
+        first = await service.fetch_topic(topic)
+        assert len(service._background) == 1
+        release.set()
+        await asyncio.gather(*service._background)
+        return first, service.peek(topic.topic_id)
+
+    first, republished = asyncio.run(run())
+    assert _stale(first) == {"s2"}
+    assert {item.source_id: item.title for item in first.items}["s2"] == "Last good paper"
+    assert len(first.items) == 3
+    assert _stale(republished) == set()
+    assert {item.source_id: item.title for item in republished.items}["s2"] == "Fresh paper"
+    assert republished.updated_at > first.updated_at
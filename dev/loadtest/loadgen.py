@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import yaml
+
+from stub_upstreams import stub_config
+
+# Simulated dashboards for load tests. Each client follows the frontend's request pattern:
+# the /api/dashboard bootstrap (App.tsx), a /api/live/social poll every
+# refresh_interval_seconds (LivePane.tsx, never faster than 5s), an occasional topic switch
+# (topic items, then /api/jobs to hydrate TTS state), and occasional TTS taps that create a
+# job and poll it every 1.2s. Conditional requests reuse ETags like the browser cache does.
+# Clients are added in steps; every step reports throughput, latency percentiles, upstream
+# request amplification (via the stub's counters) and backend RSS.
+
+_BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+_ACTIVE_JOB_STATUSES = {"queued", "processing"}
+
+
+@dataclass
+class StepStats:
+    clients: int
+    started: float = field(default_factory=time.perf_counter)
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    statuses: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def record(self, endpoint: str, status: str, seconds: float) -> None:
+        self.latencies.setdefault(endpoint, []).append(seconds * 1000)
+        counts = self.statuses.setdefault(endpoint, {})
+        counts[status] = counts.get(status, 0) + 1
+
+
+class LoadRun:
+    def __init__(self, args: argparse.Namespace, backend_url: str, stub_url: str | None, backend_pid: int | None):
+        self.args = args
+        self.backend_url = backend_url.rstrip("/")
+        self.stub_url = stub_url.rstrip("/") if stub_url else None
+        self.backend_pid = backend_pid
+        self.step = StepStats(clients=0)
+        self.reports: list[dict] = []
+        self.client = httpx.AsyncClient(
+            base_url=self.backend_url,
+            timeout=args.timeout_seconds,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        )
+
+    async def request(
+        self, endpoint: str, method: str, path: str, etags: dict[str, str] | None = None, **kwargs: Any
+    ) -> httpx.Response | None:
+        headers = {"accept-encoding": "gzip"}
+        if etags is not None and path in etags:
+            headers["if-none-match"] = etags[path]
+        started = time.perf_counter()
+        try:
+            res = await self.client.request(method, path, headers=headers, **kwargs)
+        except httpx.TimeoutException:
+            self.step.record(endpoint, "timeout", time.perf_counter() - started)
+            return None
+        except httpx.HTTPError:
+            self.step.record(endpoint, "error", time.perf_counter() - started)
+            return None
+        self.step.record(endpoint, str(res.status_code), time.perf_counter() - started)
+        if etags is not None and res.headers.get("etag"):
+            etags[path] = res.headers["etag"]
+        return res
+
+    async def dashboard_client(self) -> None:
+        etags: dict[str, str] = {}
+        # New dashboards don't all open in the same millisecond.
+        await asyncio.sleep(random.uniform(0, self.args.join_spread_seconds))
+        res = await self.request("dashboard", "GET", "/api/dashboard")
+        body = res.json() if res is not None and res.status_code == 200 else {}
+        topics = [row["topic_id"] for row in body.get("topics", [])]
+        items = {
+            entry["topic_id"]: [row["item_id"] for row in (entry.get("payload") or {}).get("items", [])]
+            for entry in body.get("items", [])
+        }
+        interval = self.args.live_interval_seconds or (body.get("live") or {}).get("refresh_interval_seconds") or 30
+        current = {"topic": topics[0] if topics else None}
+        await asyncio.gather(
+            self._live_loop(etags, max(5.0, float(interval))),
+            self._topic_loop(etags, topics, items, current),
+            self._tts_loop(items, current),
+        )
+
+    async def _live_loop(self, etags: dict[str, str], interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.request("live_social", "GET", "/api/live/social", etags)
+
+    async def _topic_loop(
+        self, etags: dict[str, str], topics: list[str], items: dict[str, list[str]], current: dict
+    ) -> None:
+        if not topics or self.args.topic_switch_seconds <= 0:
+            return
+        while True:
+            await asyncio.sleep(random.expovariate(1 / self.args.topic_switch_seconds))
+            topic_id = random.choice(topics)
+            current["topic"] = topic_id
+            res = await self.request("topic_items", "GET", f"/api/topics/{topic_id}/items?force=false", etags)
+            if res is not None and res.status_code == 200:
+                items[topic_id] = [row["item_id"] for row in res.json().get("items", [])]
+            await self.request("jobs_list", "GET", "/api/jobs", etags)
+
+    async def _tts_loop(self, items: dict[str, list[str]], current: dict) -> None:
+        if self.args.tts_tap_seconds <= 0:
+            return
+        while True:
+            await asyncio.sleep(random.expovariate(1 / self.args.tts_tap_seconds))
+            topic_id = current["topic"]
+            if not topic_id or not items.get(topic_id):
+                continue
+            payload = {
+                "type": random.choice(["tts_full_page", "tts_summary"]),
+                "topic_id": topic_id,
+                "item_id": random.choice(items[topic_id]),
+                "audio_formats": ["mp3"],
+            }
+            res = await self.request("job_create", "POST", "/api/jobs", json=payload)
+            if res is None or res.status_code != 200:
+                continue
+            job = res.json()
+            deadline = time.monotonic() + self.args.tts_poll_seconds
+            while job.get("status") in _ACTIVE_JOB_STATUSES and time.monotonic() < deadline:
+                await asyncio.sleep(1.2)
+                res = await self.request("job_poll", "GET", f"/api/jobs/{job['id']}")
+                if res is not None and res.status_code == 200:
+                    job = res.json()
+
+    async def fake_worker(self, worker_id: str) -> None:
+        # Stands in for the TTS worker so polled jobs actually finish; no audio is produced.
+        while True:
+            res = await self.request("worker_claim", "POST", "/api/jobs/claim", json={"worker_id": worker_id})
+            if res is None or res.status_code != 200:
+                await asyncio.sleep(1.0)
+                continue
+            job = res.json()
+            for progress in (30, 60):
+                await asyncio.sleep(self.args.job_seconds / 3)
+                update = {"status": "processing", "progress": progress, "claim_id": job.get("claim_id")}
+                await self.request("worker_update", "PUT", f"/api/jobs/{job['id']}", json=update)
+            await asyncio.sleep(self.args.job_seconds / 3)
+            update = {"status": "ready", "progress": 100, "message": "ready", "claim_id": job.get("claim_id")}
+            await self.request("worker_update", "PUT", f"/api/jobs/{job['id']}", json=update)
+
+    async def upstream_counts(self) -> dict[str, int]:
+        if not self.stub_url:
+            return {}
+        try:
+            async with httpx.AsyncClient(timeout=5) as client:
+                return (await client.get(f"{self.stub_url}/__stats")).json().get("by_route", {})
+        except httpx.HTTPError:
+            return {}
+
+    async def run(self) -> None:
+        tasks: list[asyncio.Task] = [
+            asyncio.create_task(self.fake_worker(f"loadgen-worker-{n}")) for n in range(self.args.fake_workers)
+        ]
+        clients: list[asyncio.Task] = []
+        try:
+            for target in self.args.clients:
+                self.step = StepStats(clients=target)
+                upstream_before = await self.upstream_counts()
+                while len(clients) < target:
+                    clients.append(asyncio.create_task(self.dashboard_client()))
+                await asyncio.sleep(self.args.step_seconds)
+                report = self.report(self.step, upstream_before, await self.upstream_counts())
+                self.reports.append(report)
+                print_step(report)
+        finally:
+            for task in clients + tasks:
+                task.cancel()
+            await asyncio.gather(*clients, *tasks, return_exceptions=True)
+            await self.client.aclose()
+
+    def report(self, step: StepStats, before: dict[str, int], after: dict[str, int]) -> dict:
+        elapsed = time.perf_counter() - step.started
+        endpoints = {}
+        client_requests = 0
+        for endpoint, values in sorted(step.latencies.items()):
+            statuses = step.statuses.get(endpoint, {})
+            ok = sum(count for status, count in statuses.items() if status in {"200", "204", "304"})
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "ok_ratio": round(ok / len(values), 4),
+                "not_modified": statuses.get("304", 0),
+                "statuses": statuses,
+                **_percentiles(values),
+            }
+            if not endpoint.startswith("worker_"):
+                client_requests += len(values)
+        upstream = {key: after.get(key, 0) - before.get(key, 0) for key in sorted(set(after) | set(before))}
+        upstream_total = sum(upstream.values())
+        amplification = upstream_total / client_requests if self.stub_url and client_requests else None
+        client_latencies = [
+            value
+            for endpoint, values in step.latencies.items()
+            if not endpoint.startswith("worker_")
+            for value in values
+        ]
+        return {
+            "clients": step.clients,
+            "seconds": round(elapsed, 1),
+            "requests": client_requests,
+            "requests_per_second": round(client_requests / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": _percentiles(client_latencies),
+            "endpoints": endpoints,
+            "upstream_requests": upstream_total if self.stub_url else None,
+            "upstream_by_route": upstream,
+            "upstream_per_request": round(amplification, 4) if amplification is not None else None,
+            "backend_rss_mb": _rss_mb(self.backend_pid),
+        }
+
+
+def print_step(report: dict) -> None:
+    latency = report["latency_ms"]
+    rss = report["backend_rss_mb"]
+    amplification = report["upstream_per_request"]
+    print(
+        f"clients={report['clients']:<5} req/s={report['requests_per_second']:<8} "
+        f"p50={latency['p50']:.0f}ms p90={latency['p90']:.0f}ms p99={latency['p99']:.0f}ms "
+        f"upstream={report['upstream_requests']} upstream/req={amplification} "
+        f"rss={f'{rss:.0f}MB' if rss is not None else 'n/a'}",
+        flush=True,
+    )
+    for endpoint, row in report["endpoints"].items():
+        errors = {status: count for status, count in row["statuses"].items() if status not in {"200", "204", "304"}}
+        print(
+            f"  {endpoint:<14} n={row['requests']:<6} p50={row['p50']:.0f}ms p90={row['p90']:.0f}ms "
+            f"p99={row['p99']:.0f}ms max={row['max']:.0f}ms 304={row['not_modified']}"
+            + (f" errors={errors}" if errors else ""),
+            flush=True,
+        )
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))], 1)
+
+    return {"p50": rank(0.50), "p90": rank(0.90), "p99": rank(0.99), "max": round(ordered[-1], 1)}
+
+
+def _rss_mb(pid: int | None) -> float | None:
+    if not pid:
+        return None
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def _wait_ready(url: str, timeout_seconds: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def _spawn_stack(args: argparse.Namespace, workdir: Path) -> tuple[list[subprocess.Popen], str, str, int]:
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+    backend_url = f"http://127.0.0.1:{args.backend_port}"
+    config_path = workdir / "topics.yaml"
+    config_path.write_text(yaml.safe_dump(stub_config(stub_url), sort_keys=False, allow_unicode=True), encoding="utf-8")
+
+    stub = subprocess.Popen(
+        [
+            sys.executable,
+            str(Path(__file__).with_name("stub_upstreams.py")),
+            "--port",
+            str(args.stub_port),
+            "--latency-ms",
+            str(args.upstream_latency_ms),
+            "--error-rate",
+            str(args.upstream_error_rate),
+        ]
+    )
+    env = {
+        **os.environ,
+        "CATCHDASH_TOPICS_CONFIG_PATH": str(config_path),
+        "CATCHDASH_AUDIO_DIR": str(workdir / "audio"),
+        "CATCHDASH_MEDIA_CACHE_DIR": str(workdir / "media"),
+        # Every stub upstream shares one host, so the per-host buckets would throttle the test.
+        "CATCHDASH_OUTBOUND_RATE_PER_MINUTE": "100000",
+        "CATCHDASH_OUTBOUND_RATE_BURST": "1000",
+    }
+    backend = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(args.backend_port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=_BACKEND_DIR,
+        env=env,
+    )
+    _wait_ready(f"{stub_url}/__stats")
+    _wait_ready(f"{backend_url}/healthz")
+    return [backend, stub], backend_url, stub_url, backend.pid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ramp simulated dashboards against a catchdash backend.")
+    parser.add_argument("--backend-url", help="existing backend; by default a backend and stub upstreams are spawned")
+    parser.add_argument("--stub-url", help="stub upstreams of an existing backend, for amplification counts")
+    parser.add_argument("--backend-pid", type=int, help="pid of an existing backend, for RSS (Linux)")
+    parser.add_argument("--clients", default="5,10,25,50,100", help="comma separated client counts, one per step")
+    parser.add_argument("--step-seconds", type=float, default=60.0)
+    parser.add_argument("--join-spread-seconds", type=float, default=5.0)
+    parser.add_argument("--live-interval-seconds", type=float, default=0.0, help="0 uses refresh_interval_seconds")
+    parser.add_argument("--topic-switch-seconds", type=float, default=45.0, help="mean seconds between topic switches")
+    parser.add_argument("--tts-tap-seconds", type=float, default=180.0, help="mean seconds between TTS taps; 0 off")
+    parser.add_argument("--tts-poll-seconds", type=float, default=60.0, help="give up polling a job after this long")
+    parser.add_argument("--fake-workers", type=int, default=1, help="in-process stand-ins for the TTS worker")
+    parser.add_argument("--job-seconds", type=float, default=6.0)
+    parser.add_argument("--timeout-seconds", type=float, default=30.0)
+    parser.add_argument("--backend-port", type=int, default=8090)
+    parser.add_argument("--stub-port", type=int, default=9100)
+    parser.add_argument("--upstream-latency-ms", type=float, default=150.0)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="also write the step reports to this file")
+    args = parser.parse_args()
+    args.clients = sorted({int(value) for value in args.clients.split(",") if value.strip()})
+
+    processes: list[subprocess.Popen] = []
+    run: LoadRun | None = None
+    with tempfile.TemporaryDirectory(prefix="catchdash-loadtest-") as workdir:
+        try:
+            if args.backend_url:
+                backend_url, stub_url, backend_pid = args.backend_url, args.stub_url, args.backend_pid
+            else:
+                processes, backend_url, stub_url, backend_pid = _spawn_stack(args, Path(workdir))
+            run = LoadRun(args, backend_url, stub_url, backend_pid)
+            asyncio.run(run.run())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for process in processes:
+                process.terminate()
+                process.wait(timeout=10)
+    if args.json and run and run.reports:
+        Path(args.json).write_text(json.dumps(run.reports, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
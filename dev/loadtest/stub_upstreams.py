@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from html import escape
+from typing import Any
+
+import uvicorn
+import yaml
+from fastapi import FastAPI, Request, Response
+
+# Local stand-ins for every upstream the backend talks to (Mastodon, Reddit, HN Algolia,
+# Bluesky, RSS) so load tests never touch the real services. Each feed publishes a new post
+# every few tens of seconds, and incremental parameters (since_id, before, numericFilters,
+# cursors) are honored, so the backend's caches and high-water marks behave as in production.
+
+_START = time.time()
+_BACKLOG = 60
+_MAX_PAGE = 100
+
+app = FastAPI(title="catchdash stub upstreams")
+state: dict[str, Any] = {"latency_ms": 150.0, "jitter_ms": 50.0, "error_rate": 0.0}
+_counts: Counter[str] = Counter()
+_counts_lock = threading.Lock()
+
+
+class StubFeed:
+    def __init__(self, key: str) -> None:
+        digest = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16)
+        self.key = key
+        self.digest = digest
+        self.period = 15 + digest % 90
+        self.started = _START - _BACKLOG * self.period
+
+    def latest(self) -> int:
+        return int((time.time() - self.started) // self.period)
+
+    def created(self, index: int) -> float:
+        return self.started + index * self.period
+
+    def newest(self, limit: int, after: int = -1, before: int | None = None) -> list[int]:
+        top = self.latest() if before is None else min(self.latest(), before - 1)
+        bottom = max(after + 1, top - min(limit, _MAX_PAGE) + 1, 0)
+        return list(range(top, bottom - 1, -1))
+
+    def text(self, index: int) -> str:
+        return f"{self.key} update {index}: notes on inference, evals and model releases"
+
+
+_feeds: dict[str, StubFeed] = {}
+
+
+def feed(key: str) -> StubFeed:
+    if key not in _feeds:
+        _feeds[key] = StubFeed(key)
+    return _feeds[key]
+
+
+@app.middleware("http")
+async def count_and_delay(request: Request, call_next: Any) -> Response:
+    if request.url.path != "/__stats":
+        with _counts_lock:
+            _counts[_route_group(request.url.path)] += 1
+        delay = max(0.0, state["latency_ms"] + random.uniform(-1, 1) * state["jitter_ms"]) / 1000
+        await asyncio.sleep(delay)
+        if state["error_rate"] and random.random() < state["error_rate"]:
+            return Response(status_code=503)
+    return await call_next(request)
+
+
+@app.get("/__stats")
+def stats() -> dict:
+    with _counts_lock:
+        by_route = dict(_counts)
+    return {"requests": sum(by_route.values()), "by_route": by_route}
+
+
+@app.get("/api/v1/timelines/tag/{tag}")
+def mastodon_tag(request: Request, tag: str, limit: int = 20, since_id: str | None = None) -> list[dict]:
+    # Status ids are time-ordered across tags (like Mastodon's snowflakes), so one since_id
+    # works for an `any[]` timeline covering several tags.
+    after = int(since_id) if since_id and since_id.isdigit() else 0
+    rows = []
+    for name in [tag, *request.query_params.getlist("any[]")]:
+        stream = feed(f"mastodon:{name}")
+        for index in stream.newest(limit):
+            status_id = _snowflake(stream, index)
+            if status_id > after:
+                rows.append((status_id, name, stream, index))
+    rows.sort(reverse=True)
+    return [
+        {
+            "id": str(status_id),
+            "created_at": _iso(stream.created(index)),
+            "content": f"<p>{escape(stream.text(index))} #{escape(name)}</p>",
+            "language": "en",
+            "url": f"https://mastodon.example/@stub/{status_id}",
+            "account": {"display_name": f"{name} watcher", "acct": f"{name}@mastodon.example"},
+            "tags": [{"name": name.lower()}],
+            "media_attachments": [],
+        }
+        for status_id, name, stream, index in rows[: min(limit, 40)]
+    ]
+
+
+@app.get("/r/{subreddits}/{sort}.json")
+def reddit_listing(subreddits: str, sort: str, limit: int = 25, before: str | None = None) -> dict:
+    # `before` is the fullname of the newest post already seen: return only newer ones. Ids are
+    # time-ordered across subreddits, so the same works for a multireddit (`r/a+b`).
+    after = int(before.rsplit("_", 1)[-1], 36) if before else 0
+    rows = []
+    for subreddit in subreddits.split("+"):
+        stream = feed(f"reddit:{subreddit}")
+        for index in stream.newest(limit):
+            post_id = _snowflake(stream, index)
+            if post_id > after:
+                rows.append((post_id, subreddit, stream, index))
+    rows.sort(reverse=True)
+    children = [
+        {
+            "kind": "t3",
+            "data": {
+                "id": _base36(post_id),
+                "name": f"t3_{_base36(post_id)}",
+                "subreddit": subreddit,
+                "title": stream.text(index),
+                "selftext": "",
+                "author": f"{subreddit.lower()}_poster",
+                "created_utc": stream.created(index),
+                "permalink": f"/r/{subreddit}/comments/{_base36(post_id)}/stub/",
+            },
+        }
+        for post_id, subreddit, stream, index in rows[: min(limit, 100)]
+    ]
+    return {"kind": "Listing", "data": {"children": children}}
+
+
+@app.get("/api/v1/search_by_date")
+def algolia_search(query: str, hitsPerPage: int = 20, numericFilters: str = "", optionalWords: str = "") -> dict:
+    # With every word optional the search is an OR: one stub feed per word.
+    words = query.split() if optionalWords else [query]
+    since = float(numericFilters.split(">", 1)[1]) if ">" in numericFilters else 0.0
+    rows = []
+    for word in words:
+        stream = feed(f"hn:{word}")
+        rows.extend((int(stream.created(index)), word, stream, index) for index in stream.newest(hitsPerPage))
+    rows.sort(reverse=True)
+    hits = [
+        {
+            "objectID": f"{stream.digest % 10_000}{index:06d}",
+            "title": stream.text(index),
+            "url": f"https://example.com/hn/{word}/{index}",
+            "author": "stub",
+            "created_at_i": created,
+            "story_text": None,
+        }
+        for created, word, stream, index in rows[:hitsPerPage]
+        if created > since
+    ]
+    return {"hits": hits}
+
+
+@app.get("/xrpc/com.atproto.identity.resolveHandle")
+def bluesky_resolve(handle: str) -> dict:
+    return {"did": f"did:plc:{hashlib.sha256(handle.encode('utf-8')).hexdigest()[:24]}"}
+
+
+@app.get("/xrpc/app.bsky.actor.getProfiles")
+def bluesky_profiles(request: Request) -> dict:
+    return {
+        "profiles": [
+            {"handle": handle, **bluesky_resolve(handle)} for handle in request.query_params.getlist("actors")[:25]
+        ]
+    }
+
+
+@app.get("/xrpc/app.bsky.feed.getAuthorFeed")
+def bluesky_author_feed(actor: str, limit: int = 30, cursor: str | None = None) -> dict:
+    stream = feed(f"bluesky:{actor}")
+    rows = stream.newest(limit, before=int(cursor) if cursor else None)
+    return {
+        "feed": [{"post": _bluesky_post(stream, actor, index)} for index in rows],
+        "cursor": str(rows[-1]) if rows and rows[-1] > 0 else None,
+    }
+
+
+@app.get("/xrpc/app.bsky.feed.searchPosts")
+def bluesky_search(q: str, limit: int = 25) -> dict:
+    stream = feed(f"bluesky-search:{q}")
+    return {"posts": [_bluesky_post(stream, "did:plc:search", index) for index in stream.newest(limit)]}
+
+
+@app.get("/rss/{name}.xml")
+def rss_feed(name: str, request: Request) -> Response:
+    stream = feed(f"rss:{name}")
+    base = str(request.base_url).rstrip("/")
+    items = "".join(
+        "<item>"
+        f"<title>{escape(stream.text(index))}</title>"
+        f"<link>{base}/article/{escape(name)}/{index}</link>"
+        f"<guid>{base}/article/{escape(name)}/{index}</guid>"
+        f"<description>{escape(stream.text(index))}. A stub summary paragraph.</description>"
+        f"<pubDate>{format_datetime(datetime.fromtimestamp(stream.created(index), timezone.utc))}</pubDate>"
+        "</item>"
+        for index in stream.newest(40)
+    )
+    body = f'<?xml version="1.0"?><rss version="2.0"><channel><title>{escape(name)}</title>{items}</channel></rss>'
+    return Response(body, media_type="application/rss+xml")
+
+
+@app.get("/article/{name}/{index}")
+def article(name: str, index: int) -> Response:
+    # Something for a real worker to extract when TTS jobs are processed end to end.
+    paragraphs = "".join(
+        f"<p>{escape(feed(f'rss:{name}').text(index))}. Paragraph {n} of the stub article body, long enough "
+        "to survive boilerplate removal and give the summarizer and synthesizer real work.</p>"
+        for n in range(12)
+    )
+    return Response(f"<html><body><article>{paragraphs}</article></body></html>", media_type="text/html")
+
+
+def stub_config(base_url: str) -> dict:
+    # A topics.yaml equivalent to the example one, with every upstream pointed at this stub.
+    base_url = base_url.rstrip("/")
+    return {
+        "live_social": {
+            "refresh_interval_seconds": 30,
+            "interleaved_limit": 24,
+            "timeline_items": 200,
+            "min_refresh_seconds": 15,
+            "max_refresh_seconds": 900,
+            "sources": [
+                {
+                    "source_id": "mastodon",
+                    "type": "mastodon",
+                    "name": "Mastodon",
+                    "icon": "🐘",
+                    "topic": "ai",
+                    "instance_base_url": base_url,
+                    "tags": ["ai", "llm", "machinelearning"],
+                    "max_tags": 3,
+                    "limit_per_tag": 8,
+                    "max_items": 6,
+                },
+                {
+                    "source_id": "bluesky",
+                    "type": "bluesky_api",
+                    "name": "Bluesky",
+                    "icon": "🦋",
+                    "topic": "ai",
+                    "base_url": base_url,
+                    "handles": ["alpha.bsky.social", "beta.bsky.social", "gamma.bsky.social"],
+                    "max_handles": 3,
+                    "limit_per_request": 10,
+                    "max_items": 6,
+                },
+                {
+                    "source_id": "reddit",
+                    "type": "reddit",
+                    "name": "Reddit",
+                    "icon": "👽",
+                    "topic": "ai",
+                    "base_url": base_url,
+                    "subreddits": ["MachineLearning", "LocalLLaMA", "OpenAI"],
+                    "sort": "new",
+                    "max_subreddits": 3,
+                    "limit_per_subreddit": 10,
+                    "max_items": 6,
+                },
+                {
+                    "source_id": "hackernews",
+                    "type": "hackernews",
+                    "name": "Hacker News",
+                    "icon": "🟧",
+                    "topic": "ai",
+                    "base_url": base_url,
+                    "queries": ["llm", "openai", "inference", "agents"],
+                    "max_queries": 4,
+                    "hits_per_query": 10,
+                    "max_items": 6,
+                },
+            ],
+        },
+        "topics": [
+            {
+                "topic_id": topic_id,
+                "name": name,
+                "max_items": 30,
+                "sources": [
+                    {
+                        "source_id": f"{feed_name}_rss",
+                        "name": feed_name,
+                        "adapter": "rss",
+                        "url": f"{base_url}/rss/{feed_name}.xml",
+                    }
+                    for feed_name in feeds
+                ],
+            }
+            for topic_id, name, feeds in (
+                ("news_live", "News", ["wire", "tech"]),
+                ("sports_live", "Sports", ["mets", "league"]),
+                ("papers", "Papers", ["cs_cv", "cs_cl", "cs_lg"]),
+            )
+        ],
+    }
+
+
+def _route_group(path: str) -> str:
+    if path.startswith("/api/v1/timelines"):
+        return "mastodon"
+    if path.startswith("/r/"):
+        return "reddit"
+    if path.startswith("/api/v1/search_by_date"):
+        return "hackernews"
+    if path.startswith("/xrpc/"):
+        return "bluesky"
+    if path.startswith("/rss/"):
+        return "rss"
+    if path.startswith("/article/"):
+        return "article"
+    return "other"
+
+
+def _bluesky_post(stream: StubFeed, actor: str, index: int) -> dict:
+    handle = f"{actor.rsplit(':', 1)[-1][:8]}.bsky.social"
+    created = _iso(stream.created(index))
+    return {
+        "uri": f"at://{actor}/app.bsky.feed.post/{_base36(index)}",
+        "author": {"handle": handle, "displayName": handle},
+        "record": {"text": stream.text(index), "createdAt": created},
+        "indexedAt": created,
+    }
+
+
+def _snowflake(stream: StubFeed, index: int) -> int:
+    return int(stream.created(index) * 1000) * 10_000 + stream.digest % 10_000
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _base36(value: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    out = ""
+    while True:
+        value, rem = divmod(value, 36)
+        out = digits[rem] + out
+        if not value:
+            return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub upstreams for catchdash load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="mean upstream response delay")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--write-config", help="write a topics.yaml pointing at this stub and exit")
+    args = parser.parse_args()
+
+    if args.write_config:
+        with open(args.write_config, "w", encoding="utf-8") as handle:
+            yaml.safe_dump(stub_config(f"http://{args.host}:{args.port}"), handle, sort_keys=False, allow_unicode=True)
+        return
+    state.update(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
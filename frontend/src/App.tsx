@@ -1,7 +1,7 @@
 import { useEffect, useRef, useState } from 'react';
 
-import { enqueueTTS, getJob, getTopicItems, getTopics, listJobs } from './app/api';
-import type { Topic, TopicItem } from './app/types';
+import { cancelJob, enqueueTTS, getDashboard, getJob, getTopicItems, getTopics, listJobs } from './app/api';
+import type { JobRow, LiveSocialResponse, Topic, TopicEntry, TopicItem, TopicItemsPayload } from './app/types';
 import { AudioPane } from './components/AudioPane';
 import { LivePane } from './components/LivePane';
 import { SplitLayout } from './components/SplitLayout';
@@ -28,6 +28,10 @@ export function App() {
   const [playingItemKey, setPlayingItemKey] = useState<string | null>(null);
   const [currentTrackTitle, setCurrentTrackTitle] = useState<string | null>(null);
   const [mobileView, setMobileView] = useState<MobileView>('audio');
+  // undefined while the dashboard bootstrap is in flight, null if it failed.
+  const [initialLive, setInitialLive] = useState<LiveSocialResponse | null | undefined>(undefined);
+  const prefetchedTopicsRef = useRef<Record<string, TopicEntry>>({});
+  const prefetchedJobsRef = useRef<JobRow[] | null>(null);
   const audioRef = useRef<HTMLAudioElement | null>(null);
   const wakeLockRef = useRef<any>(null);
 
@@ -46,15 +50,32 @@ export function App() {
       : null;
 
   useEffect(() => {
-    getTopics()
+    const applyTopics = (rows: Topic[]) => {
+      setTopics(rows);
+      if (rows.length > 0) {
+        setSelectedTopicId(rows[0].topic_id);
+        setSelectedTopicName(rows[0].name);
+      }
+    };
+
+    // One round trip for first paint: topics, items for every topic, live feed and jobs.
+    getDashboard()
       .then((res) => {
-        setTopics(res.topics);
-        if (res.topics.length > 0) {
-          setSelectedTopicId(res.topics[0].topic_id);
-          setSelectedTopicName(res.topics[0].name);
+        for (const entry of res.items) {
+          if (entry.payload) {
+            prefetchedTopicsRef.current[entry.topic_id] = entry;
+          }
         }
+        prefetchedJobsRef.current = res.jobs;
+        setInitialLive(res.live);
+        applyTopics(res.topics);
       })
-      .catch((err) => setError(String(err)));
+      .catch(() => {
+        setInitialLive(null);
+        getTopics()
+          .then((res) => applyTopics(res.topics))
+          .catch((err) => setError(String(err)));
+      });
   }, []);
 
   useEffect(() => {
@@ -64,14 +85,20 @@ export function App() {
     setIsLoadingItems(true);
     setItems([]);
     setTtsModeByItem({});
-    getTopicItems(selectedTopicId)
+    const prefetched = prefetchedTopicsRef.current[selectedTopicId]?.payload;
+    delete prefetchedTopicsRef.current[selectedTopicId];
+    const itemsRequest: Promise<TopicItemsPayload> = prefetched
+      ? Promise.resolve(prefetched)
+      : getTopicItems(selectedTopicId);
+    itemsRequest
       .then(async (res) => {
         setItems(res.items);
         setSelectedTopicName(res.topic_name);
         try {
-          const jobsRes = await listJobs();
+          const jobs = prefetchedJobsRef.current ?? (await listJobs()).jobs;
+          prefetchedJobsRef.current = null;
           const itemIds = new Set(res.items.map((item) => item.item_id));
-          const relevant = jobsRes.jobs.filter(
+          const relevant = jobs.filter(
             (job) => job.topic_id === selectedTopicId && itemIds.has(job.item_id)
           );
           const latestByKey: Record<string, typeof relevant[number]> = {};
@@ -191,16 +218,32 @@ export function App() {
   const onQueueTTS = async (itemId: string, mode: 'tts_full_page' | 'tts_summary') => {
     const job = await enqueueTTS(selectedTopicId, itemId, mode);
     const itemKey = keyFor(selectedTopicId, itemId);
-    setTtsByKey((prev) => ({
-      ...prev,
-      [itemKey]: {
-        jobId: job.id,
-        status: job.status,
-        progress: job.progress,
-        message: job.message,
-        outputRef: null,
-      },
-    }));
+    const row: ItemTTSState = {
+      jobId: job.id,
+      status: job.status,
+      progress: job.progress,
+      message: job.message,
+      outputRef: job.output_ref ?? null,
+    };
+    setTtsByKey((prev) => ({ ...prev, [itemKey]: row }));
+    // Prefetched audio comes back already rendered: play it straight away.
+    const item = items.find((entry) => entry.item_id === itemId);
+    if (row.status === 'ready' && item) {
+      await onPlayPause(item, row);
+    }
+  };
+
+  const onCancelTTS = async (itemId: string, row: ItemTTSState) => {
+    const itemKey = keyFor(selectedTopicId, itemId);
+    try {
+      const job = await cancelJob(row.jobId);
+      setTtsByKey((prev) => ({
+        ...prev,
+        [itemKey]: { ...row, status: job.status, progress: job.progress, message: job.message },
+      }));
+    } catch (err) {
+      setError(String(err));
+    }
   };
 
   const onPlayPause = async (item: TopicItem, row: ItemTTSState) => {
@@ -255,10 +298,11 @@ export function App() {
               onSelectTopic={setSelectedTopicId}
               onSetMode={(itemId, mode) => setTtsModeByItem((prev) => ({ ...prev, [itemId]: mode }))}
               onQueueTTS={onQueueTTS}
+              onCancelTTS={onCancelTTS}
               onPlayPause={onPlayPause}
             />
           }
-          right={<LivePane />}
+          right={<LivePane initialData={initialLive} />}
         />
       </section>
 
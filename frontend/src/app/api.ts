@@ -1,5 +1,12 @@
+import type { DashboardResponse, JobRow, LiveSocialPage, SourceHealth, SourceSchedule, TopicSourceStatus } from './types';
+
 const BASE_URL = import.meta.env.VITE_BACKEND_BASE_URL || 'http://localhost:8080';
 
+// Proxied thumbnails come back as backend-relative `/api/media?...` paths.
+export function mediaUrl(url: string): string {
+  return url.startsWith('/') ? `${BASE_URL.replace(/\/$/, '')}${url}` : url;
+}
+
 async function request<T>(path: string, init?: RequestInit): Promise<T> {
   const res = await fetch(`${BASE_URL}${path}`, {
     ...init,
@@ -32,15 +39,63 @@ export function getTopicItems(topicId: string, force = false) {
       published_at?: string | null;
       image_url?: string | null;
     }>;
+    sources?: TopicSourceStatus[];
   }>(
     `/api/topics/${topicId}/items?force=${force ? 'true' : 'false'}`
   );
 }
 
+export function getDashboard() {
+  return request<DashboardResponse>('/api/dashboard');
+}
+
+// Output formats the worker may produce, with the codec string this browser must support to play each.
+const AUDIO_FORMATS: Array<[string, string]> = [
+  ['webm', 'audio/webm; codecs="opus"'],
+  ['opus', 'audio/ogg; codecs="opus"'],
+  ['aac', 'audio/aac'],
+  ['mp3', 'audio/mpeg'],
+];
+
+let playableFormats: string[] | null = null;
+
+function playableAudioFormats(): string[] {
+  if (playableFormats === null) {
+    const probe = typeof Audio === 'undefined' ? null : new Audio();
+    playableFormats = probe ? AUDIO_FORMATS.filter(([, type]) => probe.canPlayType(type) !== '').map(([name]) => name) : [];
+  }
+  return playableFormats;
+}
+
 export function enqueueTTS(topicId: string, itemId: string, type: 'tts_full_page' | 'tts_summary') {
-  return request<{ id: string; status: string; progress: number; message?: string | null }>('/api/jobs', {
+  return request<{
+    id: string;
+    status: string;
+    progress: number;
+    message?: string | null;
+    output_ref?: string | null;
+  }>('/api/jobs', {
+    method: 'POST',
+    body: JSON.stringify({ type, topic_id: topicId, item_id: itemId, audio_formats: playableAudioFormats() }),
+  });
+}
+
+// One episode for several items of a topic (its newest ones when itemIds is empty).
+export function enqueueDigest(topicId: string, itemIds: string[] = []) {
+  return request<JobRow>('/api/jobs', {
     method: 'POST',
-    body: JSON.stringify({ type, topic_id: topicId, item_id: itemId }),
+    body: JSON.stringify({
+      type: 'tts_digest',
+      topic_id: topicId,
+      item_ids: itemIds,
+      audio_formats: playableAudioFormats(),
+    }),
+  });
+}
+
+export function cancelJob(jobId: string) {
+  return request<{ id: string; status: string; progress: number; message?: string | null }>(`/api/jobs/${jobId}`, {
+    method: 'DELETE',
   });
 }
 
@@ -65,6 +120,7 @@ export function listJobs() {
       progress: number;
       message?: string | null;
       output_ref?: string | null;
+      priority?: 'interactive' | 'background';
       created_at?: string;
       updated_at?: string;
     }>;
@@ -86,6 +142,7 @@ export function getLiveSocial() {
       url: string;
       media: Array<{ type: 'image'; url: string }>;
     }>;
+    next_cursor?: string | null;
     sources: Array<{
       source_id: string;
       name: string;
@@ -103,10 +160,20 @@ export function getLiveSocial() {
         media: Array<{ type: 'image'; url: string }>;
       }>;
       error?: string | null;
+      health?: SourceHealth;
+      schedule?: SourceSchedule;
     }>;
   }>('/api/live/social');
 }
 
+export function getLiveSocialPage(cursor: string, limit?: number) {
+  const params = new URLSearchParams({ cursor });
+  if (limit) {
+    params.set('limit', String(limit));
+  }
+  return request<LiveSocialPage>(`/api/live/social/page?${params.toString()}`);
+}
+
 export function refreshLiveSource(source: string) {
   return request<{
     source_id: string;
@@ -125,5 +192,7 @@ export function refreshLiveSource(source: string) {
       media: Array<{ type: 'image'; url: string }>;
     }>;
     error?: string | null;
+    health?: SourceHealth;
+    schedule?: SourceSchedule;
   }>(`/api/live/social/${source}/refresh`, { method: 'POST' });
 }
@@ -12,8 +12,38 @@ export type TopicItem = {
   summary?: string | null;
   published_at?: string | null;
   image_url?: string | null;
+  sources?: TopicItemSource[];
 };
 
+export type TopicItemSource = {
+  source_id: string;
+  source_name: string;
+  url: string;
+};
+
+export type SourceHealth = {
+  state: 'closed' | 'open' | 'half_open';
+  consecutive_failures: number;
+  last_success_at?: string | null;
+  last_failure_at?: string | null;
+  last_error?: string | null;
+  latency_ms?: number | null;
+  retry_at?: string | null;
+};
+
+export type SourceSchedule = {
+  refresh_interval_seconds?: number | null;
+  next_refresh_at?: string | null;
+  observed_gap_seconds?: number | null;
+};
+
+export type TopicSourceStatus = SourceHealth &
+  SourceSchedule & {
+    source_id: string;
+    name: string;
+    stale?: boolean;
+  };
+
 export type LiveSource = string;
 
 export type LiveMedia = {
@@ -40,11 +70,64 @@ export type LiveSourcePayload = {
   updated_at: string;
   items: LiveItem[];
   error?: string | null;
+  health?: SourceHealth;
+  schedule?: SourceSchedule;
 };
 
 export type LiveSocialResponse = {
   updated_at: string;
   refresh_interval_seconds?: number;
   items: LiveItem[];
+  next_cursor?: string | null;
   sources: LiveSourcePayload[];
 };
+
+export type LiveSocialPage = {
+  items: LiveItem[];
+  next_cursor?: string | null;
+};
+
+export type TopicItemsPayload = {
+  topic_id: string;
+  topic_name: string;
+  updated_at?: string;
+  items: TopicItem[];
+  sources?: TopicSourceStatus[];
+};
+
+export type TopicEntry = {
+  topic_id: string;
+  status: 'fresh' | 'stale' | 'pending';
+  updated_at?: string | null;
+  payload?: TopicItemsPayload | null;
+};
+
+export type JobChapter = {
+  item_id: string;
+  title: string;
+  start_seconds: number;
+};
+
+export type JobRow = {
+  id: string;
+  type: string;
+  topic_id: string;
+  item_id: string;
+  item_ids?: string[];
+  status: string;
+  progress: number;
+  message?: string | null;
+  output_ref?: string | null;
+  chapters?: JobChapter[];
+  priority?: 'interactive' | 'background';
+  created_at?: string;
+  updated_at?: string;
+};
+
+export type DashboardResponse = {
+  updated_at: string;
+  topics: Topic[];
+  items: TopicEntry[];
+  live: LiveSocialResponse & { status?: 'fresh' | 'stale' };
+  jobs: JobRow[];
+};
@@ -1,3 +1,4 @@
+import { mediaUrl } from '../app/api';
 import type { Topic, TopicItem } from '../app/types';
 
 type ItemTTSState = {
@@ -20,6 +21,7 @@ type Props = {
   onSelectTopic: (topicId: string) => void;
   onSetMode: (itemId: string, mode: 'tts_full_page' | 'tts_summary') => void;
   onQueueTTS: (itemId: string, mode: 'tts_full_page' | 'tts_summary') => void;
+  onCancelTTS: (itemId: string, state: ItemTTSState) => void;
   onPlayPause: (item: TopicItem, state: ItemTTSState) => void;
 };
 
@@ -35,6 +37,7 @@ export function AudioPane({
   onSelectTopic,
   onSetMode,
   onQueueTTS,
+  onCancelTTS,
   onPlayPause,
 }: Props) {
   return (
@@ -78,7 +81,10 @@ export function AudioPane({
               <article key={item.item_id} className="item-card">
                 <div className="card-head">
                   <h3>{item.title}</h3>
-                  <span className="source-badge">{item.source_name || 'Source'}</span>
+                  <span className="source-badge" title={item.sources?.map((src) => src.source_name).join(', ')}>
+                    {item.source_name || 'Source'}
+                    {item.sources && item.sources.length > 1 ? ` +${item.sources.length - 1}` : ''}
+                  </span>
                 </div>
 
                 <div className="meta-row">
@@ -88,7 +94,7 @@ export function AudioPane({
                 </div>
 
                 {item.summary ? <p className="snippet">{item.summary}</p> : null}
-                {item.image_url ? <img className="item-image" src={item.image_url} alt="" /> : null}
+                {item.image_url ? <img className="item-image" src={mediaUrl(item.image_url)} alt="" /> : null}
 
                 <div className="action-row">
                   <a className="source-link" href={item.url} target="_blank" rel="noreferrer">
@@ -112,6 +118,9 @@ export function AudioPane({
                       </div>
                       <span>
                         {row.status} {row.progress}%
+                        <button className="inline-cancel" onClick={() => onCancelTTS(item.item_id, row)}>
+                          Cancel
+                        </button>
                       </span>
                     </div>
                   ) : isReady && row ? (
@@ -1,3 +1,4 @@
+import { mediaUrl } from '../app/api';
 import type { LiveItem } from '../app/types';
 
 type Props = {
@@ -25,7 +26,7 @@ export function LiveItemModal({ item, onClose }: Props) {
         {item.media?.length ? (
           <div className="live-item-modal-media">
             {item.media.map((m, idx) => (
-              <img key={`${item.id}-${idx}`} src={m.url} alt="" />
+              <img key={`${item.id}-${idx}`} src={mediaUrl(m.url)} alt="" />
             ))}
           </div>
         ) : null}
@@ -1,11 +1,16 @@
 import { useEffect, useMemo, useState } from 'react';
 
-import { getLiveSocial, refreshLiveSource } from '../app/api';
+import { getLiveSocial, getLiveSocialPage, refreshLiveSource } from '../app/api';
 import type { LiveItem, LiveSocialResponse, LiveSource } from '../app/types';
 import { LiveItemModal } from './LiveItemModal';
 import { LiveSourcePanel } from './LiveSourcePanel';
 
-export function LivePane() {
+type Props = {
+  // Snapshot from the dashboard bootstrap; undefined while pending, null to fetch directly.
+  initialData?: LiveSocialResponse | null;
+};
+
+export function LivePane({ initialData }: Props) {
   const [livePlaying, setLivePlaying] = useState(true);
   const [isLoading, setIsLoading] = useState(true);
   const [isRefreshingAll, setIsRefreshingAll] = useState(false);
@@ -13,6 +18,11 @@ export function LivePane() {
   const [data, setData] = useState<LiveSocialResponse | null>(null);
   const [selectedItem, setSelectedItem] = useState<LiveItem | null>(null);
   const [isVisible, setIsVisible] = useState(document.visibilityState === 'visible');
+  // Older items paged from the backend's in-memory timelines; undefined cursor means "continue from data".
+  const [olderItems, setOlderItems] = useState<LiveItem[]>([]);
+  const [olderCursor, setOlderCursor] = useState<string | null | undefined>(undefined);
+  const [visibleCount, setVisibleCount] = useState(PAGE_SIZE);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     const onVisibility = () => {
@@ -34,11 +44,19 @@ export function LivePane() {
   };
 
   useEffect(() => {
+    if (initialData === undefined) {
+      return;
+    }
+    if (initialData) {
+      setData(initialData);
+      setIsLoading(false);
+      return;
+    }
     fetchAll().catch(() => {
       setIsLoading(false);
       setIsRefreshingAll(false);
     });
-  }, []);
+  }, [initialData]);
 
   useEffect(() => {
     if (!livePlaying || !isVisible || selectedItem) {
@@ -81,7 +99,37 @@ export function LivePane() {
   };
 
   const sourceData = useMemo(() => data?.sources || [], [data]);
-  const mergedItems = useMemo(() => data?.items || [], [data]);
+  const mergedItems = useMemo(() => {
+    const seen = new Set<string>();
+    return [...(data?.items || []), ...olderItems].filter((item) => {
+      if (seen.has(item.id)) {
+        return false;
+      }
+      seen.add(item.id);
+      return true;
+    });
+  }, [data, olderItems]);
+  const nextCursor = olderCursor === undefined ? data?.next_cursor : olderCursor;
+  const canLoadMore = visibleCount < mergedItems.length || !!nextCursor;
+
+  const onLoadMore = async () => {
+    if (visibleCount < mergedItems.length) {
+      setVisibleCount((n) => n + PAGE_SIZE);
+      return;
+    }
+    if (!nextCursor) {
+      return;
+    }
+    setIsLoadingMore(true);
+    try {
+      const page = await getLiveSocialPage(nextCursor, PAGE_SIZE);
+      setOlderItems((prev) => [...prev, ...page.items]);
+      setOlderCursor(page.next_cursor ?? null);
+      setVisibleCount((n) => n + PAGE_SIZE);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
 
   return (
     <div className="live-pane">
@@ -110,7 +158,7 @@ export function LivePane() {
           <section className="live-merged">
             <h3>Latest Across Sources</h3>
             <div className="live-item-list">
-              {mergedItems.slice(0, 8).map((item) => (
+              {mergedItems.slice(0, visibleCount).map((item) => (
                 <button key={item.id} className="live-item-row" onClick={() => setSelectedItem(item)}>
                   <strong>{item.title || item.text.slice(0, 80) || 'Untitled'}</strong>
                   <span>
@@ -119,6 +167,11 @@ export function LivePane() {
                 </button>
               ))}
             </div>
+            {canLoadMore ? (
+              <button className="live-load-more" disabled={isLoadingMore} onClick={() => onLoadMore().catch(() => {})}>
+                {isLoadingMore ? 'Loading…' : 'Load more'}
+              </button>
+            ) : null}
           </section>
           <section className="live-panels">
             {sourceData.map((source) => (
@@ -139,6 +192,8 @@ export function LivePane() {
   );
 }
 
+const PAGE_SIZE = 8;
+
 function dateTs(value: string): number {
   const ts = Date.parse(value);
   return Number.isNaN(ts) ? 0 : ts;
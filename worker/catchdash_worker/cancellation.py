@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import threading
+
+
+class JobCancelled(Exception):
+    def __init__(self, reason: str = "cancelled") -> None:
+        super().__init__(f"job {reason}")
+        self.reason = reason
+
+
+# Shared flag between the job runner, its heartbeat thread and the extraction / LLM /
+# TTS calls. Long-running steps call `raise_if_cancelled()` between chunks so a cancelled
+# or preempted job stops at the next checkpoint and its upstream request is closed.
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self.reason: str | None = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled(self.reason or "cancelled")
@@ -13,14 +13,39 @@ class WorkerSettings(BaseSettings):
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "qwen3:4b"
     tts_voice: str = "af_heart"
+    # Optional pools: comma-separated URLs, each optionally `|weight=2|max=4`.
+    # Empty means the single kokoro_base_url / llm_base_url (or ollama_base_url).
+    kokoro_endpoints: str = ""
+    llm_endpoints: str = ""
+    endpoint_max_in_flight: int = 1
+    endpoint_failure_threshold: int = 2
+    endpoint_eject_seconds: float = 30.0
+    health_check_seconds: float = 15.0
+    # Jobs run in parallel by this process; size it to the pools' combined capacity.
+    concurrency: int = 1
     poll_seconds: int = 2
+    heartbeat_seconds: float = 1.0
     worker_id: str = "worker-1"
     http_timeout_seconds: float = 20.0
+    # Article downloads: HTML/text past the cap is cut off, PDFs past theirs are rejected.
+    extract_max_bytes: int = 5_000_000
+    extract_pdf_max_bytes: int = 20_000_000
+    extract_deadline_seconds: float = 60.0
     llm_timeout_seconds: float = 240.0
     tts_timeout_seconds: float = 240.0
     summary_char_limit: int = 2000
     summary_input_chars: int = 30000
     max_tts_chars: int = 14000
+    # tts_digest: item text packed per LLM prompt (size to the model's context window), the
+    # cap on each item's share, and the feed summary length below which the page is fetched.
+    digest_input_chars: int = 24000
+    digest_item_chars: int = 3000
+    digest_min_summary_chars: int = 400
+    # Output formats in order of preference; each job uses the first one its client can play.
+    audio_formats: str = "mp3"
+    # Set to re-encode (e.g. 24-32 for Opus speech); Kokoro itself has no bitrate control.
+    audio_bitrate_kbps: int | None = None
+    ffmpeg_path: str | None = "ffmpeg"
 
     model_config = SettingsConfigDict(env_file=".env", env_prefix="CATCHDASH_WORKER_")
 
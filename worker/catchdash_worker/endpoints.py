@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+import httpx
+
+from catchdash_worker.cancellation import CancelToken
+from catchdash_worker.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+@dataclass
+class Endpoint:
+    url: str
+    weight: float = 1.0
+    max_in_flight: int = 1
+    in_flight: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+
+    def load(self) -> float:
+        return self.in_flight / self.weight
+
+    def as_dict(self) -> dict:
+        return {
+            'url': self.url,
+            'weight': self.weight,
+            'max_in_flight': self.max_in_flight,
+            'in_flight': self.in_flight,
+            'consecutive_failures': self.consecutive_failures,
+            'ejected': self.ejected_until > time.time(),
+        }
+
+
+class NoEndpointAvailable(RuntimeError):
+    pass
+
+
+# A set of interchangeable upstream instances (Kokoro or LLM servers). Calls go to the
+# least-loaded healthy endpoint with a free slot (in-flight / weight), fail over to the
+# next one on connection errors or 5xx, and endpoints that keep failing are ejected until
+# a health check or the ejection timeout brings them back.
+class EndpointPool:
+    def __init__(
+        self,
+        name: str,
+        endpoints: list[Endpoint],
+        health_path: str = '/',
+        failure_threshold: int = 2,
+        eject_seconds: float = 30.0,
+    ) -> None:
+        if not endpoints:
+            raise ValueError(f'{name} pool has no endpoints')
+        self.name = name
+        self.endpoints = endpoints
+        self.health_path = health_path
+        self._failure_threshold = max(1, failure_threshold)
+        self._eject_seconds = eject_seconds
+        self._cond = threading.Condition()
+        self._health_thread: threading.Thread | None = None
+
+    def call(self, fn: Callable[[str], T], cancel: CancelToken | None = None) -> T:
+        tried: set[str] = set()
+        last_error: Exception | None = None
+        while len(tried) < len(self.endpoints):
+            endpoint = self._acquire(tried, cancel)
+            tried.add(endpoint.url)
+            try:
+                result = fn(endpoint.url)
+            except Exception as exc:
+                if not _retryable(exc):
+                    self._release(endpoint, ok=True)
+                    raise
+                self._release(endpoint, ok=False)
+                logger.warning('%s endpoint=%s failed, trying next err=%s', self.name, endpoint.url, exc)
+                last_error = exc
+                continue
+            self._release(endpoint, ok=True)
+            return result
+        raise NoEndpointAvailable(f'all {self.name} endpoints failed: {last_error}') from last_error
+
+    def start_health_checks(self, interval_seconds: float, timeout_seconds: float = 5.0) -> None:
+        if self._health_thread or interval_seconds <= 0:
+            return
+        self._health_thread = threading.Thread(
+            target=self._health_loop, args=(interval_seconds, timeout_seconds), name=f'{self.name}-health', daemon=True
+        )
+        self._health_thread.start()
+
+    def snapshot(self) -> list[dict]:
+        with self._cond:
+            return [endpoint.as_dict() for endpoint in self.endpoints]
+
+    def _acquire(self, exclude: set[str], cancel: CancelToken | None) -> Endpoint:
+        with self._cond:
+            while True:
+                if cancel:
+                    cancel.raise_if_cancelled()
+                now = time.time()
+                candidates = [row for row in self.endpoints if row.url not in exclude]
+                healthy = [row for row in candidates if row.ejected_until <= now]
+                # Everything ejected: keep trying rather than failing the job outright.
+                pool = healthy or candidates
+                free = [row for row in pool if row.in_flight < row.max_in_flight]
+                if free:
+                    endpoint = min(free, key=Endpoint.load)
+                    endpoint.in_flight += 1
+                    return endpoint
+                self._cond.wait(timeout=0.5)
+
+    def _release(self, endpoint: Endpoint, ok: bool) -> None:
+        with self._cond:
+            endpoint.in_flight -= 1
+            if ok:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = 0.0
+            else:
+                self._mark_failed(endpoint)
+            self._cond.notify_all()
+
+    def _mark_failed(self, endpoint: Endpoint) -> None:
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self._failure_threshold and endpoint.ejected_until <= time.time():
+            endpoint.ejected_until = time.time() + self._eject_seconds
+            logger.warning('%s endpoint=%s ejected for %.0fs', self.name, endpoint.url, self._eject_seconds)
+
+    def _health_loop(self, interval_seconds: float, timeout_seconds: float) -> None:
+        while True:
+            time.sleep(interval_seconds)
+            for endpoint in list(self.endpoints):
+                try:
+                    with httpx.Client(timeout=timeout_seconds) as client:
+                        res = client.get(f'{endpoint.url}{self.health_path}')
+                    ok = res.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                with self._cond:
+                    if ok and endpoint.ejected_until:
+                        logger.info('%s endpoint=%s healthy again', self.name, endpoint.url)
+                        endpoint.consecutive_failures = 0
+                        endpoint.ejected_until = 0.0
+                        self._cond.notify_all()
+                    elif not ok:
+                        self._mark_failed(endpoint)
+
+
+def parse_endpoints(value: str, default_max_in_flight: int = 1) -> list[Endpoint]:
+    # Comma-separated URLs, each optionally followed by `|weight=2|max=4`.
+    out: list[Endpoint] = []
+    for raw in value.split(','):
+        url, *options = [part.strip() for part in raw.split('|')]
+        if not url:
+            continue
+        endpoint = Endpoint(url=url.rstrip('/'), max_in_flight=default_max_in_flight)
+        for option in options:
+            key, _, number = option.partition('=')
+            if key == 'weight':
+                endpoint.weight = max(0.01, float(number))
+            elif key == 'max':
+                endpoint.max_in_flight = max(1, int(number))
+            else:
+                raise ValueError(f'unknown endpoint option: {option}')
+        out.append(endpoint)
+    return out
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return isinstance(exc, httpx.TransportError)
+
+
+def _pool(name: str, urls: str, health_path: str) -> EndpointPool:
+    return EndpointPool(
+        name,
+        parse_endpoints(urls, settings.endpoint_max_in_flight),
+        health_path=health_path,
+        failure_threshold=settings.endpoint_failure_threshold,
+        eject_seconds=settings.endpoint_eject_seconds,
+    )
+
+
+def _llm_pool() -> EndpointPool:
+    if settings.llm_provider.strip().lower() == 'ollama':
+        return _pool('llm', settings.llm_endpoints or settings.llm_base_url or settings.ollama_base_url, '/api/tags')
+    return _pool('llm', settings.llm_endpoints or settings.llm_base_url or 'https://api.openai.com/v1', '/models')
+
+
+kokoro_pool = _pool('kokoro', settings.kokoro_endpoints or settings.kokoro_base_url, '/health')
+llm_pool = _llm_pool()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
 
 from catchdash_worker.config import settings
+from catchdash_worker.endpoints import kokoro_pool, llm_pool
 from catchdash_worker.queue.backend_api import BackendQueueAPI
 from catchdash_worker.runners.dispatcher import run_job
 
@@ -13,13 +15,33 @@ logger = logging.getLogger(__name__)
 
 def run_worker() -> None:
     api = BackendQueueAPI(settings.backend_base_url, timeout_seconds=settings.http_timeout_seconds)
-    logger.info("worker started id=%s backend=%s", settings.worker_id, settings.backend_base_url)
+    for pool in (kokoro_pool, llm_pool):
+        pool.start_health_checks(settings.health_check_seconds)
+        logger.info("%s pool endpoints=%s", pool.name, [row.url for row in pool.endpoints])
+    slots = max(1, settings.concurrency)
+    logger.info("worker started id=%s backend=%s slots=%s", settings.worker_id, settings.backend_base_url, slots)
+    threads = [
+        threading.Thread(
+            target=_claim_loop,
+            args=(api, settings.worker_id if slots == 1 else f"{settings.worker_id}/{slot}"),
+            name=f"worker-slot-{slot}",
+            daemon=True,
+        )
+        for slot in range(slots)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _claim_loop(api: BackendQueueAPI, worker_id: str) -> None:
     while True:
         try:
-            jobs = api.list_jobs()
-            queued = [row for row in jobs if row.get("status") == "queued"]
-            logger.info("worker poll queued=%s", len(queued))
-            for job in queued:
+            # Claim one job at a time so several workers can share the queue and an
+            # interactive job queued mid-run is picked before older background work.
+            while (job := api.claim_job(worker_id)) is not None:
+                logger.info("worker=%s claimed job=%s priority=%s", worker_id, job.get("id"), job.get("priority"))
                 run_job(api, job)
         except Exception as exc:
             logger.exception("worker loop error: %s", exc)
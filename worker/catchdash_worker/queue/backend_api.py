@@ -19,6 +19,18 @@ class BackendQueueAPI:
             res.raise_for_status()
             return res.json().get("jobs", [])
 
+    def claim_job(self, worker_id: str) -> dict[str, Any] | None:
+        with httpx.Client(timeout=self.timeout_seconds) as client:
+            res = client.post(self._url("/api/jobs/claim"), json={"worker_id": worker_id})
+            res.raise_for_status()
+            return res.json() if res.status_code == 200 else None
+
+    def heartbeat(self, job_id: str, claim_id: str) -> str:
+        with httpx.Client(timeout=self.timeout_seconds) as client:
+            res = client.post(self._url(f"/api/jobs/{job_id}/heartbeat"), params={"claim_id": claim_id})
+            res.raise_for_status()
+            return str(res.json().get("action") or "continue")
+
     def get_job(self, job_id: str) -> dict[str, Any]:
         with httpx.Client(timeout=self.timeout_seconds) as client:
             res = client.get(self._url(f"/api/jobs/{job_id}"))
@@ -37,9 +49,26 @@ class BackendQueueAPI:
             res.raise_for_status()
             return res.json()
 
-    def upload_job_audio(self, job_id: str, audio_bytes: bytes, mime_type: str = "audio/mpeg") -> dict[str, Any]:
-        files = {"file": (f"{job_id}.mp3", audio_bytes, mime_type)}
+    def get_topic_items(self, topic_id: str) -> dict[str, Any]:
+        with httpx.Client(timeout=self.timeout_seconds) as client:
+            res = client.get(self._url(f"/api/topics/{topic_id}/items"))
+            res.raise_for_status()
+            return res.json()
+
+    def upload_job_audio(
+        self,
+        job_id: str,
+        claim_id: str,
+        audio_bytes: bytes,
+        mime_type: str = "audio/mpeg",
+        extension: str = "mp3",
+        duration_seconds: float | None = None,
+    ) -> dict[str, Any]:
+        files = {"file": (f"{job_id}.{extension}", audio_bytes, mime_type)}
+        data = {"claim_id": claim_id}
+        if duration_seconds:
+            data["duration_seconds"] = f"{duration_seconds:.2f}"
         with httpx.Client(timeout=self.timeout_seconds) as client:
-            res = client.post(self._url(f"/api/jobs/{job_id}/audio"), files=files)
+            res = client.post(self._url(f"/api/jobs/{job_id}/audio"), files=files, data=data)
             res.raise_for_status()
             return res.json()
@@ -2,94 +2,416 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
+import time
+from collections.abc import Callable
 from typing import Any
 
+import httpx
+
+from catchdash_worker.cancellation import CancelToken, JobCancelled
 from catchdash_worker.config import settings
+from catchdash_worker.endpoints import kokoro_pool, llm_pool
 from catchdash_worker.queue.backend_api import BackendQueueAPI
+from catchdash_worker.trace import JobTrace
+from catchdash_worker.tts.audio import (
+    plan_audio,
+    probe_duration_seconds,
+    transcode_audio,
+    wav_duration_seconds,
+)
+from catchdash_worker.tts.digest import DigestEntry, apply_summaries, build_script, pack_batches
 from catchdash_worker.tts.extraction import extract_main_text
-from catchdash_worker.tts.llm import summarize_with_llm
+from catchdash_worker.tts.llm import digest_with_llm, summarize_with_llm
 from catchdash_worker.tts.synth import synthesize_with_kokoro
 
 logger = logging.getLogger(__name__)
 
+# Rough Kokoro speaking rate, used to place chapters when the audio duration is unknown.
+_SPOKEN_CHARS_PER_SECOND = 15.0
+
+
+# Heartbeats a claimed job in the background and trips the cancel token when the
+# backend answers "cancel" (user cancelled) or "preempt" (an interactive job is waiting).
+class JobWatcher(threading.Thread):
+    def __init__(self, api: BackendQueueAPI, job_id: str, claim_id: str, cancel: CancelToken) -> None:
+        super().__init__(name=f'job-watcher-{job_id}', daemon=True)
+        self.api = api
+        self.job_id = job_id
+        self.claim_id = claim_id
+        self.cancel = cancel
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(settings.heartbeat_seconds):
+            try:
+                action = self.api.heartbeat(self.job_id, self.claim_id)
+            except Exception as exc:
+                logger.warning('job=%s heartbeat failed err=%s', self.job_id, exc)
+                continue
+            if action in {'cancel', 'preempt'}:
+                self.cancel.cancel('preempted' if action == 'preempt' else 'cancelled')
+                return
+
+    def stop(self) -> None:
+        self._done.set()
+
 
 def run_job(api: BackendQueueAPI, job: dict[str, Any]) -> None:
     job_id = str(job.get('id'))
     job_type = job.get('type')
     topic_id = str(job.get('topic_id'))
     item_id = str(job.get('item_id'))
+    claim_id = job.get('claim_id')
+    cancel = CancelToken()
+    watcher = JobWatcher(api, job_id, claim_id, cancel) if claim_id else None
+
+    trace = JobTrace()
+
+    def update(payload: dict[str, Any]) -> None:
+        cancel.raise_if_cancelled()
+        try:
+            api.update_job(job_id, {**payload, 'claim_id': claim_id, 'trace': trace.as_payload()})
+        except httpx.HTTPStatusError as exc:
+            _stop_if_claim_lost(exc, cancel)
+            raise
 
+    if watcher:
+        watcher.start()
     try:
-        api.update_job(job_id, {'status': 'processing', 'progress': 8, 'message': 'loading item'})
+        if job_type == 'tts_digest':
+            script, chapters = _digest_script(api, job, update, trace, cancel)
+        else:
+            script, chapters = _article_script(api, job_type, topic_id, item_id, update, trace, cancel), []
+
+        update({'status': 'processing', 'progress': 60, 'message': 'synthesizing audio'})
+        plan = plan_audio(
+            _split(settings.audio_formats),
+            list(job.get('audio_formats') or []),
+            settings.audio_bitrate_kbps,
+            settings.ffmpeg_path,
+        )
+        with trace.stage('synthesize') as metrics:
+            started = time.perf_counter()
+            audio_bytes, _ = kokoro_pool.call(
+                lambda base_url: synthesize_with_kokoro(
+                    base_url=base_url,
+                    text=script,
+                    voice=settings.tts_voice,
+                    timeout_seconds=settings.tts_timeout_seconds,
+                    cancel=cancel,
+                    response_format=plan.kokoro_format,
+                ),
+                cancel=cancel,
+            )
+            elapsed = time.perf_counter() - started
+            if plan.kokoro_format == 'wav':
+                duration = wav_duration_seconds(audio_bytes)
+            else:
+                duration = probe_duration_seconds(audio_bytes, settings.ffmpeg_path)
+            metrics.update(chars_in=len(script), bytes_out=len(audio_bytes), format=plan.kokoro_format)
+            if duration:
+                # Below 1.0 means Kokoro renders faster than real time.
+                metrics.update(audio_seconds=duration, real_time_factor=elapsed / duration)
+        if plan.transcode:
+            update({'status': 'processing', 'progress': 76, 'message': f'encoding {plan.target.name}'})
+            with trace.stage('encode') as metrics:
+                metrics['bytes_in'] = len(audio_bytes)
+                audio_bytes = transcode_audio(
+                    audio_bytes,
+                    plan.target,
+                    settings.audio_bitrate_kbps,
+                    settings.ffmpeg_path or 'ffmpeg',
+                    timeout_seconds=settings.tts_timeout_seconds,
+                    cancel=cancel,
+                )
+                metrics.update(bytes_out=len(audio_bytes), format=plan.target.name)
+                if duration:
+                    metrics['kb_per_minute'] = len(audio_bytes) / 1024 / (duration / 60)
+
+        update({'status': 'processing', 'progress': 84, 'message': 'uploading audio'})
+        with trace.stage('upload') as metrics:
+            metrics['bytes_out'] = len(audio_bytes)
+            try:
+                upload = api.upload_job_audio(
+                    job_id,
+                    str(claim_id or ''),
+                    audio_bytes,
+                    plan.target.mime,
+                    plan.target.extension,
+                    duration_seconds=duration,
+                )
+            except httpx.HTTPStatusError as exc:
+                _stop_if_claim_lost(exc, cancel)
+                raise
+        update(
+            {
+                'status': 'ready',
+                'progress': 100,
+                'message': 'ready',
+                'output_ref': upload.get('output_ref'),
+                'chapters': _chapter_payload(chapters, len(script), duration),
+            },
+        )
+        logger.info(
+            'job=%s ready topic=%s item=%s stages=%s',
+            job_id,
+            topic_id,
+            item_id,
+            ' '.join(f"{row['name']}={row['duration_ms']:.0f}ms" for row in trace.stages),
+        )
+    except JobCancelled as exc:
+        # The backend already moved the job (cancelled, or requeued after preemption); nothing to report.
+        logger.info('job=%s stopped reason=%s', job_id, exc.reason)
+    except Exception as exc:
+        try:
+            api.update_job(
+                job_id,
+                {
+                    'status': 'failed',
+                    'progress': 100,
+                    'message': str(exc),
+                    'claim_id': claim_id,
+                    'trace': trace.as_payload(),
+                },
+            )
+        except Exception:
+            logger.warning('job=%s could not be marked failed', job_id)
+        logger.exception('job=%s failed err=%s', job_id, exc)
+    finally:
+        if watcher:
+            watcher.stop()
+
+
+def _stop_if_claim_lost(exc: httpx.HTTPStatusError, cancel: CancelToken) -> None:
+    # 409: the backend cancelled or requeued the job, so this worker stops without reporting a failure.
+    if exc.response.status_code == 409:
+        cancel.cancel('cancelled')
+        cancel.raise_if_cancelled()
+
+
+def _article_script(
+    api: BackendQueueAPI,
+    job_type: str,
+    topic_id: str,
+    item_id: str,
+    update: Callable[[dict[str, Any]], None],
+    trace: JobTrace,
+    cancel: CancelToken,
+) -> str:
+    update({'status': 'processing', 'progress': 8, 'message': 'loading item'})
+    with trace.stage('load_item'):
         item = api.get_topic_item(topic_id, item_id)
 
-        api.update_job(job_id, {'status': 'processing', 'progress': 22, 'message': 'extracting article'})
-        full_text = extract_main_text(item['url'], timeout_seconds=settings.http_timeout_seconds)
-        if not full_text:
-            raise RuntimeError('extraction produced empty text')
+    update({'status': 'processing', 'progress': 22, 'message': 'extracting article'})
+    with trace.stage('extract') as metrics:
+        full_text = extract_main_text(
+            item['url'],
+            timeout_seconds=settings.http_timeout_seconds,
+            cancel=cancel,
+            metrics=metrics,
+            max_bytes=settings.extract_max_bytes,
+            pdf_max_bytes=settings.extract_pdf_max_bytes,
+            deadline_seconds=settings.extract_deadline_seconds,
+        )
+        metrics['chars_out'] = len(full_text)
+    if not full_text:
+        raise RuntimeError('extraction produced empty text')
 
-        tts_text = full_text
-        if job_type == 'tts_summary':
-            api.update_job(job_id, {'status': 'processing', 'progress': 34, 'message': 'summarizing with llm'})
+    tts_text = full_text
+    if job_type == 'tts_summary':
+        update({'status': 'processing', 'progress': 34, 'message': 'summarizing with llm'})
+        with trace.stage('summarize') as metrics:
+            started = time.perf_counter()
+            llm_stats: dict[str, Any] = {'chunks': 0}
 
             def _on_chunk(meta: dict[str, Any]) -> None:
+                if meta.get('done'):
+                    llm_stats.update(meta)
+                    return
                 chunk_count = int(meta.get('chunk_count') or 0)
+                if chunk_count == 1:
+                    llm_stats['ttft_ms'] = (time.perf_counter() - started) * 1000
+                llm_stats['chunks'] = chunk_count
                 if chunk_count <= 0 or chunk_count % 8 != 0:
                     return
                 # Move summary phase from 34 to 52 in small increments.
                 progress = min(52, 34 + (chunk_count // 8))
-                api.update_job(job_id, {'status': 'processing', 'progress': progress, 'message': 'summarizing with llm'})
-
-            provider = settings.llm_provider
-            model = settings.llm_model
-            base_url = settings.llm_base_url
-            api_key = settings.llm_api_key
-            if provider == 'ollama':
-                base_url = base_url or settings.ollama_base_url
-                model = model or settings.ollama_model
-
-            summary = summarize_with_llm(
-                provider=provider,
-                base_url=base_url,
-                api_key=api_key,
-                model=model,
-                title=item.get('title', 'Untitled'),
-                text=full_text,
-                timeout_seconds=settings.llm_timeout_seconds,
-                max_input_chars=settings.summary_input_chars,
-                on_chunk=_on_chunk,
+                update({'status': 'processing', 'progress': progress, 'message': 'summarizing with llm'})
+
+            provider, model, api_key = _llm_target()
+            summary = llm_pool.call(
+                lambda base_url: summarize_with_llm(
+                    provider=provider,
+                    base_url=base_url,
+                    api_key=api_key,
+                    model=model,
+                    title=item.get('title', 'Untitled'),
+                    text=full_text,
+                    timeout_seconds=settings.llm_timeout_seconds,
+                    max_input_chars=settings.summary_input_chars,
+                    on_chunk=_on_chunk,
+                    cancel=cancel,
+                ),
+                cancel=cancel,
             )
-            if not summary:
-                raise RuntimeError('llm returned empty summary')
-            tts_text = summary[: settings.summary_char_limit]
-
-        api.update_job(job_id, {'status': 'processing', 'progress': 60, 'message': 'synthesizing audio'})
-        clean_title = _sanitize_for_tts(item.get('title', 'Untitled'))
-        clean_tts_text = _sanitize_for_tts(tts_text)
-        script = f"{clean_title}. {clean_tts_text}"
-        script = script[: settings.max_tts_chars]
-        audio_bytes, mime = synthesize_with_kokoro(
-            base_url=settings.kokoro_base_url,
-            text=script,
-            voice=settings.tts_voice,
-            timeout_seconds=settings.tts_timeout_seconds,
+            metrics.update(_llm_metrics(llm_stats, time.perf_counter() - started))
+            metrics['chars_in'] = min(len(full_text), settings.summary_input_chars)
+            metrics['chars_out'] = len(summary)
+        if not summary:
+            raise RuntimeError('llm returned empty summary')
+        tts_text = summary[: settings.summary_char_limit]
+
+    clean_title = _sanitize_for_tts(item.get('title', 'Untitled'))
+    clean_tts_text = _sanitize_for_tts(tts_text)
+    script = f"{clean_title}. {clean_tts_text}"
+    return script[: settings.max_tts_chars]
+
+
+def _digest_script(
+    api: BackendQueueAPI,
+    job: dict[str, Any],
+    update: Callable[[dict[str, Any]], None],
+    trace: JobTrace,
+    cancel: CancelToken,
+) -> tuple[str, list[tuple[int, DigestEntry]]]:
+    topic_id = str(job.get('topic_id'))
+    wanted = [str(row) for row in job.get('item_ids') or []]
+    update({'status': 'processing', 'progress': 8, 'message': 'loading items'})
+    with trace.stage('load_item') as metrics:
+        topic = api.get_topic_items(topic_id)
+        by_id = {row.get('item_id'): row for row in topic.get('items') or []}
+        items = [by_id[row] for row in wanted if row in by_id]
+        metrics.update(items=len(items), missing=len(wanted) - len(items))
+    if not items:
+        raise RuntimeError('none of the digest items are in the topic anymore')
+
+    # Feed summaries (arXiv abstracts, most RSS descriptions) are enough for a digest; only
+    # items whose summary is too thin get their page fetched, and a failed fetch falls back to it.
+    update({'status': 'processing', 'progress': 22, 'message': 'extracting articles'})
+    entries: list[DigestEntry] = []
+    with trace.stage('extract') as metrics:
+        fetched = failed = bytes_in = 0
+        for item in items:
+            title = _sanitize_for_tts(item.get('title') or 'Untitled')
+            text = item.get('summary') or ''
+            if len(text) < settings.digest_min_summary_chars:
+                page: dict[str, Any] = {}
+                try:
+                    text = extract_main_text(
+                        item['url'],
+                        timeout_seconds=settings.http_timeout_seconds,
+                        cancel=cancel,
+                        metrics=page,
+                        max_bytes=settings.extract_max_bytes,
+                        pdf_max_bytes=settings.extract_pdf_max_bytes,
+                        deadline_seconds=settings.extract_deadline_seconds,
+                    ) or text
+                    fetched += 1
+                except JobCancelled:
+                    raise
+                except Exception as exc:
+                    failed += 1
+                    logger.info('digest item=%s extraction failed err=%s', item.get('item_id'), exc)
+                bytes_in += page.get('bytes_in') or 0
+            entries.append(DigestEntry(item_id=str(item.get('item_id')), title=title, text=text or title))
+        metrics.update(
+            items=len(entries),
+            fetched=fetched,
+            failed=failed,
+            bytes_in=bytes_in,
+            chars_out=sum(len(entry.text) for entry in entries),
         )
 
-        api.update_job(job_id, {'status': 'processing', 'progress': 84, 'message': 'uploading audio'})
-        upload = api.upload_job_audio(job_id, audio_bytes, mime)
-        api.update_job(
-            job_id,
-            {
-                'status': 'ready',
-                'progress': 100,
-                'message': 'ready',
-                'output_ref': upload.get('output_ref'),
-            },
+    batches = pack_batches(entries, settings.digest_input_chars, settings.digest_item_chars)
+    update({'status': 'processing', 'progress': 34, 'message': f'summarizing {len(entries)} items with llm'})
+    with trace.stage('summarize') as metrics:
+        started = time.perf_counter()
+        totals: dict[str, Any] = {'chunks': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'eval_seconds': 0.0}
+        provider, model, api_key = _llm_target()
+        summarized = 0
+        for number, batch in enumerate(batches, 1):
+            batch_stats: dict[str, Any] = {}
+
+            def _on_chunk(meta: dict[str, Any], batch_stats: dict[str, Any] = batch_stats) -> None:
+                if meta.get('done'):
+                    batch_stats.update(meta)
+                    return
+                if 'ttft_ms' not in totals:
+                    totals['ttft_ms'] = (time.perf_counter() - started) * 1000
+                totals['chunks'] += 1
+
+            output = llm_pool.call(
+                lambda base_url, batch=batch, on_chunk=_on_chunk: digest_with_llm(
+                    provider=provider,
+                    base_url=base_url,
+                    api_key=api_key,
+                    model=model,
+                    topic=topic.get('topic_name') or topic_id,
+                    items=[(entry.title, entry.text) for entry in batch],
+                    timeout_seconds=settings.llm_timeout_seconds,
+                    on_chunk=on_chunk,
+                    cancel=cancel,
+                ),
+                cancel=cancel,
+            )
+            if not output:
+                raise RuntimeError('llm returned empty digest')
+            summarized += apply_summaries(batch, output)
+            for key in ('prompt_tokens', 'completion_tokens', 'eval_seconds'):
+                totals[key] += batch_stats.get(key) or 0
+            # Summary phase runs from 34 to 52 across the batches.
+            update({'status': 'processing', 'progress': 34 + 18 * number // len(batches), 'message': 'summarizing'})
+        totals['prompt_tokens'] = totals['prompt_tokens'] or None
+        metrics.update(_llm_metrics(totals, time.perf_counter() - started))
+        metrics.update(
+            batches=len(batches),
+            items=len(entries),
+            summarized=summarized,
+            chars_in=sum(len(entry.text) for entry in entries),
+            chars_out=sum(len(entry.summary) for entry in entries),
         )
-        logger.info('job=%s ready topic=%s item=%s', job_id, topic_id, item_id)
-    except Exception as exc:
-        api.update_job(job_id, {'status': 'failed', 'progress': 100, 'message': str(exc)})
-        logger.exception('job=%s failed err=%s', job_id, exc)
+
+    for entry in entries:
+        entry.summary = _sanitize_for_tts(entry.summary)[: settings.summary_char_limit]
+    intro = f"{_sanitize_for_tts(topic.get('topic_name') or topic_id)} digest, {len(entries)} items."
+    script, chapters = build_script(intro, entries, settings.max_tts_chars)
+    if len(chapters) < len(entries):
+        logger.info('digest topic=%s kept %d of %d items under max_tts_chars', topic_id, len(chapters), len(entries))
+    return script, chapters
+
+
+def _chapter_payload(chapters: list[tuple[int, DigestEntry]], script_chars: int, duration: float | None) -> list:
+    # Kokoro reads at a near-constant rate, so a chapter starts at its offset's share of the audio.
+    seconds = duration or script_chars / _SPOKEN_CHARS_PER_SECOND
+    return [
+        {'item_id': entry.item_id, 'title': entry.title, 'start_seconds': round(seconds * offset / script_chars, 2)}
+        for offset, entry in chapters
+    ]
+
+
+def _llm_target() -> tuple[str, str, str | None]:
+    provider = settings.llm_provider
+    model = settings.llm_model
+    if provider == 'ollama':
+        model = model or settings.ollama_model
+    return provider, model, settings.llm_api_key
+
+
+def _llm_metrics(stats: dict[str, Any], elapsed: float) -> dict[str, Any]:
+    # Provider token counts when reported, otherwise streamed chunks (about one token each).
+    tokens = stats.get('completion_tokens') or stats.get('chunks') or 0
+    generation = stats.get('eval_seconds') or max(0.001, elapsed - (stats.get('ttft_ms') or 0) / 1000)
+    return {
+        'ttft_ms': stats.get('ttft_ms'),
+        'prompt_tokens': stats.get('prompt_tokens'),
+        'tokens': tokens,
+        'tokens_per_second': tokens / generation if tokens else None,
+    }
+
+
+def _split(value: str) -> list[str]:
+    return [row.strip().lower() for row in value.split(',') if row.strip()]
 
 
 def _sanitize_for_tts(text: str) -> str:
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+
+
+# Stage timeline for one run of a job. Each stage records its start, wall time and a
+# metrics dict the caller fills in (bytes, tokens, audio seconds, ...); the whole list is
+# sent with every job update so `GET /api/jobs/{id}` shows it as the job progresses.
+class JobTrace:
+    def __init__(self) -> None:
+        self.stages: list[dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, Any]]:
+        metrics: dict[str, Any] = {}
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            yield metrics
+        except Exception as exc:
+            metrics['error'] = type(exc).__name__
+            raise
+        finally:
+            self.stages.append(
+                {
+                    'name': name,
+                    'started_at': started_at.isoformat(),
+                    'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+                    'metrics': {key: _round(value) for key, value in metrics.items() if value is not None},
+                }
+            )
+
+    def as_payload(self) -> list[dict[str, Any]]:
+        return list(self.stages)
+
+
+def _round(value: Any) -> Any:
+    return round(value, 3) if isinstance(value, float) else value
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+import wave
+from dataclasses import dataclass
+
+from catchdash_worker.cancellation import CancelToken
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    name: str
+    mime: str
+    extension: str
+    # Kokoro `response_format` producing this directly, or None when only ffmpeg can.
+    kokoro_format: str | None
+    ffmpeg_args: tuple[str, ...]
+
+
+AUDIO_FORMATS = {
+    row.name: row
+    for row in (
+        AudioFormat('mp3', 'audio/mpeg', 'mp3', 'mp3', ('-c:a', 'libmp3lame', '-f', 'mp3')),
+        # Opus tuned for speech; Ogg for most browsers, WebM for Safari 17+ and Chrome.
+        AudioFormat('opus', 'audio/ogg', 'ogg', 'opus', ('-c:a', 'libopus', '-application', 'voip', '-f', 'ogg')),
+        AudioFormat('webm', 'audio/webm', 'webm', None, ('-c:a', 'libopus', '-application', 'voip', '-f', 'webm')),
+        AudioFormat('aac', 'audio/aac', 'aac', 'aac', ('-c:a', 'aac', '-f', 'adts')),
+        AudioFormat('flac', 'audio/flac', 'flac', 'flac', ('-c:a', 'flac', '-f', 'flac')),
+        AudioFormat('wav', 'audio/wav', 'wav', 'wav', ('-c:a', 'pcm_s16le', '-f', 'wav')),
+    )
+}
+
+
+@dataclass
+class AudioPlan:
+    target: AudioFormat
+    # What to ask Kokoro for; differs from target.kokoro_format when we transcode locally.
+    kokoro_format: str
+    transcode: bool
+
+
+def plan_audio(
+    preferred: list[str], accepted: list[str], bitrate_kbps: int | None, ffmpeg_path: str | None
+) -> AudioPlan:
+    # First format in worker preference order that the client can play (an empty `accepted`
+    # takes anything). Kokoro has no bitrate control, so a bitrate or a format it can't emit
+    # means rendering lossless WAV and encoding locally; without ffmpeg such formats are skipped.
+    can_encode = bool(ffmpeg_path and shutil.which(ffmpeg_path))
+    for name in preferred:
+        target = AUDIO_FORMATS.get(name)
+        if target is None or (accepted and name not in accepted):
+            continue
+        if target.kokoro_format is None and not can_encode:
+            continue
+        if can_encode and (target.kokoro_format is None or bitrate_kbps is not None):
+            return AudioPlan(target=target, kokoro_format='wav', transcode=True)
+        return AudioPlan(target=target, kokoro_format=target.kokoro_format or 'mp3', transcode=False)
+    return AudioPlan(target=AUDIO_FORMATS['mp3'], kokoro_format='mp3', transcode=False)
+
+
+def transcode_audio(
+    audio: bytes,
+    target: AudioFormat,
+    bitrate_kbps: int | None,
+    ffmpeg_path: str,
+    timeout_seconds: float = 120.0,
+    cancel: CancelToken | None = None,
+) -> bytes:
+    if cancel:
+        cancel.raise_if_cancelled()
+    cmd = [ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-i', 'pipe:0', '-vn', '-ac', '1']
+    if bitrate_kbps:
+        cmd += ['-b:a', f'{bitrate_kbps}k']
+    cmd += [*target.ffmpeg_args, 'pipe:1']
+    proc = subprocess.run(cmd, input=audio, capture_output=True, timeout=timeout_seconds, check=False)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode('utf-8', 'replace').strip()[:300]}")
+    return proc.stdout
+
+
+def probe_duration_seconds(audio: bytes, ffmpeg_path: str | None) -> float | None:
+    # ffprobe ships next to ffmpeg; used for compressed output whose length the worker can't read itself.
+    if not ffmpeg_path:
+        return None
+    ffprobe = shutil.which(ffmpeg_path.replace('ffmpeg', 'ffprobe'))
+    if not ffprobe:
+        return None
+    cmd = [ffprobe, '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', '-i', 'pipe:0']
+    try:
+        proc = subprocess.run(cmd, input=audio, capture_output=True, timeout=30, check=False)
+        return float(proc.stdout.decode().strip())
+    except (subprocess.SubprocessError, ValueError):
+        return None
+
+
+def wav_duration_seconds(audio: bytes) -> float | None:
+    try:
+        with wave.open(io.BytesIO(audio)) as reader:
+            rate = reader.getframerate()
+            frame_bytes = reader.getnchannels() * reader.getsampwidth()
+            frames = reader.getnframes()
+    except (wave.Error, EOFError):
+        return None
+    if not rate or not frame_bytes:
+        return None
+    # Streamed WAV headers may carry a placeholder length; fall back to the payload size.
+    frames = min(frames, (len(audio) - 44) // frame_bytes) if frames > 0 else (len(audio) - 44) // frame_bytes
+    return frames / rate
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+_ITEM_OVERHEAD_CHARS = 40
+_FALLBACK_CHARS = 500
+_MARKER = re.compile(r'^\s*\[(\d+)\]\s*', re.MULTILINE)
+_SENTENCE_END = re.compile(r'[.!?](?=\s|$)')
+
+
+@dataclass
+class DigestEntry:
+    item_id: str
+    title: str
+    text: str
+    summary: str = ''
+
+
+# Packs entries, in order, into as few prompts as fit `budget_chars` of item text; each
+# entry's text is clipped to `item_chars` first so one long article can't take a batch alone.
+def pack_batches(entries: list[DigestEntry], budget_chars: int, item_chars: int) -> list[list[DigestEntry]]:
+    batches: list[list[DigestEntry]] = []
+    current: list[DigestEntry] = []
+    used = 0
+    for entry in entries:
+        entry.text = entry.text[:item_chars]
+        cost = len(entry.title) + len(entry.text) + _ITEM_OVERHEAD_CHARS
+        if current and used + cost > budget_chars:
+            batches.append(current)
+            current, used = [], 0
+        current.append(entry)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def apply_summaries(batch: list[DigestEntry], output: str) -> int:
+    # Splits "[n] ..." sections back onto the batch; items the model skipped get the start of
+    # their own text instead. Returns how many came from the model.
+    found: dict[int, str] = {}
+    marks = list(_MARKER.finditer(output))
+    for mark, following in zip(marks, [*marks[1:], None]):
+        body = output[mark.end() : following.start() if following else len(output)].strip()
+        if body:
+            found.setdefault(int(mark.group(1)), body)
+    for number, entry in enumerate(batch, 1):
+        entry.summary = found.get(number) or _clip_sentences(entry.text, _FALLBACK_CHARS)
+    return sum(1 for number in range(1, len(batch) + 1) if number in found)
+
+
+def build_script(intro: str, entries: list[DigestEntry], max_chars: int) -> tuple[str, list[tuple[int, DigestEntry]]]:
+    # Chapters are char offsets into the script; items that would overflow `max_chars` are dropped whole.
+    script = intro
+    chapters: list[tuple[int, DigestEntry]] = []
+    for number, entry in enumerate(entries, 1):
+        segment = f' {number}. {entry.title}. {entry.summary}'
+        if chapters and len(script) + len(segment) > max_chars:
+            break
+        chapters.append((len(script) + 1, entry))
+        script += segment
+    return script[:max_chars], chapters
+
+
+def _clip_sentences(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    ends = [match.end() for match in _SENTENCE_END.finditer(text, 0, limit)]
+    return text[: ends[-1]] if ends else text[:limit]
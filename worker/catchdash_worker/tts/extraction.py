@@ -1,18 +1,128 @@
 from __future__ import annotations
 
+import codecs
+import io
 import re
+import time
+from collections.abc import Iterator
+from typing import Any
 
 import httpx
 from bs4 import BeautifulSoup
 
+from catchdash_worker.cancellation import CancelToken
 
-def extract_main_text(url: str, timeout_seconds: float = 20.0) -> str:
-    with httpx.Client(timeout=timeout_seconds, follow_redirects=True) as client:
-        res = client.get(url)
-        res.raise_for_status()
-        html = res.text
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = None
 
-    soup = BeautifulSoup(html, 'html.parser')
+_HTML_TYPES = {'text/html', 'application/xhtml+xml'}
+_TEXT_TYPES = {'text/plain'}
+_PDF_TYPES = {'application/pdf', 'application/x-pdf'}
+_ACCEPT = 'text/html,application/xhtml+xml;q=0.9,text/plain;q=0.5,application/pdf;q=0.4'
+_CHUNK_BYTES = 64 * 1024
+_SNIFF_BYTES = 4096
+_PDF_MAX_PAGES = 60
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_.:\-]+)', re.IGNORECASE)
+_BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+
+class UnsupportedContent(RuntimeError):
+    pass
+
+
+# Response body read in chunks, cut off at `limit` bytes (after content decoding, so a
+# gzip bomb is capped too) and at an overall deadline, checking for cancellation per chunk.
+class _CappedBody:
+    def __init__(self, res: httpx.Response, limit: int, deadline: float, cancel: CancelToken | None) -> None:
+        self.limit = limit
+        self.read = 0
+        self.truncated = False
+        self._chunks = res.iter_bytes(_CHUNK_BYTES)
+        self._deadline = deadline
+        self._cancel = cancel
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            if self._cancel:
+                self._cancel.raise_if_cancelled()
+            if time.monotonic() > self._deadline:
+                raise TimeoutError('article download exceeded its deadline')
+            room = self.limit - self.read
+            if len(chunk) > room:
+                self.read += room
+                self.truncated = True
+                if room:
+                    yield chunk[:room]
+                return
+            self.read += len(chunk)
+            yield chunk
+
+
+def extract_main_text(
+    url: str,
+    timeout_seconds: float = 20.0,
+    cancel: CancelToken | None = None,
+    metrics: dict[str, Any] | None = None,
+    max_bytes: int = 5_000_000,
+    pdf_max_bytes: int = 20_000_000,
+    deadline_seconds: float = 60.0,
+) -> str:
+    metrics = metrics if metrics is not None else {}
+    deadline = time.monotonic() + deadline_seconds
+    with httpx.Client(timeout=timeout_seconds, follow_redirects=True, headers={'Accept': _ACCEPT}) as client:
+        with client.stream('GET', url) as res:
+            res.raise_for_status()
+            media_type, charset = _parse_content_type(res.headers.get('content-type', ''))
+            kind = _kind(media_type)
+            if media_type and kind is None:
+                raise UnsupportedContent(f'unsupported content type {media_type}')
+            if kind == 'pdf':
+                _check_pdf_support(_content_length(res), pdf_max_bytes)
+
+            body = _CappedBody(res, pdf_max_bytes if kind == 'pdf' else max_bytes, deadline, cancel)
+            chunks = iter(body)
+            head = b''
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= _SNIFF_BYTES:
+                    break
+            if kind is None:
+                # No Content-Type: decide from the first bytes.
+                kind = _sniff_kind(head)
+                if kind == 'pdf':
+                    _check_pdf_support(_content_length(res), pdf_max_bytes)
+                    body.limit = pdf_max_bytes
+            metrics['content_type'] = kind
+
+            if kind == 'pdf':
+                data = bytearray(head)
+                for chunk in chunks:
+                    data.extend(chunk)
+                metrics['bytes_in'] = body.read
+                if body.truncated:
+                    raise UnsupportedContent(f'pdf larger than {pdf_max_bytes // 1_000_000} MB')
+                text = None
+            else:
+                # Decode as the bytes arrive; only the sniffed head is ever held as raw bytes.
+                decoder = codecs.getincrementaldecoder(_pick_charset(charset, head))(errors='replace')
+                parts = [decoder.decode(head)]
+                for chunk in chunks:
+                    parts.append(decoder.decode(chunk))
+                parts.append(decoder.decode(b'', final=True))
+                text = ''.join(parts)
+                metrics['bytes_in'] = body.read
+                metrics['truncated'] = body.truncated
+    if cancel:
+        cancel.raise_if_cancelled()
+
+    if kind == 'pdf':
+        return _pdf_text(bytes(data), cancel)
+    if kind == 'text':
+        return re.sub(r'\s+', ' ', text).strip()
+
+    soup = BeautifulSoup(text, 'html.parser')
     for tag in soup(['script', 'style', 'noscript', 'header', 'footer']):
         tag.extract()
 
@@ -24,6 +134,88 @@ def extract_main_text(url: str, timeout_seconds: float = 20.0) -> str:
     return joined
 
 
+def _parse_content_type(value: str) -> tuple[str, str | None]:
+    media_type, _, params = value.partition(';')
+    charset = None
+    for param in params.split(';'):
+        key, _, raw = param.partition('=')
+        if key.strip().lower() == 'charset' and raw.strip():
+            charset = raw.strip().strip('"\'')
+    return media_type.strip().lower(), charset
+
+
+def _kind(media_type: str) -> str | None:
+    if media_type in _HTML_TYPES:
+        return 'html'
+    if media_type in _TEXT_TYPES:
+        return 'text'
+    if media_type in _PDF_TYPES:
+        return 'pdf'
+    return None
+
+
+def _sniff_kind(head: bytes) -> str:
+    start = head.lstrip()[:512].lower()
+    if start.startswith(b'%pdf-'):
+        return 'pdf'
+    if start.startswith(b'<') or b'<html' in start:
+        return 'html'
+    if b'\x00' in head:
+        raise UnsupportedContent('binary response without content type')
+    return 'text'
+
+
+def _pick_charset(declared: str | None, head: bytes) -> str:
+    # BOM, then the HTTP header, then a <meta> in the first few KB, then UTF-8.
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    candidates = [declared]
+    match = _META_CHARSET.search(head)
+    if match:
+        candidates.append(match.group(1).decode('ascii', 'ignore'))
+    for name in candidates:
+        if not name:
+            continue
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return 'utf-8'
+
+
+def _content_length(res: httpx.Response) -> int:
+    try:
+        return int(res.headers.get('content-length') or 0)
+    except ValueError:
+        return 0
+
+
+def _check_pdf_support(declared_bytes: int, pdf_max_bytes: int) -> None:
+    # Rejected before the body is read: a PDF is only useful whole.
+    if PdfReader is None:
+        raise UnsupportedContent('pdf extraction needs the worker `pdf` extra (pypdf)')
+    if declared_bytes > pdf_max_bytes:
+        raise UnsupportedContent(f'pdf larger than {pdf_max_bytes // 1_000_000} MB')
+
+
+def _pdf_text(data: bytes, cancel: CancelToken | None) -> str:
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        page_count = len(reader.pages)
+    except Exception as exc:
+        raise UnsupportedContent(f'unreadable pdf: {exc}') from exc
+    pages: list[str] = []
+    for number in range(min(page_count, _PDF_MAX_PAGES)):
+        if cancel:
+            cancel.raise_if_cancelled()
+        try:
+            pages.append(reader.pages[number].extract_text() or '')
+        except Exception:
+            continue
+    return re.sub(r'\s+', ' ', '\n'.join(pages)).strip()
+
+
 def _pick_best_root(soup: BeautifulSoup):
     # Prefer explicit article body semantics where available.
     semantic = soup.select_one('[itemprop="articleBody"]')
@@ -5,6 +5,8 @@ from collections.abc import Callable
 
 import httpx
 
+from catchdash_worker.cancellation import CancelToken
+
 
 def summarize_with_llm(
     *,
@@ -17,6 +19,7 @@ def summarize_with_llm(
     base_url: str | None = None,
     api_key: str | None = None,
     on_chunk: Callable[[dict], None] | None = None,
+    cancel: CancelToken | None = None,
 ) -> str:
     prompt = (
         "You are summarizing an article for text-to-speech playback. "
@@ -27,6 +30,63 @@ def summarize_with_llm(
         f"Article text:\n{text[:max_input_chars]}"
     )
 
+    return _generate(
+        provider=provider,
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        prompt=prompt,
+        timeout_seconds=timeout_seconds,
+        on_chunk=on_chunk,
+        cancel=cancel,
+    )
+
+
+def digest_with_llm(
+    *,
+    provider: str,
+    model: str,
+    topic: str,
+    items: list[tuple[str, str]],
+    timeout_seconds: float = 240.0,
+    base_url: str | None = None,
+    api_key: str | None = None,
+    on_chunk: Callable[[dict], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> str:
+    # One prompt for a batch of (title, text) items; each summary comes back on its own
+    # line tagged with the item's number so the caller can split it into chapters.
+    listing = "\n\n".join(f"[{number}] Title: {title}\n{text}" for number, (title, text) in enumerate(items, 1))
+    prompt = (
+        f"You are writing a spoken digest of {len(items)} items from the topic {topic!r} for text-to-speech "
+        "playback. For each numbered item below, write 2 to 4 short sentences in plain English: what it is "
+        "about and why it matters. Start each summary on a new line with the item's number in square brackets, "
+        "like [2], and write nothing else. Do not use bullet points. Do not use markdown. Keep it factual.\n\n"
+        f"{listing}"
+    )
+    return _generate(
+        provider=provider,
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        prompt=prompt,
+        timeout_seconds=timeout_seconds,
+        on_chunk=on_chunk,
+        cancel=cancel,
+    )
+
+
+def _generate(
+    *,
+    provider: str,
+    base_url: str | None,
+    api_key: str | None,
+    model: str,
+    prompt: str,
+    timeout_seconds: float,
+    on_chunk: Callable[[dict], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> str:
     mode = (provider or "ollama").strip().lower()
     if mode == "ollama":
         return _summarize_with_ollama(
@@ -35,6 +95,7 @@ def summarize_with_llm(
             prompt=prompt,
             timeout_seconds=timeout_seconds,
             on_chunk=on_chunk,
+            cancel=cancel,
         )
     if mode in {"openai_compatible", "openai-compatible", "openai"}:
         return _summarize_with_openai_compatible(
@@ -44,6 +105,7 @@ def summarize_with_llm(
             prompt=prompt,
             timeout_seconds=timeout_seconds,
             on_chunk=on_chunk,
+            cancel=cancel,
         )
     raise ValueError(f"unsupported llm provider: {provider}")
 
@@ -55,6 +117,7 @@ def _summarize_with_ollama(
     prompt: str,
     timeout_seconds: float,
     on_chunk: Callable[[dict], None] | None = None,
+    cancel: CancelToken | None = None,
 ) -> str:
     payload = {
         "model": model,
@@ -72,6 +135,9 @@ def _summarize_with_ollama(
         ) as res:
             res.raise_for_status()
             for line in res.iter_lines():
+                # Raising here leaves the stream context, which closes the connection and stops Ollama generating.
+                if cancel:
+                    cancel.raise_if_cancelled()
                 if not line:
                     continue
                 data = json.loads(line)
@@ -82,6 +148,16 @@ def _summarize_with_ollama(
                     if on_chunk:
                         on_chunk({"chunk_count": chunk_count, "piece_chars": len(piece)})
                 if data.get("done"):
+                    if on_chunk:
+                        # Final line carries Ollama's own token counts and generation time.
+                        on_chunk(
+                            {
+                                "done": True,
+                                "prompt_tokens": data.get("prompt_eval_count"),
+                                "completion_tokens": data.get("eval_count"),
+                                "eval_seconds": (data.get("eval_duration") or 0) / 1e9 or None,
+                            }
+                        )
                     break
     return "".join(parts).strip()
 
@@ -94,6 +170,7 @@ def _summarize_with_openai_compatible(
     prompt: str,
     timeout_seconds: float,
     on_chunk: Callable[[dict], None] | None = None,
+    cancel: CancelToken | None = None,
 ) -> str:
     headers = {}
     if api_key:
@@ -106,15 +183,41 @@ def _summarize_with_openai_compatible(
             {"role": "user", "content": prompt},
         ],
         "temperature": 0.2,
+        "stream": True,
     }
+    parts: list[str] = []
+    chunk_count = 0
+    # Streamed (server-sent events) so a cancelled job can drop the connection mid-generation.
     with httpx.Client(timeout=timeout_seconds) as client:
-        res = client.post(f"{base_url.rstrip('/')}/chat/completions", json=payload, headers=headers)
-        res.raise_for_status()
-        data = res.json()
-    content = (
-        ((data.get("choices") or [{}])[0].get("message") or {}).get("content")
-        or ""
-    ).strip()
-    if on_chunk:
-        on_chunk({"chunk_count": 1, "piece_chars": len(content)})
-    return content
+        with client.stream(
+            "POST",
+            f"{base_url.rstrip('/')}/chat/completions",
+            json=payload,
+            headers=headers,
+        ) as res:
+            res.raise_for_status()
+            for line in res.iter_lines():
+                if cancel:
+                    cancel.raise_if_cancelled()
+                if not line.startswith("data:"):
+                    continue
+                body = line[5:].strip()
+                if body == "[DONE]":
+                    break
+                data = json.loads(body)
+                usage = data.get("usage")
+                if usage and on_chunk:
+                    on_chunk(
+                        {
+                            "done": True,
+                            "prompt_tokens": usage.get("prompt_tokens"),
+                            "completion_tokens": usage.get("completion_tokens"),
+                        }
+                    )
+                delta = ((data.get("choices") or [{}])[0].get("delta") or {}).get("content") or ""
+                if delta:
+                    parts.append(delta)
+                    chunk_count += 1
+                    if on_chunk:
+                        on_chunk({"chunk_count": chunk_count, "piece_chars": len(delta)})
+    return "".join(parts).strip()
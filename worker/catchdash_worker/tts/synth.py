@@ -2,22 +2,50 @@ from __future__ import annotations
 
 import httpx
 
+from catchdash_worker.cancellation import CancelToken
 
-def synthesize_with_kokoro(base_url: str, text: str, voice: str, timeout_seconds: float = 180.0) -> tuple[bytes, str]:
+_ROUTE_MISSING = {404, 405}
+
+
+def synthesize_with_kokoro(
+    base_url: str,
+    text: str,
+    voice: str,
+    timeout_seconds: float = 180.0,
+    cancel: CancelToken | None = None,
+    response_format: str = 'mp3',
+) -> tuple[bytes, str]:
     payload = {
         'model': 'kokoro',
         'input': text,
         'voice': voice,
-        'response_format': 'mp3',
+        'response_format': response_format,
     }
     fallback_payload = {
         'text': text,
         'voice': voice,
-        'format': 'mp3',
+        'format': response_format,
     }
     with httpx.Client(timeout=timeout_seconds) as client:
-        res = client.post(f"{base_url.rstrip('/')}/v1/audio/speech", json=payload)
-        if res.status_code >= 400:
-            res = client.post(f"{base_url.rstrip('/')}/synthesize", json=fallback_payload)
+        try:
+            return _stream_audio(client, f"{base_url.rstrip('/')}/v1/audio/speech", payload, cancel)
+        except httpx.HTTPStatusError as exc:
+            # Only a server without the OpenAI-style route gets the legacy one; overload (429/5xx)
+            # must reach the endpoint pool as-is so it can fail over and eject.
+            if exc.response.status_code not in _ROUTE_MISSING:
+                raise
+            return _stream_audio(client, f"{base_url.rstrip('/')}/synthesize", fallback_payload, cancel)
+
+
+def _stream_audio(
+    client: httpx.Client, url: str, payload: dict, cancel: CancelToken | None
+) -> tuple[bytes, str]:
+    # Audio is read in chunks so cancellation can close the request between them.
+    chunks: list[bytes] = []
+    with client.stream('POST', url, json=payload) as res:
         res.raise_for_status()
-        return res.content, res.headers.get('content-type', 'audio/mpeg')
+        for chunk in res.iter_bytes():
+            if cancel:
+                cancel.raise_if_cancelled()
+            chunks.append(chunk)
+        return b''.join(chunks), res.headers.get('content-type', 'audio/mpeg')
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from catchdash_worker.tts.digest import DigestEntry, apply_summaries, build_script, pack_batches
+
+
+def _entry(n: int, text: str = '') -> DigestEntry:
+    return DigestEntry(item_id=f'i{n}', title=f'Title {n}', text=text or f'Body {n}. ' * 10)
+
+
+def test_pack_batches_keeps_order_and_budget() -> None:
+    entries = [_entry(n, 'x' * 500) for n in range(5)]
+    batches = pack_batches(entries, budget_chars=1200, item_chars=400)
+    assert [[entry.item_id for entry in batch] for batch in batches] == [['i0', 'i1'], ['i2', 'i3'], ['i4']]
+    assert all(len(entry.text) == 400 for entry in entries)
+
+
+def test_pack_batches_oversized_entry_gets_its_own_batch() -> None:
+    batches = pack_batches([_entry(0, 'x' * 5000), _entry(1, 'short')], budget_chars=100, item_chars=5000)
+    assert [len(batch) for batch in batches] == [1, 1]
+    assert pack_batches([], 100, 100) == []
+
+
+def test_apply_summaries_maps_markers_and_falls_back() -> None:
+    batch = [_entry(1), _entry(2, 'First sentence here. Second one follows! ' * 30), _entry(3)]
+    output = 'Intro chatter\n[1] One summary.\n  [3]  Third summary\nspans lines.\n[7] stray\n[1] duplicate'
+    assert apply_summaries(batch, output) == 2
+    assert batch[0].summary == 'One summary.'
+    assert batch[2].summary == 'Third summary\nspans lines.'
+    # Skipped item: the start of its own text, cut at a sentence end.
+    assert batch[1].summary.endswith(('.', '!'))
+    assert len(batch[1].summary) <= 500
+    assert batch[1].text.startswith(batch[1].summary)
+
+
+def test_apply_summaries_ignores_empty_sections() -> None:
+    batch = [_entry(1, 'Only text')]
+    assert apply_summaries(batch, '[1]\n') == 0
+    assert batch[0].summary == 'Only text'
+
+
+def test_build_script_offsets_point_at_chapters() -> None:
+    entries = [_entry(n) for n in range(1, 4)]
+    for entry in entries:
+        entry.summary = f'Summary {entry.item_id}.'
+    script, chapters = build_script('Here is your digest.', entries, max_chars=10_000)
+    assert [entry.item_id for _, entry in chapters] == ['i1', 'i2', 'i3']
+    for number, (offset, entry) in enumerate(chapters, 1):
+        assert script[offset:].startswith(f'{number}. {entry.title}. {entry.summary}')
+
+
+def test_build_script_drops_items_that_overflow() -> None:
+    entries = [_entry(n) for n in range(1, 4)]
+    for entry in entries:
+        entry.summary = 'x' * 40
+    script, chapters = build_script('Intro.', entries, max_chars=120)
+    assert len(chapters) == 2
+    assert len(script) <= 120
+    # The first item is always kept, clipped if it alone is too long.
+    script, chapters = build_script('Intro.', entries[:1], max_chars=20)
+    assert len(chapters) == 1 and len(script) == 20
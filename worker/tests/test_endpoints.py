@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from catchdash_worker.cancellation import CancelToken, JobCancelled
+from catchdash_worker.endpoints import Endpoint, EndpointPool, NoEndpointAvailable, parse_endpoints
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request('POST', 'http://x/')
+    return httpx.HTTPStatusError('error', request=request, response=httpx.Response(status, request=request))
+
+
+def test_parse_endpoints() -> None:
+    rows = parse_endpoints('http://a/ , http://b|weight=2|max=4,,', default_max_in_flight=2)
+    assert [(row.url, row.weight, row.max_in_flight) for row in rows] == [('http://a', 1.0, 2), ('http://b', 2.0, 4)]
+    with pytest.raises(ValueError):
+        parse_endpoints('http://a|speed=3')
+
+
+def test_empty_pool_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        EndpointPool('kokoro', [])
+
+
+def test_least_loaded_by_weight() -> None:
+    endpoints = [Endpoint('http://a', max_in_flight=4), Endpoint('http://b', weight=3.0, max_in_flight=4)]
+    pool = EndpointPool('kokoro', endpoints)
+    picked = [pool._acquire(set(), None).url for _ in range(4)]
+    # b has three times the weight, so it takes three of the first four calls.
+    assert sorted(picked) == ['http://a', 'http://b', 'http://b', 'http://b']
+
+
+def test_fails_over_on_retryable_errors_and_ejects() -> None:
+    pool = EndpointPool('kokoro', [Endpoint('http://a', weight=2.0), Endpoint('http://b')], failure_threshold=1)
+
+    def call(url: str) -> str:
+        if url == 'http://a':
+            raise _status_error(503)
+        return url
+
+    assert pool.call(call) == 'http://b'
+    a, b = pool.snapshot()
+    assert a['ejected'] and a['consecutive_failures'] == 1 and a['in_flight'] == 0
+    assert not b['ejected'] and b['in_flight'] == 0
+    # While a is ejected, b is preferred despite a's higher weight.
+    assert pool.call(lambda url: url) == 'http://b'
+
+
+def test_non_retryable_error_is_raised_without_penalty() -> None:
+    pool = EndpointPool('kokoro', [Endpoint('http://a'), Endpoint('http://b')])
+    calls: list[str] = []
+
+    def call(url: str) -> str:
+        calls.append(url)
+        raise _status_error(400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        pool.call(call)
+    assert len(calls) == 1
+    assert all(row['consecutive_failures'] == 0 for row in pool.snapshot())
+
+
+def test_all_endpoints_failing_raises() -> None:
+    pool = EndpointPool('kokoro', [Endpoint('http://a'), Endpoint('http://b')])
+
+    def call(url: str) -> str:
+        raise httpx.ConnectError('refused')
+
+    with pytest.raises(NoEndpointAvailable):
+        pool.call(call)
+    assert all(row['in_flight'] == 0 for row in pool.snapshot())
+
+
+def test_waits_for_a_free_slot_and_honours_cancel() -> None:
+    pool = EndpointPool('kokoro', [Endpoint('http://a', max_in_flight=1)])
+    held = pool._acquire(set(), None)
+    threading.Timer(0.1, pool._release, args=(held, True)).start()
+    started = time.monotonic()
+    assert pool.call(lambda url: url) == 'http://a'
+    assert time.monotonic() - started >= 0.09
+
+    held = pool._acquire(set(), None)
+    cancel = CancelToken()
+    threading.Timer(0.1, cancel.cancel).start()
+    with pytest.raises(JobCancelled):
+        pool.call(lambda url: url, cancel=cancel)
+    pool._release(held, ok=True)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import gzip
+
+import httpx
+import pytest
+
+from catchdash_worker.tts import extraction
+from catchdash_worker.tts.extraction import extract_main_text
+
+_ARTICLE = (
+    '<html><body><article><p>Café crème brûlée is a dessert served all over Paris.</p></article></body></html>'
+)
+
+
+def _serve(monkeypatch: pytest.MonkeyPatch, response: httpx.Response) -> None:
+    client = httpx.Client
+    transport = httpx.MockTransport(lambda request: response)
+    monkeypatch.setattr(extraction.httpx, 'Client', lambda **options: client(transport=transport, **options))
+
+
+def test_gzip_body_is_capped_after_inflating(monkeypatch: pytest.MonkeyPatch) -> None:
+    raw = b'word ' * 1_000_000
+    compressed = gzip.compress(raw)
+    assert len(compressed) < 100_000
+    _serve(
+        monkeypatch,
+        httpx.Response(200, headers={'content-type': 'text/plain', 'content-encoding': 'gzip'}, content=compressed),
+    )
+    metrics: dict = {}
+    text = extract_main_text('https://news.example/a', metrics=metrics, max_bytes=200_000)
+    assert metrics['truncated'] is True
+    assert metrics['bytes_in'] == 200_000
+    assert len(text) <= 200_000 and text.startswith('word word')
+
+
+def test_charset_from_header(monkeypatch: pytest.MonkeyPatch) -> None:
+    body = _ARTICLE.encode('cp1252')
+    _serve(monkeypatch, httpx.Response(200, headers={'content-type': 'text/html; charset=windows-1252'}, content=body))
+    metrics: dict = {}
+    assert extract_main_text('https://news.example/a', metrics=metrics).startswith('Café crème brûlée')
+    assert metrics['truncated'] is False and metrics['bytes_in'] == len(body)
+
+
+def test_charset_from_meta_tag(monkeypatch: pytest.MonkeyPatch) -> None:
+    body = _ARTICLE.replace('<html>', '<html><head><meta charset="iso-8859-1"></head>').encode('latin-1')
+    _serve(monkeypatch, httpx.Response(200, headers={'content-type': 'text/html'}, content=body))
+    assert extract_main_text('https://news.example/a').startswith('Café crème brûlée')
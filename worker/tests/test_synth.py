@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from catchdash_worker.endpoints import Endpoint, EndpointPool
+from catchdash_worker.tts import synth
+
+
+def _serve(monkeypatch: pytest.MonkeyPatch, handler) -> list[str]:
+    seen: list[str] = []
+    real_client = httpx.Client
+
+    def route(request: httpx.Request) -> httpx.Response:
+        seen.append(f'{request.url.host}{request.url.path}')
+        return handler(request)
+
+    monkeypatch.setattr(synth.httpx, 'Client', lambda timeout: real_client(transport=httpx.MockTransport(route)))
+    return seen
+
+
+def test_falls_back_to_legacy_route_when_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/v1/audio/speech':
+            return httpx.Response(404)
+        return httpx.Response(200, content=b'audio', headers={'content-type': 'audio/wav'})
+
+    seen = _serve(monkeypatch, handler)
+    assert synth.synthesize_with_kokoro('http://tts', 'hi', 'af') == (b'audio', 'audio/wav')
+    assert seen == ['tts/v1/audio/speech', 'tts/synthesize']
+
+
+@pytest.mark.parametrize('status', [429, 500, 503])
+def test_overload_is_not_turned_into_a_fallback(monkeypatch: pytest.MonkeyPatch, status: int) -> None:
+    seen = _serve(monkeypatch, lambda request: httpx.Response(status))
+    with pytest.raises(httpx.HTTPStatusError) as info:
+        synth.synthesize_with_kokoro('http://tts', 'hi', 'af')
+    assert info.value.response.status_code == status
+    assert seen == ['tts/v1/audio/speech']
+
+
+def test_pool_fails_over_on_overloaded_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == 'busy':
+            return httpx.Response(503)
+        return httpx.Response(200, content=b'audio', headers={'content-type': 'audio/mpeg'})
+
+    _serve(monkeypatch, handler)
+    pool = EndpointPool('kokoro', [Endpoint('http://busy', weight=2.0), Endpoint('http://idle')], failure_threshold=1)
+    result = pool.call(lambda url: synth.synthesize_with_kokoro(url, 'hi', 'af'))
+    assert result == (b'audio', 'audio/mpeg')
+    busy = pool.snapshot()[0]
+    assert busy['consecutive_failures'] == 1 and busy['ejected']